@@ -0,0 +1,228 @@
+"""Benchmark the LaTeX table parser for increasing input sizes.
+
+Run with `python benchmarks/bench_conversion.py`. Compares the tokenizer and the
+whole conversion with the line-based parser they replaced. The time per row
+should stay roughly constant as the number of rows grows, i.e. parsing scales
+linearly.
+"""
+
+import os
+import random
+import tempfile
+import re
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from latex_table_editor.conversion import (
+    extract_numbers,
+    iter_rows,
+    latex_table_to_dataframe,
+    read_latex_table,
+    tokenize,
+)
+
+warnings.simplefilter("ignore")
+
+NUM_COLUMNS = 8
+ROW_COUNTS = [1_000, 2_000, 5_000, 10_000, 20_000]
+
+
+def generate_table(num_rows: int, num_columns: int = NUM_COLUMNS) -> str:
+    rng = random.Random(0)
+    lines = ["\\begin{tabular}{l" + "c" * num_columns + "}", "\\toprule"]
+    lines.append(" & \\multicolumn{%d}{c}{Metrics} \\\\" % num_columns)
+    lines.append(
+        "Method & " + " & ".join(f"M{i}" for i in range(num_columns)) + " \\\\"
+    )
+    lines.append("\\midrule")
+    for row in range(num_rows):
+        values = [f"{rng.uniform(0, 100):.2f}" for _ in range(num_columns)]
+        values[rng.randrange(num_columns)] = "\\textbf{%s}" % values[0]
+        lines.append(
+            f"method-{row} & " + " & ".join(values) + " \\\\ % run " + str(row)
+        )
+    lines += ["\\bottomrule", "\\end{tabular}"]
+    return "\n".join(lines)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def extract_number(cell):
+    """Per-cell number extraction used before `extract_numbers`, for reference."""
+    if cell == "":
+        return cell
+    cell_wo_commands = re.sub(r"\\[a-zA-Z]+\{([^}]+)\}", r"\1", cell).strip()
+    if re.match(r"-?\d+\.?\d*", cell_wo_commands):
+        return float(cell_wo_commands)
+    return cell
+
+
+def line_based_table_to_dataframe(latex_str: str) -> pd.DataFrame:
+    """
+    Line-based parser used before `tokenize`, for reference. It handles one row per
+    line and no nested braces, so it only agrees with the tokenizer on simple
+    tables like the generated ones.
+    """
+    data_lines = []
+    multirow_counters = {}
+    for line in latex_str.strip().splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if re.match(r"\\begin\{tabular\}", line) or re.match(r"\\end\{tabular\}", line):
+            continue
+        if re.match(r"\\(top|bottom|mid)rule", line):
+            continue
+        if re.match(r"\\hline", line) or re.match(r"\\cmidrule", line):
+            continue
+        line = re.sub(r"%.*", "", line).strip()
+        if not line:
+            continue
+        line = re.sub(r"\\\\", "", line).strip()
+        if not line:
+            continue
+        cells = [cell.strip() for cell in line.split("&")]
+
+        final_cells = []
+        for cell in cells:
+            multicol_match = re.match(r"\\multicolumn\{(\d+)\}\{[^\}]*\}\{(.+)\}", cell)
+            if multicol_match:
+                span = int(multicol_match.group(1))
+                final_cells.extend([multicol_match.group(2).strip()] * span)
+            else:
+                final_cells.append(cell)
+        for col, (count, content) in multirow_counters.items():
+            if count > 0:
+                final_cells[col] = content
+                multirow_counters[col] = (count - 1, content)
+        multirow_counters = {
+            col: (count, content)
+            for col, (count, content) in multirow_counters.items()
+            if count > 0
+        }
+        for idx, cell in enumerate(final_cells):
+            multirow_match = re.match(r"\\multirow\{(\d+)\}\{[^\}]*\}\{(.+)\}", cell)
+            if multirow_match:
+                content = multirow_match.group(2).strip()
+                multirow_counters[idx] = (int(multirow_match.group(1)) - 1, content)
+                final_cells[idx] = content
+        data_lines.append(final_cells)
+
+    df = pd.DataFrame(data_lines).map(extract_number)
+    header_indices = []
+    for idx, row in df.iterrows():
+        if any(isinstance(cell, float) for cell in row):
+            break
+        header_indices.append(idx)
+    index_indices = []
+    for idx, col in enumerate(df):
+        if any(isinstance(cell, float) for cell in df[col]):
+            break
+        index_indices.append(idx)
+    columns = [idx for idx in range(len(df.columns)) if idx not in index_indices]
+    rows = [idx for idx in range(len(df)) if idx not in header_indices]
+    headers = df.iloc[header_indices, columns]
+    indices = df.iloc[rows, index_indices]
+    data = df.iloc[rows, columns]
+    return pd.DataFrame(
+        data.values,
+        index=indices.T.values.tolist(),
+        columns=headers.values.tolist(),
+    )
+
+
+def line_based_rows(latex_str: str) -> int:
+    """Split rows and cells like `line_based_table_to_dataframe`, for reference."""
+    num_rows = 0
+    for line in latex_str.strip().splitlines():
+        line = re.sub(r"%.*", "", line.strip()).strip()
+        if not line or re.match(r"\\(begin|end|toprule|midrule|bottomrule)", line):
+            continue
+        line = re.sub(r"\\\\", "", line).strip()
+        cells = [cell.strip() for cell in line.split("&")]
+        num_rows += len(cells) > 0
+    return num_rows
+
+
+def bench_numbers(num_rows: int = 100, num_columns: int = 50) -> None:
+    rng = random.Random(0)
+    values = np.array(
+        [
+            [
+                f"\\textbf{{{rng.uniform(0, 100):.3f}}}"
+                if rng.random() < 0.1
+                else f"{rng.uniform(0, 100):.3f}"
+                for _ in range(num_columns)
+            ]
+            for _ in range(num_rows)
+        ],
+        dtype=object,
+    )
+    dataframe = pd.DataFrame(values)
+    per_cell = best_of(lambda: dataframe.map(extract_number))
+    vectorized = best_of(lambda: extract_numbers(values))
+    print(
+        f"numbers {num_rows}x{num_columns}: per cell {per_cell * 1e3:.2f} ms,"
+        f" vectorized {vectorized * 1e3:.2f} ms"
+    )
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench_streaming(num_rows: int = 20_000) -> None:
+    source = generate_table(num_rows)
+    with tempfile.NamedTemporaryFile("w", suffix=".tex", delete=False) as file:
+        file.write(source)
+
+    def read_whole_file():
+        with open(file.name) as stream:
+            return latex_table_to_dataframe(stream.read())
+
+    in_memory = peak_memory(read_whole_file)
+    streamed = peak_memory(lambda: read_latex_table(file.name))
+    os.unlink(file.name)
+    print(
+        f"peak memory {num_rows} rows: whole file {in_memory / 2**20:.1f} MiB,"
+        f" streamed {streamed / 2**20:.1f} MiB (input {len(source) / 2**20:.1f} MiB)"
+    )
+
+
+def main() -> None:
+    print(
+        f"{'rows':>8} {'tokenize [s]':>14} {'us/row':>8} {'line-based':>11}"
+        f" {'convert [s]':>13} {'us/row':>8} {'line-based':>11} {'speedup':>8}"
+    )
+    for num_rows in ROW_COUNTS:
+        source = generate_table(num_rows)
+        lex = best_of(lambda: sum(1 for _ in iter_rows(tokenize(source))))
+        old_lex = best_of(lambda: line_based_rows(source))
+        full = best_of(lambda: latex_table_to_dataframe(source))
+        old_full = best_of(lambda: line_based_table_to_dataframe(source))
+        print(
+            f"{num_rows:>8} {lex:>14.4f} {lex / num_rows * 1e6:>8.2f} {old_lex:>11.4f}"
+            f" {full:>13.4f} {full / num_rows * 1e6:>8.2f} {old_full:>11.4f}"
+            f" {old_full / full:>7.1f}x"
+        )
+    bench_numbers()
+    bench_streaming()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Benchmark the highlighting of columns and tables.
+
+Run with `python benchmarks/bench_highlighting.py`. Compares the vectorized
+`column_highlighting` with the per-cell implementation it replaced, and the
+highlighting of a whole table in column and row mode, from scratch, after
+changing the rules of a single column or the order of all columns, redrawn
+without changes, and with a heatmap on each scale.
+"""
+
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from latex_table_editor.highlighting import column_highlighting, table_highlighting
+from latex_table_editor.rules import DEFAULT_RULES
+from latex_table_editor.table import Table
+from latex_table_editor.utils import Axis, Order, Scale
+
+ROW_COUNTS = [1_000, 5_000, 10_000]
+HIGHLIGHTING = ["\\bfseries{%s}", "\\underline{%s}"]
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def highlight_extrema(data, extrema, highlights, default, precision):
+    if isinstance(data, str):
+        return data
+    data_ = precision % data
+    for extremum, highlight in zip(extrema, highlights):
+        if data == extremum:
+            return highlight % data_
+    return default % data_
+
+
+def per_cell_highlighting(df_column, indices, order, highlighting, default, precision):
+    """
+    Per-cell highlighting used before the vectorized kernel, for reference. It
+    ranks exact values and counts ties separately, so its output differs on ties.
+    """
+    num_highlights = len(highlighting)
+    df_column_numeric = pd.to_numeric(df_column, errors="coerce")
+    match order:
+        case Order.MINIMUM:
+            extrema = df_column_numeric[indices].nsmallest(num_highlights).tolist()
+        case Order.NEUTRAL:
+            extrema = []
+        case Order.MAXIMUM:
+            extrema = df_column_numeric[indices].nlargest(num_highlights).tolist()
+
+    highlighted_column = df_column.copy().astype(object)
+    highlighted_column[indices] = (
+        df_column[indices]
+        .apply(
+            lambda data: highlight_extrema(
+                data, extrema, highlighting, default, precision
+            )
+        )
+        .astype(str)
+    )
+    ignore_indices = [idx for idx in df_column.index if idx not in indices]
+    highlighted_column[ignore_indices] = (
+        df_column[ignore_indices]
+        .apply(
+            lambda data: highlight_extrema(data, extrema, [default], default, precision)
+        )
+        .astype(str)
+    )
+    return highlighted_column
+
+
+def generate_column(num_rows: int) -> pd.Series:
+    rng = random.Random(0)
+    values = [
+        "n/a" if rng.random() < 0.05 else round(rng.uniform(0, 100), 2)
+        for _ in range(num_rows)
+    ]
+    return pd.Series(
+        np.array(values, dtype=object), index=[f"method-{i}" for i in range(num_rows)]
+    )
+
+
+def bench_axes(num_rows: int = 200, num_columns: int = 2_000) -> None:
+    rng = random.Random(0)
+    dataframe = pd.DataFrame(
+        np.array(
+            [
+                [
+                    "n/a" if rng.random() < 0.05 else round(rng.uniform(0, 100), 2)
+                    for _ in range(num_columns)
+                ]
+                for _ in range(num_rows)
+            ],
+            dtype=object,
+        )
+    )
+    for axis in Axis:
+        timing = best_of(
+            lambda: table_highlighting(dataframe, axis, dict(DEFAULT_RULES))
+        )
+        print(
+            f"table {num_rows}x{num_columns} {axis.value} mode: {timing * 1e3:.2f} ms"
+        )
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.highlight_table()
+
+    def change_one_column():
+        table.increase_precision(Axis.COLUMN, 0)
+        table.highlight_table()
+
+    timing = best_of(change_one_column)
+    print(f"table {num_rows}x{num_columns} one column changed: {timing * 1e3:.2f} ms")
+
+    def toggle_all_orders():
+        for name in table.dataframe.columns:
+            table.toggle_order(Axis.COLUMN, name)
+        table.highlight_table()
+
+    # the sorted values of each column are reused for every order
+    timing = best_of(toggle_all_orders)
+    print(f"table {num_rows}x{num_columns} all orders toggled: {timing * 1e3:.2f} ms")
+
+    # the display shares the highlighted lines, nothing is copied
+    timing = best_of(table.highlight_table)
+    print(f"table {num_rows}x{num_columns} redraw: {timing * 1e3:.2f} ms")
+
+    for scale in Scale:
+        rules = {**DEFAULT_RULES, "order": Order.MAXIMUM, "heatmap": {"scale": scale}}
+        timing = best_of(lambda: table_highlighting(dataframe, Axis.COLUMN, rules))
+        print(
+            f"table {num_rows}x{num_columns} {scale.value} heatmap:"
+            f" {timing * 1e3:.2f} ms"
+        )
+
+
+def main() -> None:
+    print(f"{'rows':>8} {'per cell [ms]':>14} {'vectorized [ms]':>16} {'speedup':>8}")
+    for num_rows in ROW_COUNTS:
+        column = generate_column(num_rows)
+        # the last rows are skipped, like a skipped average row
+        indices = column.index[: num_rows - 2].tolist()
+        args = (indices, Order.MAXIMUM, HIGHLIGHTING, "%s", "%.2f")
+        per_cell = best_of(lambda: per_cell_highlighting(column, *args))
+        vectorized = best_of(lambda: column_highlighting(column, *args))
+        print(
+            f"{num_rows:>8} {per_cell * 1e3:>14.2f} {vectorized * 1e3:>16.2f}"
+            f" {per_cell / vectorized:>7.1f}x"
+        )
+    bench_axes()
+
+
+if __name__ == "__main__":
+    main()
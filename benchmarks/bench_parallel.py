@@ -0,0 +1,87 @@
+"""Benchmark parallel highlighting of wide tables.
+
+Run with `python benchmarks/bench_parallel.py`. Highlights tables of increasing
+size serially and split across thread and process pools, to find the number of
+values from which an executor pays off (`PARALLEL_MIN_CELLS`). Formatting holds
+the GIL, so threads rarely help, and processes only help on machines with several
+cores. The workers are spawned like those of the app.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from latex_table_editor.highlighting import table_highlighting
+from latex_table_editor.rules import DEFAULT_RULES
+from latex_table_editor.utils import Axis, Order
+
+SHAPES = [(100, 50), (500, 100), (1_000, 200), (2_000, 400), (5_000, 400)]
+RULES = {**DEFAULT_RULES, "order": Order.MAXIMUM}
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def generate_table(num_rows: int, num_columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(0, 100, (num_rows, num_columns)), 2)
+    return pd.DataFrame(values.astype(object))
+
+
+def main() -> None:
+    num_workers = os.cpu_count() or 1
+    print(f"{num_workers} workers")
+    print(
+        f"{'rows':>6} {'columns':>8} {'cells':>10}"
+        f" {'serial [ms]':>12} {'threads [ms]':>13} {'processes [ms]':>15}"
+    )
+    with (
+        ThreadPoolExecutor(num_workers) as threads,
+        ProcessPoolExecutor(
+            num_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as processes,
+    ):
+        # start the worker processes before timing
+        list(processes.map(abs, range(num_workers)))
+        crossover = None
+        for num_rows, num_columns in SHAPES:
+            dataframe = generate_table(num_rows, num_columns)
+            timings = [
+                best_of(
+                    lambda: table_highlighting(
+                        dataframe,
+                        Axis.COLUMN,
+                        dict(RULES),
+                        executor=executor,
+                        min_parallel_cells=0,
+                    )
+                )
+                for executor in (None, threads, processes)
+            ]
+            print(
+                f"{num_rows:>6} {num_columns:>8} {num_rows * num_columns:>10}"
+                f" {timings[0] * 1e3:>12.1f} {timings[1] * 1e3:>13.1f}"
+                f" {timings[2] * 1e3:>15.1f}"
+            )
+            if timings[2] < timings[0] and crossover is None:
+                crossover = num_rows * num_columns
+            elif timings[2] >= timings[0]:
+                crossover = None
+    if crossover is None:
+        print("processes are not faster on any of the tables")
+    else:
+        print(f"processes are faster from {crossover} cells on")
+
+
+if __name__ == "__main__":
+    main()
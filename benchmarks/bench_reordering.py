@@ -0,0 +1,72 @@
+"""Benchmark reordering the rows of a long table.
+
+Run with `python benchmarks/bench_reordering.py`. Compares swapping two rows by
+reindexing the DataFrame, as `Table.swap_rows` did before, with swapping their
+displayed positions, and times sorting the rows by a column and highlighting the
+reordered table.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from latex_table_editor.table import Table
+from latex_table_editor.utils import Axis
+
+NUM_ROWS = 50_000
+NUM_COLUMNS = 4
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def generate_table(num_rows: int, num_columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(0, 100, (num_rows, num_columns)), 2)
+    return pd.DataFrame(
+        values.astype(object),
+        index=[f"method-{i}" for i in range(num_rows)],
+        columns=[f"metric-{i}" for i in range(num_columns)],
+    )
+
+
+def main() -> None:
+    dataframe = generate_table(NUM_ROWS, NUM_COLUMNS)
+    first, last = dataframe.index[0], dataframe.index[-1]
+
+    def reindex_rows():
+        rows = list(dataframe.index)
+        rows[0], rows[-1] = rows[-1], rows[0]
+        dataframe.reindex(rows)
+
+    timing = best_of(reindex_rows)
+    print(f"{NUM_ROWS} rows, swap by reindexing: {timing * 1e3:.2f} ms")
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.highlight_table()
+
+    timing = best_of(lambda: table.swap_rows(first, last))
+    print(f"{NUM_ROWS} rows, swap positions: {timing * 1e3:.3f} ms")
+
+    timing = best_of(lambda: table.sort_by(Axis.COLUMN, "metric-0"))
+    print(f"{NUM_ROWS} rows, sort by a column: {timing * 1e3:.2f} ms")
+
+    def swap_and_highlight():
+        table.swap_rows(first, last)
+        table.highlight_table()
+
+    timing = best_of(swap_and_highlight)
+    print(f"{NUM_ROWS} rows, swap and highlight: {timing * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
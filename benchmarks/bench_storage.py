@@ -0,0 +1,70 @@
+"""Benchmark the columnar storage of tables.
+
+Run with `python benchmarks/bench_storage.py`. Compares the memory of an
+object-dtype DataFrame, as returned by the parser, with the float matrix, mask
+and coordinate lists of `TableData`. It also compares highlighting the
+DataFrame, which coerces every cell, with highlighting the stored data.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from latex_table_editor.highlighting import table_highlighting
+from latex_table_editor.rules import DEFAULT_RULES
+from latex_table_editor.storage import TableData
+from latex_table_editor.table import Table
+from latex_table_editor.utils import Axis, Order
+
+SHAPES = [(1_000, 50), (10_000, 50), (50_000, 20)]
+RULES = {**DEFAULT_RULES, "order": Order.MAXIMUM}
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def generate_table(num_rows: int, num_columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(0, 100, (num_rows, num_columns)), 2).astype(object)
+    # a few cells without a number, like missing results
+    values[rng.uniform(size=values.shape) < 0.01] = "--"
+    return pd.DataFrame(values)
+
+
+def highlight_stored(data: TableData) -> None:
+    table = Table()
+    table.load_data(data)
+    table.reset_formatting_rules()
+    table.set_default_rules(dict(RULES))
+    table.highlight_table()
+
+
+def main() -> None:
+    print(
+        f"{'rows':>6} {'columns':>8} {'DataFrame [MB]':>15} {'stored [MB]':>12}"
+        f" {'DataFrame [ms]':>15} {'stored [ms]':>12}"
+    )
+    for num_rows, num_columns in SHAPES:
+        dataframe = generate_table(num_rows, num_columns)
+        data = TableData.from_dataframe(dataframe)
+        dataframe_bytes = dataframe.memory_usage(index=False, deep=True).sum()
+        dataframe_time = best_of(
+            lambda: table_highlighting(dataframe, Axis.COLUMN, dict(RULES))
+        )
+        stored_time = best_of(lambda: highlight_stored(data))
+        print(
+            f"{num_rows:>6} {num_columns:>8} {dataframe_bytes / 2**20:>15.1f}"
+            f" {data.nbytes() / 2**20:>12.1f} {dataframe_time * 1e3:>15.1f}"
+            f" {stored_time * 1e3:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark hiding and filtering the rows of a table.
+
+Run with `python benchmarks/bench_views.py`. Compares filtering a copy of the
+DataFrame, as a view of the table would have to without masks, with matching a
+new filter against the rows and with switching between filters of a `Table`,
+which only replaces a boolean mask. It also times highlighting the filtered
+table.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from latex_table_editor.table import Table
+from latex_table_editor.utils import Axis
+from latex_table_editor.views import RowFilter
+
+NUM_ROWS = 25_000
+NUM_COLUMNS = 4
+FILTERS = [
+    RowFilter(pattern="-1"),
+    RowFilter(column="metric-0", comparison=">=", value=50),
+    RowFilter(pattern="-2", column="metric-1", comparison="<", value=20),
+]
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def generate_table(num_rows: int, num_columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(0, 100, (num_rows, num_columns)), 2)
+    return pd.DataFrame(
+        values.astype(object),
+        index=[f"method-{i}" for i in range(num_rows)],
+        columns=[f"metric-{i}" for i in range(num_columns)],
+    )
+
+
+def main() -> None:
+    dataframe = generate_table(NUM_ROWS, NUM_COLUMNS)
+    cells = NUM_ROWS * NUM_COLUMNS
+
+    def filter_copies():
+        for row_filter in FILTERS:
+            names = dataframe.index.to_series().str.contains(row_filter.pattern or "")
+            dataframe[names.to_numpy()].copy()
+
+    timing = best_of(filter_copies) / len(FILTERS)
+    print(f"{cells} cells, filter a copy: {timing * 1e3:.2f} ms")
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.highlight_table()
+
+    timing = best_of(lambda: [f.mask(table.data) for f in FILTERS]) / len(FILTERS)
+    print(f"{cells} cells, match a new filter: {timing * 1e3:.2f} ms")
+
+    def switch_filters():
+        for row_filter in FILTERS:
+            table.set_row_filter(row_filter)
+            table.names(Axis.ROW)
+
+    timing = best_of(switch_filters) / len(FILTERS)
+    print(f"{cells} cells, switch the row filter: {timing * 1e3:.2f} ms")
+
+    def hide_and_show():
+        table.toggle_hidden(Axis.COLUMN, "metric-0")
+        table.names(Axis.COLUMN)
+        table.show_all(Axis.COLUMN)
+        table.names(Axis.COLUMN)
+
+    timing = best_of(hide_and_show) / 2
+    print(f"{cells} cells, hide or show a column: {timing * 1e3:.3f} ms")
+
+    def switch_and_highlight():
+        for row_filter in FILTERS:
+            table.set_row_filter(row_filter)
+            table.highlight_table()
+
+    timing = best_of(switch_and_highlight) / len(FILTERS)
+    print(f"{cells} cells, switch the filter and highlight: {timing * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
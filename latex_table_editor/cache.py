@@ -0,0 +1,206 @@
+import contextlib
+import dataclasses
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from .conversion import TableStructure
+
+ParseResult = tuple[pd.DataFrame, TableStructure]
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+DEFAULT_MAX_DISK_BYTES = 1024 * 2**20
+# part of the name of cache files, so files pickled by another version of pandas
+# or before the parsed result changed are never loaded; bump it when it changes
+DISK_FORMAT = f"v2-pandas{pd.__version__}"
+
+
+def normalize_source(latex_str: str) -> str:
+    """
+    Normalize LaTeX table source code for hashing.
+
+    Leading and trailing whitespace of each line and empty lines do not change the
+    parsed table, so they are removed.
+    """
+    lines = (line.strip() for line in latex_str.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def source_key(latex_str: str) -> str:
+    """Hash of the normalized LaTeX source code."""
+    return hashlib.sha256(normalize_source(latex_str).encode("utf-8")).hexdigest()
+
+
+def bytes_key(data: bytes | memoryview) -> str:
+    """Hash of raw LaTeX source bytes, e.g. a slice of a memory-mapped file."""
+    return "raw-" + hashlib.sha256(data).hexdigest()
+
+
+def result_size(result: ParseResult) -> int:
+    """Approximate memory used by a parsed table in bytes."""
+    return int(result[0].memory_usage(index=True, deep=True).sum())
+
+
+class ParseCache:
+    """
+    Cache of parsed tables keyed by a hash of their source.
+
+    Parsed tables are kept in an in-memory LRU limited by their total size. If a
+    cache directory is given, tables are also pickled to it so they survive
+    restarts; the directory is limited by total file size as well, evicting the
+    least recently used files first.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        cache_dir: str | os.PathLike | None = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.entries: OrderedDict[str, tuple[ParseResult, int]] = OrderedDict()
+        self.size = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from memory or disk."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        """Counters describing the cache usage."""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+    def get(self, key: str) -> ParseResult | None:
+        """Return a copy of the cached table for `key`, or None."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.copy_result(self.entries[key][0])
+
+        result = self.load(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self.remember(key, result)
+        return self.copy_result(result)
+
+    def put(self, key: str, result: ParseResult) -> None:
+        """Store a parsed table in memory and, if enabled, on disk."""
+        result = self.copy_result(result)
+        self.remember(key, result)
+        self.store(key, result)
+
+    def clear(self) -> None:
+        """Remove all entries from memory and disk and reset the counters."""
+        self.entries.clear()
+        self.size = 0
+        self.hits = self.disk_hits = self.misses = 0
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob("*.pkl"):
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def copy_result(result: ParseResult) -> ParseResult:
+        # callers may modify the table and its structure, the cached ones have to
+        # stay untouched
+        dataframe, structure = result
+        structure = dataclasses.replace(
+            structure, spans=list(structure.spans), rules=list(structure.rules)
+        )
+        return dataframe.copy(), structure
+
+    def remember(self, key: str, result: ParseResult) -> None:
+        """Add an entry to the in-memory LRU and evict entries beyond `max_bytes`."""
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[1]
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (result, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}-{DISK_FORMAT}.pkl"
+
+    def load(self, key: str) -> ParseResult | None:
+        """Load an entry from the cache directory, deleting unreadable files."""
+        if self.cache_dir is None:
+            return None
+        path = self.path(key)
+        try:
+            with open(path, "rb") as file:
+                result = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # truncated files, or files pickled by other versions whose classes
+            # cannot be loaded, e.g. ModuleNotFoundError or AttributeError
+            result = None
+        if not (
+            isinstance(result, tuple)
+            and len(result) == 2
+            and isinstance(result[0], pd.DataFrame)
+            and isinstance(result[1], TableStructure)
+        ):
+            with contextlib.suppress(OSError):
+                path.unlink(missing_ok=True)
+            return None
+        # mark the file as recently used for eviction
+        os.utime(path)
+        return result
+
+    def store(self, key: str, result: ParseResult) -> None:
+        """Write an entry to the cache directory and evict old files."""
+        if self.cache_dir is None:
+            return
+        path = self.path(key)
+        temporary = path.with_suffix(".tmp")
+        try:
+            with open(temporary, "wb") as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except OSError:
+            temporary.unlink(missing_ok=True)
+            return
+        self.evict_files()
+
+    def evict_files(self) -> None:
+        """Delete the least recently used files beyond `max_disk_bytes`."""
+        files = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda file: file[0]):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
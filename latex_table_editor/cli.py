@@ -1,8 +1,46 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
 from latex_table_editor.lte_app import LTEApp
 
 
 def main():
-    app = LTEApp()
+    parser = argparse.ArgumentParser(
+        prog="lte", description="Manipulate LaTeX tables with ease."
+    )
+    parser.add_argument(
+        "file", nargs="?", default=None, help="LaTeX file containing the table"
+    )
+    parser.add_argument(
+        "-t",
+        "--table",
+        type=int,
+        default=1,
+        help="number of the table to open if the file contains several tables",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="directory to keep parsed tables in across sessions",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="number of processes to highlight large tables with, 0 to disable",
+    )
+    args = parser.parse_args()
+
+    if args.jobs > 0:
+        # the app runs threads, which forked workers could deadlock on
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(args.jobs, mp_context=context) as executor:
+            LTEApp(args.file, args.table, args.cache_dir, executor).run()
+        return
+
+    app = LTEApp(args.file, args.table, args.cache_dir)
     app.run()
 
 
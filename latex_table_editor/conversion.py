@@ -1,122 +1,1174 @@
+import mmap
+import os
 import re
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, TextIO
 
+import numpy as np
 import pandas as pd
 
 
-def latex_table_to_dataframe(latex_str: str) -> pd.DataFrame:
+class Token(str, Enum):
+    TEXT = "text"
+    CELLS = "cells"
+    ROW_END = "row_end"
+    NEWLINE = "newline"
+    SPAN = "span"
+    RULE = "rule"
+    CAPTION = "caption"
+    BLOCK_END = "block_end"
+
+
+class ParseCancelled(Exception):
+    """Raised by a progress callback to abort parsing."""
+
+
+@dataclass(frozen=True)
+class Span:
+    """A `\\multicolumn` or `\\multirow` cell in the parsed grid of cells."""
+
+    row: int
+    column: int
+    row_span: int
+    column_span: int
+
+
+@dataclass
+class TableStructure:
     """
-    Convert LaTeX table source code into a pandas DataFrame.
+    Structure of a parsed LaTeX table.
+
+    Attributes:
+    - header_depth (int): Number of leading rows that form the column headers.
+    - index_depth (int): Number of leading columns that form the row index.
+    - spans (list[Span]): Cells spanning several rows or columns, in grid
+      coordinates, i.e. including header rows and index columns.
+    - rules (list[tuple[int, int, int]]): `\\cmidrule`s and `\\cline`s as
+      (grid row below the rule, first column, last column), columns 1-based.
+    """
+
+    header_depth: int = 0
+    index_depth: int = 0
+    spans: list[Span] = field(default_factory=list)
+    rules: list[tuple[int, int, int]] = field(default_factory=list)
+
+
+# Commands handled by `tokenize`, all other commands are kept in the text of cells.
+STRUCTURE_COMMANDS = (
+    "begin|end|toprule|midrule|bottomrule|hline|endfirsthead|endhead|endfoot"
+    "|endlastfoot|caption|cmidrule|cline|multicolumn|multirow"
+)
+# Text of cells up to the next `&`, row end, comment or structure command. Runs of
+# plain characters alternate with other commands and escaped characters, which
+# never overlap, so the pattern backtracks at most one step per character.
+PLAIN_COMMAND = (
+    r"\\(?!(?:" + STRUCTURE_COMMANDS + r")(?![a-zA-Z]))[a-zA-Z]+(?![a-zA-Z])"
+    r"|\\[^\\a-zA-Z\n]"
+)
+PLAIN_TEXT = r"[^\\&%\n]*(?:(?:" + PLAIN_COMMAND + r")[^\\&%\n]*)*"
+
+# A single combined pattern that splits the LaTeX source into tokens. Every
+# alternative consumes at least one character. Commands with brace arguments
+# (spans, partial rules and environments) only match their name here, their
+# arguments are read by `read_group`, which keeps scanning linear even for nested
+# braces. Cells without structure commands are matched as a whole, together with
+# the `\\` ending the row and the rest of its line, so plain rows take one token.
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<row_end>(?P<row_cells>"""
+    + PLAIN_TEXT
+    + r"(?:&"
+    + PLAIN_TEXT
+    + r""")*)\\\\(?:\[[^\]\n]*\])?[ \t]*(?:%[^\n]*)?\n?)
+    | (?P<cells>"""
+    + PLAIN_TEXT
+    + r"(?:&"
+    + PLAIN_TEXT
+    + r""")+)
+    | (?P<newline>\n)
+    | (?P<text>(?:[^\\&%\n]|"""
+    + PLAIN_COMMAND
+    + r")"
+    + PLAIN_TEXT
+    + r""")
+    | (?P<comment>%[^\n]*)
+    | (?P<environment>\\(?:begin|end)\{[^{}\n]*\})
+    | (?P<rule>\\(?:toprule|midrule|bottomrule|hline)(?![a-zA-Z])(?:\[[^\]\n]*\])?)
+    | (?P<block_end>\\(?:endfirsthead|endhead|endfoot|endlastfoot)(?![a-zA-Z]))
+    | (?P<caption>\\caption\*?(?![a-zA-Z]))
+    | (?P<partial_rule>\\(?:cmidrule|cline)(?![a-zA-Z]))
+    | (?P<span>\\(?:multicolumn|multirow)(?![a-zA-Z]))
+    | (?P<command>\\[a-zA-Z]+|\\.|\\)
+    """,
+    re.VERBOSE,
+)
+# `&` separating the cells of a cells token, i.e. not escaped as `\&`
+CELL_SEPARATOR_PATTERN = re.compile(r"(?<!\\)&")
+# markers that end all three repeated blocks of a longtable, once they are all
+# seen the remaining rows are the body
+REPEATED_BLOCK_ENDS = {"endhead", "endfoot", "endlastfoot"}
+# number of rows converted to numbers and assembled at once
+CHUNK_SIZE = 4096
+# number of lines tokenized between two progress reports
+PROGRESS_INTERVAL = 1024
+
+BRACE_PATTERN = re.compile(r"\\.|[{}]")
+OPTIONAL_ARGUMENT_PATTERN = re.compile(r"[ \t]*(?:\[[^\]\n]*\]|\([^)\n]*\))")
+SPAN_PATTERN = re.compile(r"\s*\\(multicolumn|multirow)(?![a-zA-Z])")
+RULE_RANGE_PATTERN = re.compile(r"\s*(\d+)\s*-\s*(\d+)\s*")
+
+# Patterns applied in order to the text of cells that are not plain numbers before
+# converting them, e.g. `$\textbf{1{,}234.5} \pm 0.3$` becomes `1234.5`.
+NUMBER_CLEANUP_PATTERNS = [
+    # drop uncertainties, only the value itself is kept
+    (re.compile(r"\s*(?:\\pm|±|\+/?-).*$"), ""),
+    # scientific notation written as 1.2 \times 10^{-3}
+    (re.compile(r"\s*\\times\s*10\^\{?\s*([-+]?\d+)\s*\}?"), r"e\1"),
+    # wrapping commands like \underline{...} or {\bf ...}, math mode, braces and
+    # spacing commands, ties are spaces and only spaces around the number are
+    # dropped, so `12 34` is not read as a number
+    (re.compile(r"\\[a-zA-Z]+\*?\s*\{|\\[a-zA-Z]+\s+|[${}]|\\[,;:! ]"), ""),
+    (re.compile(r"~"), " "),
+    (re.compile(r"^\s+|\s+$"), ""),
+    (re.compile(r"−"), "-"),
+    # thousands separators, only in numbers grouped by three digits like 1,234.5
+    (
+        re.compile(r"^[-+]?[1-9]\d{0,2}(?:([,'])\d{3})(?:\1\d{3})*(?=[.eE]|$)"),
+        lambda match: match.group().replace(match.group(1), ""),
+    ),
+]
+# characters changed by one of the cleanup patterns, cells without them are skipped
+NUMBER_CLEANUP_CHARACTERS = re.compile(r"[\\${}~\s±+−,']")
+
+
+def read_group(source: str, pos: int) -> tuple[str, int] | None:
+    """
+    Read a brace group `{...}` starting at `pos`, allowing nested braces.
+
+    The group has to close on the same line. Leading spaces are skipped and a bare
+    `*` is accepted in place of a group, as used by `\\multirow{2}*{...}`.
+
+    Returns:
+    - tuple[str, int] | None: The content of the group and the position after its
+      closing brace, or None if there is no complete group at `pos`.
+    """
+    end = source.find("\n", pos)
+    if end == -1:
+        end = len(source)
+    while pos < end and source[pos] in " \t":
+        pos += 1
+    if pos >= end:
+        return None
+    if source[pos] == "*":
+        return "*", pos + 1
+    if source[pos] != "{":
+        return None
+
+    depth = 0
+    for match in BRACE_PATTERN.finditer(source, pos, end):
+        brace = match.group()
+        if brace == "{":
+            depth += 1
+        elif brace == "}":
+            depth -= 1
+            if depth == 0:
+                return source[pos + 1 : match.start()], match.end()
+    return None
+
+
+def skip_optional_arguments(source: str, pos: int) -> int:
+    """Skip `[...]` and `(...)` arguments starting at `pos`."""
+    while match := OPTIONAL_ARGUMENT_PATTERN.match(source, pos):
+        pos = match.end()
+    return pos
+
+
+def skip_arguments(source: str, pos: int) -> int:
+    """Skip all optional and brace arguments of a command starting at `pos`."""
+    while True:
+        pos = skip_optional_arguments(source, pos)
+        group = read_group(source, pos)
+        if group is None:
+            return pos
+        pos = group[1]
+
+
+def read_span(source: str, pos: int, command: str) -> tuple[int, int, str, int] | None:
+    """
+    Read the arguments of a `\\multicolumn` or `\\multirow` command.
+
+    Spans nested in the content, e.g. `\\multicolumn{2}{c}{\\multirow{2}{*}{A}}`,
+    are resolved as well.
+
+    Returns:
+    - tuple[int, int, str, int] | None: The column span, row span, content and the
+      position after the command, or None if the arguments are malformed.
+    """
+    pos = skip_optional_arguments(source, pos)
+    count = read_group(source, pos)
+    if count is None or not count[0].strip().isdigit():
+        return None
+    pos = skip_optional_arguments(source, count[1])
+    # column specification or width
+    spec = read_group(source, pos)
+    if spec is None:
+        return None
+    pos = skip_optional_arguments(source, spec[1])
+    group = read_group(source, pos)
+    if group is None:
+        return None
+    content, pos = group
+
+    column_span, row_span = 1, 1
+    if command.endswith("multicolumn"):
+        column_span = int(count[0])
+    else:
+        row_span = int(count[0])
+
+    nested = SPAN_PATTERN.match(content)
+    if nested is not None:
+        resolved = read_span(content, nested.end(), nested.group(1))
+        if resolved is not None:
+            nested_column_span, nested_row_span, content, _ = resolved
+            column_span = max(column_span, nested_column_span)
+            row_span = max(row_span, nested_row_span)
+    return column_span, row_span, content.strip(), pos
+
+
+def read_rule_range(source: str, pos: int) -> tuple[tuple[int, int] | None, int]:
+    """Read the `(trim){first-last}` arguments of `\\cmidrule` and `\\cline`."""
+    pos = skip_optional_arguments(source, pos)
+    group = read_group(source, pos)
+    if group is None:
+        return None, pos
+    columns = RULE_RANGE_PATTERN.fullmatch(group[0])
+    if columns is None:
+        return None, group[1]
+    return (int(columns.group(1)), int(columns.group(2))), group[1]
+
+
+def split_cells(text: str) -> list[str]:
+    """Split the text of a cells or row end token at the `&` that are not escaped."""
+    if "\\&" in text:
+        return CELL_SEPARATOR_PATTERN.split(text)
+    return text.split("&")
+
+
+def tokenize(latex_str: str) -> Iterator[tuple[Token, Any]]:
+    """
+    Split LaTeX table source code into row, cell, span and rule tokens.
+
+    Comments, environment delimiters and full-width rules are dropped while
+    scanning, as are the arguments of `\\caption`.
 
     Parameters:
     - latex_str (str): LaTeX table as a string.
 
-    Returns:
-    - pd.DataFrame: DataFrame representation of the LaTeX table.
+    Yields:
+    - tuple[Token, Any]: The token kind and its payload. Text tokens carry the
+      text, cells tokens the list of texts around the `&` of a run of cells
+      without structure commands and row end tokens the same for the cells
+      before the `\\\\`, span tokens a tuple of (column span, row span, content), rule tokens
+      the 1-based (first, last) columns of a `\\cmidrule` or `\\cline` and block
+      end tokens the name of the longtable marker, e.g. `endhead`.
+    """
+    pos = 0
+    end = len(latex_str)
+    while pos < end:
+        match = TOKEN_PATTERN.match(latex_str, pos)
+        kind = match.lastgroup
+        pos = match.end()
+        if kind == "row_end":
+            yield Token.ROW_END, split_cells(match.group("row_cells"))
+        elif kind == "cells":
+            yield Token.CELLS, split_cells(match.group())
+        elif kind == "newline":
+            yield Token.NEWLINE, None
+        elif kind == "text" or kind == "command":
+            yield Token.TEXT, match.group()
+        elif kind == "span":
+            span = read_span(latex_str, pos, match.group())
+            if span is None:
+                yield Token.TEXT, match.group()
+                continue
+            column_span, row_span, content, pos = span
+            yield Token.SPAN, (column_span, row_span, content)
+        elif kind == "block_end":
+            yield Token.BLOCK_END, match.group()[1:]
+        elif kind == "caption":
+            pos = skip_arguments(latex_str, pos)
+            yield Token.CAPTION, None
+        elif kind == "partial_rule":
+            columns, pos = read_rule_range(latex_str, pos)
+            if columns is not None:
+                yield Token.RULE, columns
+        elif kind == "environment" and match.group().startswith("\\begin"):
+            # skip the column specification and other arguments
+            pos = skip_arguments(latex_str, pos)
+
+
+def iter_rows(
+    tokens: Iterable[tuple[Token, Any]],
+    rules: list[tuple[int, int, int]] | None = None,
+    markers: list[tuple[int, str]] | None = None,
+) -> Iterator[list[tuple[str, int, int]]]:
+    """
+    Assemble tokens into rows of cells.
+
+    Rows end at `\\\\`, at the end of a line or at a longtable marker such as
+    `\\endhead`. Each cell is a tuple of (content, column span, row span). Rows
+    holding a `\\caption` are dropped. If `rules` is given, partial rules are
+    appended to it as (index of the next row, first column, last column). If
+    `markers` is given, longtable markers are appended to it as (index of the next
+    row, name).
+    """
+    num_rows = 0
+    cells = []
+    text = []
+    column_span, row_span = 1, 1
+    started = False
+    caption = False
+    for kind, value in tokens:
+        if kind is Token.CELLS or kind is Token.ROW_END:
+            if len(value) > 1:
+                # the first text ends the current cell, the last one starts a new one
+                text.append(value[0])
+                cells.append(("".join(text).strip(), column_span, row_span))
+                cells += [(content.strip(), 1, 1) for content in value[1:-1]]
+                text = [value[-1]]
+                column_span, row_span = 1, 1
+                started = True
+            elif value[0]:
+                text.append(value[0])
+                started = started or not value[0].isspace()
+
+        if kind is Token.TEXT:
+            text.append(value)
+            started = started or not value.isspace()
+        elif kind is Token.SPAN:
+            column_span, row_span, content = value
+            text.append(content)
+            started = True
+        elif kind is Token.RULE:
+            if rules is not None:
+                rules.append((num_rows, *value))
+        elif kind is Token.CAPTION:
+            caption = True
+            started = True
+        elif kind in (Token.ROW_END, Token.NEWLINE, Token.BLOCK_END):
+            if started and not caption:
+                cells.append(("".join(text).strip(), column_span, row_span))
+                yield cells
+                num_rows += 1
+            cells = []
+            text = []
+            column_span, row_span = 1, 1
+            started = False
+            caption = False
+            if kind is Token.BLOCK_END and markers is not None:
+                markers.append((num_rows, value))
+
+    if started and not caption:
+        cells.append(("".join(text).strip(), column_span, row_span))
+        yield cells
+
+
+def block_kept(marker: str, first_head: bool) -> bool:
+    """
+    Whether the rows of a longtable block ending at `marker` are kept.
+
+    The first head, ended by `\\endfirsthead`, is kept, as is the head ended by
+    `\\endhead` when there is no first head. The head repeated on later pages and
+    the feet ended by `\\endfoot` and `\\endlastfoot` are dropped.
+    """
+    return marker == "endfirsthead" or (marker == "endhead" and not first_head)
+
+
+def kept_rows(num_rows: int, markers: list[tuple[int, str]]) -> np.ndarray:
+    """
+    Boolean mask of the rows of a longtable that are kept, see `block_kept`.
+
+    `markers` are given as (index of the next row, name), as collected by
+    `iter_rows`. The rows before the first marker and after the last one are
+    always kept.
+    """
+    kept = np.ones(num_rows, dtype=bool)
+    start = 0
+    first_head = False
+    for idx, (stop, marker) in enumerate(markers):
+        if idx > 0 and not block_kept(marker, first_head):
+            kept[start:stop] = False
+        first_head = first_head or marker == "endfirsthead"
+        start = stop
+    return kept
+
+
+def remap_rules(
+    rules: list[tuple[int, int, int]], kept: np.ndarray
+) -> list[tuple[int, int, int]]:
+    """Partial rules with row indices among the kept rows, without the rules of
+    dropped rows."""
+    kept_before = np.concatenate([[0], np.cumsum(kept)])
+    return [
+        (int(kept_before[row]), first, last)
+        for row, first, last in rules
+        if row >= len(kept) or kept[row]
+    ]
+
+
+def drop_repeated_blocks(
+    rows: Iterable[list[tuple[str, int, int]]],
+    markers: list[tuple[int, str]],
+    rules: list[tuple[int, int, int]] | None = None,
+) -> Iterator[list[tuple[str, int, int]]]:
     """
-    # Split the LaTeX string into individual lines
-    lines = latex_str.strip().splitlines()
+    Drop the repeated head and the feet of a longtable from rows of cells.
 
+    `markers` is filled by the `iter_rows` producing `rows` while they are read,
+    see `kept_rows` for which rows are kept. Rows after a marker are held back
+    until the next marker decides about them, or until all repeated blocks have
+    ended, so tables without markers are passed through as they are read. If
+    `rules` is given, their row indices are updated to the kept rows at the end.
+    """
+    kept = []
+    pending = []
+    block_start = 0
+    handled = 0
+    first_head = False
+    seen = set()
+
+    def close_blocks() -> list[list[tuple[str, int, int]]]:
+        nonlocal block_start, handled, first_head
+        closed = []
+        for stop, marker in markers[handled:]:
+            block = pending[: stop - block_start]
+            del pending[: stop - block_start]
+            keep = handled == 0 or block_kept(marker, first_head)
+            if keep:
+                closed.extend(block)
+            kept.extend([keep] * len(block))
+            first_head = first_head or marker == "endfirsthead"
+            seen.add(marker)
+            block_start = stop
+            handled += 1
+        return closed
+
+    for row in rows:
+        yield from close_blocks()
+        if handled and not REPEATED_BLOCK_ENDS <= seen:
+            pending.append(row)
+        else:
+            yield row
+            kept.append(True)
+            block_start += 1
+    yield from close_blocks()
+    yield from pending
+    kept.extend([True] * len(pending))
 
-    data_lines = []
-    multirow_counters = {}
-    for line in lines:
-        line = line.strip()
+    if rules and not all(kept):
+        rules[:] = remap_rules(rules, np.array(kept, dtype=bool))
+
+
+class SpanResolver:
+    """
+    Expand `\\multicolumn` cells and fill `\\multirow` cells into later rows, one
+    row at a time.
 
-        # Skip empty lines
-        if not line:
-            continue
+    The multirows still open after a row are described by `state()`, which allows
+    resuming the resolution at any row with `restore()`.
+    """
 
-        # Skip LaTeX table environment lines and \toprule, \bottomrule, \hline, \cmidrule
-        if re.match(r'\\begin\{tabular\}', line) or re.match(r'\\end\{tabular\}', line):
-            continue
-        if re.match(r'\\(top|bottom|mid)rule', line):
-            continue
-        if re.match(r'\\hline', line):
-            continue
-        if re.match(r'\\cmidrule', line):
-            continue
+    def __init__(self):
+        # rows each column is still covered by a multirow, and the multirow content
+        self.remaining: list[int] = []
+        self.contents: list[str] = []
+        self.active = 0
 
+    def state(self) -> tuple[tuple[int, int, str], ...]:
+        """The open multirows as (column, remaining rows, content)."""
+        if not self.active:
+            return ()
+        return tuple(
+            (col, count, self.contents[col])
+            for col, count in enumerate(self.remaining)
+            if count
+        )
 
-        # Remove comments starting with %
-        line = re.sub(r'%.*', '', line).strip()
-        if not line:
-            continue
+    def restore(self, state: tuple[tuple[int, int, str], ...]) -> None:
+        """Continue from a state returned by `state()`."""
+        width = max((col + 1 for col, _, _ in state), default=0)
+        self.remaining = [0] * width
+        self.contents = [""] * width
+        self.active = len(state)
+        for col, count, content in state:
+            self.remaining[col] = count
+            self.contents[col] = content
 
-        # Remove trailing '\\'
-        line = re.sub(r'\\\\', '', line).strip()
-        if not line:
-            continue
+    def resolve(
+        self,
+        row: list[tuple[str, int, int]],
+        spans: list[tuple[int, int, int]] | None = None,
+    ) -> list[str]:
+        """
+        Resolve the spans of the next row.
 
-        # Split the line by '&' and strip whitespace from each cell
-        cells = [cell.strip() for cell in line.split('&')]
+        If `spans` is given, every spanning cell of the row is appended to it as
+        (column, row span, column span).
+        """
+        remaining, contents = self.remaining, self.contents
 
         # account for \multicolumn
         final_cells = []
-        for cell in cells:
-            multicol_match = re.match(r'\\multicolumn\{(\d+)\}\{[^\}]*\}\{(.+)\}', cell)
-            if multicol_match:
-                span = int(multicol_match.group(1))
-                content = multicol_match.group(2).strip()
-                final_cells.extend([content] * span)
-            else:
-                final_cells.append(cell)
-
-        # add multirow from previous line
-        for col, (count, content) in multirow_counters.items():
-            if count > 0:
-                final_cells[col] = content
-                multirow_counters[col] = (count - 1, content)
-            
-        # pop multirow counters that are 0
-        multirow_counters = {col: (count, content) for col, (count, content) in multirow_counters.items() if count > 0}
+        for content, column_span, _ in row:
+            final_cells.extend([content] * column_span)
+        if len(final_cells) > len(remaining):
+            missing = len(final_cells) - len(remaining)
+            remaining.extend([0] * missing)
+            contents.extend([""] * missing)
+
+        # add multirow from previous lines
+        if self.active:
+            for col, count in enumerate(remaining):
+                if count == 0:
+                    continue
+                if col < len(final_cells):
+                    final_cells[col] = contents[col]
+                remaining[col] = count - 1
+                if count == 1:
+                    self.active -= 1
 
         # check for multirow command and add to the counter
-        for idx, cell in enumerate(final_cells):
-            multirow_match = re.match(r'\\multirow\{(\d+)\}\{[^\}]*\}\{(.+)\}', cell)
-            if multirow_match:
-                span = int(multirow_match.group(1))
-                content = multirow_match.group(2).strip()
-                multirow_counters[idx] = (span - 1, content)
-                final_cells[idx] = content
-
-        data_lines.append(final_cells)
-
-    # Create DataFrame
-    df = pd.DataFrame(data_lines)
-
-    # Function to extract numerical value from a cell
-    def extract_number(cell):
-        if cell == "":
-            return cell
-        # Remove LaTeX commands like \underline{} from around numbers
-        cell_wo_commands = re.sub(r'\\[a-zA-Z]+\{([^}]+)\}', r'\1', cell)
-        cell_wo_commands = cell_wo_commands.strip()
-        # if only a number is left, turn it into a float
-        if re.match(r'-?\d+\.?\d*', cell_wo_commands):
-            return float(cell_wo_commands)
-        return cell
-    
-    # Apply the extraction function to all cells
-    df = df.applymap(extract_number)
-
-    # Figure out which rows are headers and which columns are indices by checking where there are numbers
-    header_indices = []
-    for idx, row in df.iterrows():
-        if any(isinstance(cell, float) for cell in row):
-            break
-        header_indices.append(idx)
-    index_indices = []
-    for idx, col in enumerate(df):
-        column = df[col]
-        if any(isinstance(cell, float) for cell in column):
-            break
-        index_indices.append(idx)
+        col = 0
+        for content, column_span, row_span in row:
+            if spans is not None and (row_span > 1 or column_span > 1):
+                spans.append((col, row_span, column_span))
+            if row_span > 1:
+                for span_col in range(col, col + column_span):
+                    if remaining[span_col] == 0:
+                        self.active += 1
+                    remaining[span_col] = row_span - 1
+                    contents[span_col] = content
+            col += column_span
+
+        return final_cells
+
+
+def resolve_spans(
+    rows: Iterable[list[tuple[str, int, int]]],
+    spans: list[Span] | None = None,
+) -> Iterator[list[str]]:
+    """
+    Expand `\\multicolumn` cells and fill `\\multirow` cells into later rows.
+
+    If `spans` is given, every spanning cell is appended to it.
+    """
+    resolver = SpanResolver()
+    row_spans = None if spans is None else []
+    for row_idx, row in enumerate(rows):
+        yield resolver.resolve(row, row_spans)
+        if row_spans:
+            spans.extend(Span(row_idx, *span) for span in row_spans)
+            row_spans.clear()
+
+
+def extract_numbers(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert all cells holding a number into floats in one vectorized pass.
+
+    Wrapping commands such as `\\underline{}` are removed, `$...$`, uncertainties
+    after `\\pm`, scientific notation and thousands separators are understood.
+    Cells that do not hold a number are returned unchanged.
+
+    Parameters:
+    - values (np.ndarray): Object array of cell contents.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray]: Object array of the same shape with floats for
+      numeric cells, and a boolean mask of the numeric cells.
+    """
+    cells = pd.Series(values.ravel(), dtype=object)
+    # plain numbers are converted directly, only the remaining cells are cleaned up
+    numbers = pd.to_numeric(cells, errors="coerce").to_numpy(dtype=float)
+    pending = np.flatnonzero(~np.isfinite(numbers))
+    text = cells.iloc[pending]
+    cleaned = text.str.contains(NUMBER_CLEANUP_CHARACTERS, na=False).to_numpy()
+    pending = pending[cleaned]
+    text = text[cleaned]
+    for pattern, replacement in NUMBER_CLEANUP_PATTERNS:
+        text = text.str.replace(pattern, replacement, regex=True)
+    numbers[pending] = pd.to_numeric(text, errors="coerce").to_numpy(dtype=float)
+    is_number = np.isfinite(numbers)
+
+    result = values.ravel().copy()
+    result[is_number] = numbers[is_number]
+    return result.reshape(values.shape), is_number.reshape(values.shape)
+
+
+def infer_structure(is_number: np.ndarray, structure: TableStructure) -> None:
+    """
+    Infer the header rows and index columns of a grid of cells in place.
+
+    Headers are all rows before the first row containing a number, indices all
+    columns before the first column containing a number.
+    """
+    rows_with_number = is_number.any(axis=1)
+    columns_with_number = is_number.any(axis=0)
+    structure.header_depth = (
+        int(rows_with_number.argmax()) if rows_with_number.any() else len(is_number)
+    )
+    structure.index_depth = (
+        int(columns_with_number.argmax())
+        if columns_with_number.any()
+        else is_number.shape[1]
+    )
+
+
+def build_dataframe(
+    values: np.ndarray,
+    is_number: np.ndarray,
+    structure: TableStructure,
+) -> pd.DataFrame:
+    """
+    Split a grid of cells into headers, indices and data.
+
+    The header and index depth of `structure` are inferred from `is_number`.
+    """
+    # Figure out which rows are headers and which columns are indices by checking
+    # where there are numbers
+    infer_structure(is_number, structure)
+    header_depth, index_depth = structure.header_depth, structure.index_depth
 
     # extract the headers and indices
-    non_index_columns = [idx for idx in range(len(df.columns)) if idx not in index_indices]
-    non_header_rows = [idx for idx in range(len(df)) if idx not in header_indices]
-    headers = df.iloc[header_indices, non_index_columns]
-    indices = df.iloc[non_header_rows, index_indices]
-    data = df.iloc[non_header_rows, non_index_columns]
+    headers = values[:header_depth, index_depth:]
+    indices = values[header_depth:, :index_depth]
+    data = values[header_depth:, index_depth:]
+
+    return pd.DataFrame(
+        data,
+        index=indices.T.tolist() if index_depth else None,
+        columns=headers.tolist() if header_depth else None,
+    )
+
+
+def assemble_table(
+    rows: Iterable[list[str]],
+    structure: TableStructure,
+    chunk_size: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Build a DataFrame from rows of cells, converting `chunk_size` rows at a time.
+
+    Only the rows of one chunk are held as Python lists at any time, so memory
+    stays proportional to the resulting table.
+    """
+    value_chunks = []
+    mask_chunks = []
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        grid = pd.DataFrame(chunk, dtype=object).to_numpy()
+        del chunk
+        values, is_number = extract_numbers(grid)
+        value_chunks.append(values)
+        mask_chunks.append(is_number)
+
+    num_rows = sum(len(chunk) for chunk in value_chunks)
+    num_columns = max((chunk.shape[1] for chunk in value_chunks), default=0)
+    values = np.full((num_rows, num_columns), None, dtype=object)
+    is_number = np.zeros((num_rows, num_columns), dtype=bool)
+    start = 0
+    # copy chunks into the final grid, releasing each chunk once it is copied
+    value_chunks.reverse()
+    mask_chunks.reverse()
+    while value_chunks:
+        chunk_values, chunk_mask = value_chunks.pop(), mask_chunks.pop()
+        stop = start + len(chunk_values)
+        values[start:stop, : chunk_values.shape[1]] = chunk_values
+        is_number[start:stop, : chunk_mask.shape[1]] = chunk_mask
+        start = stop
+
+    return build_dataframe(values, is_number, structure)
+
+
+def iter_table_rows(
+    source: str | os.PathLike | TextIO | Iterable[str],
+    structure: TableStructure | None = None,
+) -> Iterator[list[str]]:
+    """
+    Parse a LaTeX table line by line from a text stream or a file path.
+
+    Parameters:
+    - source (str | os.PathLike | TextIO | Iterable[str]): Path of a file, an open
+      text stream or any other iterable of lines.
+    - structure (TableStructure | None): If given, spans and partial rules are
+      recorded in it.
+
+    Yields:
+    - list[str]: The cells of each row, with spans resolved.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as stream:
+            yield from iter_table_rows(stream, structure)
+        return
+
+    tokens = (token for line in source for token in tokenize(line))
+    markers = []
+    if structure is None:
+        rows = drop_repeated_blocks(iter_rows(tokens, markers=markers), markers)
+        yield from resolve_spans(rows)
+    else:
+        rows = iter_rows(tokens, structure.rules, markers)
+        rows = drop_repeated_blocks(rows, markers, structure.rules)
+        yield from resolve_spans(rows, structure.spans)
+
+
+def read_latex_table(
+    source: str | os.PathLike | TextIO | Iterable[str],
+    chunk_size: int = CHUNK_SIZE,
+) -> tuple[pd.DataFrame, TableStructure]:
+    """
+    Read a LaTeX table from a text stream or a file path without loading it whole.
+
+    Parameters:
+    - source (str | os.PathLike | TextIO | Iterable[str]): Path of a file, an open
+      text stream or any other iterable of lines.
+    - chunk_size (int): Number of rows converted at once.
+
+    Returns:
+    - tuple[pd.DataFrame, TableStructure]: DataFrame representation of the LaTeX
+      table and the inferred header, index and span structure.
+    """
+    structure = TableStructure()
+    dataframe = assemble_table(
+        iter_table_rows(source, structure), structure, chunk_size
+    )
+    return dataframe, structure
+
+
+def iter_mapped_lines(
+    buffer: mmap.mmap,
+    start: int = 0,
+    end: int | None = None,
+    encoding: str = "utf-8",
+) -> Iterator[str]:
+    """Decode the lines of a memory-mapped file between two byte offsets lazily."""
+    end = len(buffer) if end is None else end
+    while start < end:
+        stop = buffer.find(b"\n", start, end)
+        stop = end if stop == -1 else stop + 1
+        yield buffer[start:stop].decode(encoding)
+        start = stop
+
+
+def parse_latex_table(latex_str: str) -> tuple[pd.DataFrame, TableStructure]:
+    """
+    Convert LaTeX table source code into a pandas DataFrame and its structure.
+
+    Parameters:
+    - latex_str (str): LaTeX table as a string.
+
+    Returns:
+    - tuple[pd.DataFrame, TableStructure]: DataFrame representation of the LaTeX
+      table and the inferred header, index and span structure.
+    """
+    structure = TableStructure()
+    markers = []
+    rows = iter_rows(tokenize(latex_str), structure.rules, markers)
+    rows = drop_repeated_blocks(rows, markers, structure.rules)
+    dataframe = assemble_table(resolve_spans(rows, structure.spans), structure)
+    return dataframe, structure
+
+
+def latex_table_to_dataframe(latex_str: str) -> pd.DataFrame:
+    """
+    Convert LaTeX table source code into a pandas DataFrame.
+
+    Parameters:
+    - latex_str (str): LaTeX table as a string.
+
+    Returns:
+    - pd.DataFrame: DataFrame representation of the LaTeX table.
+    """
+    return parse_latex_table(latex_str)[0]
+
+
+class IncrementalParser:
+    """
+    Parser that keeps the results of every line to reparse only edited lines.
+
+    Rows never span several lines, so each line is tokenized on its own. When the
+    source is updated, the lines between the unchanged prefix and suffix are
+    tokenized again and spans are resolved from the first edited row until the
+    open multirows match those of the previous parse again. Only the rows that
+    changed are converted to numbers and the DataFrame is patched in place when
+    its shape and structure stay the same.
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+        # per line: rows as returned by `iter_rows`, partial rules and longtable
+        # markers, with row indices relative to the line
+        self.line_rows: list[list[list[tuple[str, int, int]]]] = []
+        self.line_rules: list[list[tuple[int, int, int]]] = []
+        self.line_markers: list[list[tuple[int, str]]] = []
+        # mask of the rows of all lines that are kept, None without markers
+        self.kept: np.ndarray | None = None
+        # per row: cells before and after resolving spans, and spanning cells
+        self.raw_rows: list[list[tuple[str, int, int]]] = []
+        self.rows: list[list[str]] = []
+        self.row_spans: list[list[tuple[int, int, int]]] = []
+        # open multirows before each row, and after the last one
+        self.states: list[tuple[tuple[int, int, str], ...]] = [()]
+
+        self.values = np.empty((0, 0), dtype=object)
+        self.is_number = np.zeros((0, 0), dtype=bool)
+        self.dataframe = pd.DataFrame()
+        self.structure = TableStructure()
+        # first row and previous cells of the rows of `values` and `is_number`
+        # overwritten in place by the current update
+        self.overwritten: tuple[int, np.ndarray, np.ndarray] | None = None
+
+        # number of lines tokenized and rows converted by the last update
+        self.reparsed_lines = 0
+        self.reconverted_rows = 0
+
+    @property
+    def source(self) -> str:
+        """The source code of the last update."""
+        return "\n".join(self.lines)
+
+    def update(
+        self,
+        latex_str: str,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> tuple[pd.DataFrame, TableStructure]:
+        """
+        Parse new LaTeX table source code, reusing the results of unchanged lines.
+
+        Parameters:
+        - latex_str (str): LaTeX table as a string.
+        - progress (Callable[[int, int], None] | None): Called with the work done
+          and the total work every `PROGRESS_INTERVAL` lines or rows, while the
+          edited lines are tokenized, their rows resolved and converted. The work
+          is counted in lines and rows, assuming one row per line until the lines
+          are tokenized. It may raise `ParseCancelled` to abort.
+
+        If the update fails, e.g. when it is cancelled, the parser is left as it
+        was before the update.
+
+        Returns:
+        - tuple[pd.DataFrame, TableStructure]: A copy of the DataFrame
+          representation of the LaTeX table and the inferred structure.
+        """
+        new_lines = latex_str.splitlines()
+        line_start, old_line_stop, new_line_stop = self.changed_range(new_lines)
+
+        # tokenize the edited lines
+        changed_rows = []
+        changed_rules = []
+        changed_markers = []
+        num_changed = new_line_stop - line_start
+        # each row is resolved and converted after the lines are tokenized
+        total = 3 * num_changed
+        for idx, line in enumerate(new_lines[line_start:new_line_stop]):
+            if progress is not None and idx % PROGRESS_INTERVAL == 0:
+                progress(idx, total)
+            rules = []
+            markers = []
+            changed_rows.append(list(iter_rows(tokenize(line), rules, markers)))
+            changed_rules.append(rules)
+            changed_markers.append(markers)
+        self.reparsed_lines = len(changed_rows)
+
+        # restored if the update fails or is cancelled while resolving or converting
+        saved = self.save()
+        try:
+            self.apply_lines(
+                new_lines[line_start:new_line_stop],
+                line_start,
+                old_line_stop,
+                changed_rows,
+                changed_rules,
+                changed_markers,
+                progress,
+                num_changed,
+            )
+        except BaseException:
+            self.restore(saved)
+            raise
+        return self.dataframe.copy(), self.structure
+
+    def save(self) -> tuple:
+        """Shallow copies of the lists updated in place by `apply_lines`, and the
+        converted results it replaces."""
+        self.overwritten = None
+        return (
+            self.lines[:],
+            self.line_rows[:],
+            self.line_rules[:],
+            self.line_markers[:],
+            self.raw_rows[:],
+            self.rows[:],
+            self.row_spans[:],
+            self.states[:],
+            self.kept,
+            self.values,
+            self.is_number,
+            self.dataframe,
+            self.structure,
+        )
+
+    def restore(self, saved: tuple) -> None:
+        """Go back to the lists returned by `save`."""
+        (
+            self.lines,
+            self.line_rows,
+            self.line_rules,
+            self.line_markers,
+            self.raw_rows,
+            self.rows,
+            self.row_spans,
+            self.states,
+            self.kept,
+            self.values,
+            self.is_number,
+            self.dataframe,
+            self.structure,
+        ) = saved
+        if self.overwritten is not None:
+            row_start, values, is_number = self.overwritten
+            self.values[row_start : row_start + len(values)] = values
+            self.is_number[row_start : row_start + len(values)] = is_number
+            self.overwritten = None
+
+    def apply_lines(
+        self,
+        lines: list[str],
+        line_start: int,
+        old_line_stop: int,
+        changed_rows: list[list[list[tuple[str, int, int]]]],
+        changed_rules: list[list[tuple[int, int, int]]],
+        changed_markers: list[list[tuple[int, str]]],
+        progress: Callable[[int, int], None] | None,
+        num_changed: int,
+    ) -> None:
+        """Replace the lines from `line_start` to `old_line_stop` with tokenized
+        lines, then resolve and convert their rows."""
+        row_start = sum(map(len, self.line_rows[:line_start]))
+        old_row_stop = row_start + sum(
+            map(len, self.line_rows[line_start:old_line_stop])
+        )
+        self.lines[line_start:old_line_stop] = lines
+        self.line_rows[line_start:old_line_stop] = changed_rows
+        self.line_rules[line_start:old_line_stop] = changed_rules
+        self.line_markers[line_start:old_line_stop] = changed_markers
+        if self.kept is not None or any(self.line_markers):
+            # which rows of a longtable are kept depends on markers on other
+            # lines, so all rows are resolved again
+            row_start, old_row_stop = 0, len(self.raw_rows)
+            self.raw_rows = self.kept_raw_rows()
+            new_row_stop = len(self.raw_rows)
+        else:
+            self.raw_rows[row_start:old_row_stop] = [
+                row for rows in changed_rows for row in rows
+            ]
+            new_row_stop = row_start + sum(map(len, changed_rows))
+
+        resolve_progress = convert_progress = None
+        if progress is not None:
+            num_rows = new_row_stop - row_start
+            total = num_changed + 2 * num_rows
+
+            def resolve_progress(done: int) -> None:
+                progress(min(num_changed + done, total), total)
+
+            def convert_progress(done: int) -> None:
+                progress(min(num_changed + num_rows + done, total), total)
+
+        old_stop, new_stop = self.resolve(
+            row_start, old_row_stop, new_row_stop, resolve_progress
+        )
+        self.convert(row_start, old_stop, new_stop, convert_progress)
+
+    def changed_range(self, new_lines: list[str]) -> tuple[int, int, int]:
+        """Lines between the common prefix and suffix of the old and new source."""
+        old_lines = self.lines
+        limit = min(len(old_lines), len(new_lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]
+        ):
+            suffix += 1
+        return prefix, len(old_lines) - suffix, len(new_lines) - suffix
+
+    def resolve(
+        self,
+        row_start: int,
+        old_row_stop: int,
+        new_row_stop: int,
+        progress: Callable[[int], None] | None = None,
+    ) -> tuple[int, int]:
+        """
+        Resolve spans from `row_start` until the edit no longer affects multirows.
+
+        `progress` is called with the number of resolved rows every
+        `PROGRESS_INTERVAL` rows.
+
+        Returns:
+        - tuple[int, int]: End of the resolved rows in the old and new rows.
+        """
+        shift = new_row_stop - old_row_stop
+        resolver = SpanResolver()
+        resolver.restore(self.states[row_start])
+        resolved = []
+        spans = []
+        states = [self.states[row_start]]
+        row_idx = row_start
+        while row_idx < len(self.raw_rows):
+            # past the edit, rows are unchanged once the open multirows are
+            if row_idx >= new_row_stop and states[-1] == self.states[row_idx - shift]:
+                break
+            if progress is not None and len(resolved) % PROGRESS_INTERVAL == 0:
+                progress(len(resolved))
+            row_spans = []
+            resolved.append(resolver.resolve(self.raw_rows[row_idx], row_spans))
+            spans.append(row_spans)
+            states.append(resolver.state())
+            row_idx += 1
+
+        old_stop = row_idx - shift
+        self.rows[row_start:old_stop] = resolved
+        self.row_spans[row_start:old_stop] = spans
+        self.states[row_start : old_stop + 1] = states
+        return old_stop, row_idx
+
+    def convert(
+        self,
+        row_start: int,
+        old_stop: int,
+        new_stop: int,
+        progress: Callable[[int], None] | None = None,
+    ) -> None:
+        """
+        Convert the resolved rows to numbers and update the DataFrame.
+
+        The rows are converted `CHUNK_SIZE` rows at a time, and `progress` is
+        called with the number of converted rows before each chunk.
+        """
+        self.reconverted_rows = new_stop - row_start
+        width = max(map(len, self.rows), default=0)
+        value_chunks = []
+        mask_chunks = []
+        for chunk_start in range(row_start, new_stop, CHUNK_SIZE):
+            if progress is not None:
+                progress(chunk_start - row_start)
+            chunk_rows = self.rows[
+                chunk_start : min(chunk_start + CHUNK_SIZE, new_stop)
+            ]
+            grid = np.full((len(chunk_rows), width), None, dtype=object)
+            for idx, row in enumerate(chunk_rows):
+                grid[idx, : len(row)] = row
+            chunk_values, chunk_mask = extract_numbers(grid)
+            value_chunks.append(chunk_values)
+            mask_chunks.append(chunk_mask)
+        if value_chunks:
+            values = np.concatenate(value_chunks)
+            is_number = np.concatenate(mask_chunks)
+        else:
+            values = np.full((0, width), None, dtype=object)
+            is_number = np.zeros((0, width), dtype=bool)
+
+        old_structure = self.structure
+        old_index = self.values[row_start:old_stop, : old_structure.index_depth].copy()
+        in_place = width == self.values.shape[1] and old_stop - row_start == len(values)
+        if in_place:
+            self.overwritten = (
+                row_start,
+                self.values[row_start:old_stop].copy(),
+                self.is_number[row_start:old_stop].copy(),
+            )
+            self.values[row_start:old_stop] = values
+            self.is_number[row_start:old_stop] = is_number
+        else:
+            self.values = np.concatenate(
+                [
+                    self.fit(self.values[:row_start], width),
+                    values,
+                    self.fit(self.values[old_stop:], width),
+                ]
+            )
+            self.is_number = np.concatenate(
+                [
+                    self.fit(self.is_number[:row_start], width),
+                    is_number,
+                    self.fit(self.is_number[old_stop:], width),
+                ]
+            )
+
+        structure = TableStructure(
+            spans=[
+                Span(row_idx, *span)
+                for row_idx, row_spans in enumerate(self.row_spans)
+                for span in row_spans
+            ],
+            rules=self.collect_rules(),
+        )
+        infer_structure(self.is_number, structure)
+        self.structure = structure
+
+        header_depth, index_depth = structure.header_depth, structure.index_depth
+        if (
+            in_place
+            and header_depth == old_structure.header_depth
+            and index_depth == old_structure.index_depth
+            and row_start >= header_depth
+            and np.array_equal(values[:, :index_depth], old_index)
+        ):
+            # only data cells changed, patch them into a copy of the DataFrame,
+            # which is kept if the update fails
+            dataframe = self.dataframe.copy()
+            dataframe.iloc[row_start - header_depth : old_stop - header_depth] = values[
+                :, index_depth:
+            ]
+            self.dataframe = dataframe
+        else:
+            self.dataframe = build_dataframe(self.values, self.is_number, structure)
+
+    def kept_raw_rows(self) -> list[list[tuple[str, int, int]]]:
+        """Rows of all lines without the repeated blocks of a longtable, updating
+        `kept`."""
+        rows = []
+        markers = []
+        for line_rows, line_markers in zip(self.line_rows, self.line_markers):
+            markers.extend((len(rows) + row, marker) for row, marker in line_markers)
+            rows.extend(line_rows)
+        self.kept = kept_rows(len(rows), markers) if markers else None
+        if self.kept is None:
+            return rows
+        return [row for row, keep in zip(rows, self.kept) if keep]
+
+    def collect_rules(self) -> list[tuple[int, int, int]]:
+        """Partial rules of all lines with row indices relative to the table."""
+        rules = []
+        num_rows = 0
+        for rows, line_rules in zip(self.line_rows, self.line_rules):
+            rules.extend(
+                (num_rows + row, first, last) for row, first, last in line_rules
+            )
+            num_rows += len(rows)
+        if self.kept is not None:
+            return remap_rules(rules, self.kept)
+        return rules
 
-    return pd.DataFrame(data.values, index=indices.T.values.tolist(), columns=headers.values.tolist())
+    @staticmethod
+    def fit(grid: np.ndarray, width: int) -> np.ndarray:
+        """Pad or cut a grid of cells to `width` columns."""
+        if grid.shape[1] >= width:
+            return grid[:, :width]
+        fill = None if grid.dtype == object else False
+        padding = np.full((len(grid), width - grid.shape[1]), fill, dtype=grid.dtype)
+        return np.concatenate([grid, padding], axis=1)
@@ -0,0 +1,144 @@
+import mmap
+import os
+import re
+from dataclasses import dataclass
+
+import pandas as pd
+
+from .cache import ParseCache, bytes_key
+from .conversion import TableStructure, iter_mapped_lines, read_latex_table
+
+TABLE_ENVIRONMENTS = ("tabular", "tabular*", "tabularx", "tabulary", "longtable")
+
+# `\begin` and `\end` of all table environments, matched on the raw bytes of the
+# document so that the mapped file never has to be decoded as a whole.
+ENVIRONMENT_PATTERN = re.compile(
+    rb"\\(begin|end)\{("
+    + b"|".join(re.escape(name.encode()) for name in TABLE_ENVIRONMENTS)
+    + rb")\}"
+)
+COMMENT_PATTERN = re.compile(rb"(?<!\\)%")
+
+
+@dataclass(frozen=True)
+class TableLocation:
+    """
+    Position of a table environment in a LaTeX document.
+
+    Attributes:
+    - environment (str): Name of the environment, e.g. `tabular`, or an empty
+      string if the whole document is the body of a table.
+    - start (int): Byte offset of `\\begin{...}`.
+    - end (int): Byte offset just after the matching `\\end{...}`.
+    """
+
+    environment: str
+    start: int
+    end: int
+
+
+def scan_tables(buffer: mmap.mmap | bytes) -> list[TableLocation]:
+    """
+    Find all table environments in a LaTeX document in a single pass.
+
+    Environments in comments are skipped. Nested environments are indexed as
+    separate tables.
+
+    Parameters:
+    - buffer (mmap.mmap | bytes): Content of the document.
+
+    Returns:
+    - list[TableLocation]: The tables in the order they begin in the document.
+    """
+    tables = []
+    # (environment, start offset, position in `tables`) of all open environments
+    open_environments = []
+    for match in ENVIRONMENT_PATTERN.finditer(buffer):
+        line_start = buffer.rfind(b"\n", 0, match.start()) + 1
+        if COMMENT_PATTERN.search(buffer, line_start, match.start()):
+            continue
+
+        command, environment = match.group(1), match.group(2).decode()
+        if command == b"begin":
+            open_environments.append((environment, match.start(), len(tables)))
+            # placeholder until the matching \end is found
+            tables.append(None)
+            continue
+
+        # close the innermost open environment of the same name
+        for depth in range(len(open_environments) - 1, -1, -1):
+            if open_environments[depth][0] == environment:
+                _, start, position = open_environments[depth]
+                tables[position] = TableLocation(environment, start, match.end())
+                del open_environments[depth:]
+                break
+
+    return [table for table in tables if table is not None]
+
+
+class LatexDocument:
+    """
+    Index of all tables in a LaTeX document.
+
+    The document is memory-mapped and scanned once for table environments. Tables
+    are only parsed when they are accessed and are then kept. A document without
+    any table environment is treated as the body of a single table. If a parse
+    cache is given, tables parsed before, e.g. in an earlier session, are reused.
+    """
+
+    def __init__(self, path: str | os.PathLike, cache: ParseCache | None = None):
+        self.path = path
+        self.cache = cache
+        self.buffer = None
+        self.tables: list[TableLocation] = []
+        self.parsed: dict[int, tuple[pd.DataFrame, TableStructure]] = {}
+
+        with open(path, "rb") as file:
+            # empty files cannot be mapped
+            if os.fstat(file.fileno()).st_size > 0:
+                self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer is not None:
+            self.tables = scan_tables(self.buffer) or [
+                TableLocation("", 0, len(self.buffer))
+            ]
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def __getitem__(self, idx: int) -> tuple[pd.DataFrame, TableStructure]:
+        """Parse the table at position `idx`, or return it if already parsed."""
+        idx = range(len(self.tables))[idx]
+        location = self.tables[idx]
+        if idx in self.parsed:
+            return self.parsed[idx]
+
+        key = None
+        if self.cache is not None:
+            key = bytes_key(self.buffer[location.start : location.end])
+            result = self.cache.get(key)
+            if result is not None:
+                self.parsed[idx] = result
+                return result
+
+        lines = iter_mapped_lines(self.buffer, location.start, location.end)
+        self.parsed[idx] = read_latex_table(lines)
+        if key is not None:
+            self.cache.put(key, self.parsed[idx])
+        return self.parsed[idx]
+
+    def source(self, idx: int) -> str:
+        """Return the LaTeX source of the table at position `idx`."""
+        location = self.tables[idx]
+        return self.buffer[location.start : location.end].decode("utf-8")
+
+    def close(self) -> None:
+        """Release the memory map of the document."""
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+    def __enter__(self) -> "LatexDocument":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,38 +1,434 @@
-from copy import copy
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+import os
 from typing import Any
 import warnings
 
+import numpy as np
 import pandas as pd
 
-from .utils import Axis, Order
+from .rules import Heatmap, Precision, Rule, compile_rules
+from .storage import TextLines
+from .utils import Axis, Order, Scale
 
-DEFAULT_RULES = {
-    "order": Order.NEUTRAL,
-    "highlighting": ["\\bfseries{%s}", "\\underline{%s}"],
-    "default": "%s",
-    "precision": "%.2f",
-}
+# maximum number of formatted values kept per axis of a table
+FORMATTED_CACHE_CELLS = 2**20
+# number of values from which highlighting is split across an executor. This is
+# not tuned: on one core processes never pay off, run `benchmarks/bench_parallel.py`
+# on a machine with several cores to find the crossover point
+PARALLEL_MIN_CELLS = 500_000
+# number of chunks the lines are split into for an executor
+PARALLEL_CHUNKS = 4 * (os.cpu_count() or 1)
 
 
-def highlight_extrema(
-    data: str | float | int,
-    extrema: list[float | int],
-    highlights: str,
-    default: str,
-    precision: str = "%.3f",
-) -> str:
-    if isinstance(data, str):
-        return data
+def sort_index(numbers: np.ndarray, selected: np.ndarray) -> np.ndarray:
+    """
+    Sort the numeric selected values of a column or row.
+
+    Parameters:
+    - numbers (np.ndarray): The values as floats, NaN for non-numeric values.
+    - selected (np.ndarray): Boolean mask of the values that can be highlighted.
+
+    Returns:
+    - np.ndarray: Positions of the selected values that are not NaN, in ascending
+      order of their values.
+    """
+    positions = np.flatnonzero(selected & ~np.isnan(numbers))
+    return positions[np.argsort(numbers[positions], kind="stable")]
+
+
+def dense_ranks(sorted_keys: np.ndarray) -> np.ndarray:
+    """Dense ranks of sorted values, equal values share a rank."""
+    ranks = np.zeros(len(sorted_keys), dtype=np.intp)
+    np.cumsum(sorted_keys[1:] != sorted_keys[:-1], out=ranks[1:])
+    return ranks
+
+
+def displayed_numbers(numbers: np.ndarray, decimals: int) -> np.ndarray:
+    """
+    The numbers as they are displayed with `decimals` decimals.
+
+    `np.round` rounds some halves differently than formatting, e.g. 7.295 to 7.3
+    while it is displayed as 7.29, so the numbers close to a half are formatted
+    like the cells. Both keep the order of the numbers.
+    """
+    precision = f"%.{decimals}f"
+    if decimals > 15:
+        return np.array([precision % value for value in numbers.tolist()], dtype=float)
+    scaled = numbers * 10.0**decimals
+    displayed = np.rint(scaled) / 10.0**decimals
+    # further from a half than the rounding error of the scaling, both agree
+    with np.errstate(invalid="ignore"):
+        distance = np.abs(scaled - np.floor(scaled) - 0.5)
+    close = np.flatnonzero(
+        ~(distance > 1e-9 + 4 * np.spacing(np.abs(scaled))) | ~(np.abs(scaled) < 2**52)
+    )
+    displayed[close] = [precision % value for value in numbers[close].tolist()]
+    return displayed
+
+
+def extrema_ranks(
+    numbers: np.ndarray,
+    selected: np.ndarray,
+    order: Order,
+    num_highlights: int,
+    sorted_positions: np.ndarray | None = None,
+    decimals: int | None = None,
+) -> np.ndarray:
+    """
+    Find the highlight of each value of a column or row.
+
+    The selected values are ranked densely as they are displayed, see
+    `displayed_numbers`,
+    so values that look the same get the same highlight and every highlight goes to
+    a distinct value. Values ranked below `num_highlights` are not highlighted.
+
+    Parameters:
+    - numbers (np.ndarray): The values as floats, NaN for non-numeric values.
+    - selected (np.ndarray): Boolean mask of the values the extrema are taken from.
+    - order (Order): Whether the smallest or the largest values are highlighted.
+    - num_highlights (int): Number of highlights.
+    - sorted_positions (np.ndarray | None): The result of `sort_index`, if it is
+      already known.
+    - decimals (int | None): Number of decimals the values are displayed with,
+      None to rank the exact values.
+
+    Returns:
+    - np.ndarray: Index of the highlight of each value, -1 if it is no extremum.
+    """
+    ranks = np.full(len(numbers), -1, dtype=np.intp)
+    if sorted_positions is None:
+        sorted_positions = sort_index(numbers, selected)
+    match order:
+        case Order.MINIMUM:
+            pass
+        case Order.NEUTRAL:
+            return ranks
+        case Order.MAXIMUM:
+            sorted_positions = sorted_positions[::-1]
+
+    if num_highlights == 0 or len(sorted_positions) == 0:
+        return ranks
+    sorted_keys = numbers[sorted_positions]
+    if decimals is not None:
+        # rounding keeps the order, so the values do not have to be sorted again
+        sorted_keys = displayed_numbers(sorted_keys, decimals)
+    sorted_ranks = dense_ranks(sorted_keys)
+
+    num_ranked = np.searchsorted(sorted_ranks, num_highlights)
+    ranks[sorted_positions[:num_ranked]] = sorted_ranks[:num_ranked]
+    return ranks
+
+
+def heatmap_intensities(
+    numbers: np.ndarray,
+    selected: np.ndarray,
+    order: Order,
+    heatmap: Heatmap | None,
+    sorted_positions: np.ndarray | None = None,
+    decimals: int | None = None,
+) -> np.ndarray:
+    """
+    Find the colour intensity of each value of a column or row.
+
+    The position of each selected value between the worst and the best value is
+    computed on the whole line at once, on the scale of the heatmap. Like the
+    ranks, it is computed on the values as they are displayed. The
+    log scale falls back to the linear one for lines with values that are not
+    positive.
+
+    Parameters:
+    - numbers (np.ndarray): The values as floats, NaN for non-numeric values.
+    - selected (np.ndarray): Boolean mask of the values that are coloured.
+    - order (Order): Whether the smallest or the largest values are the best.
+    - heatmap (Heatmap | None): The colour scale, None for no colours.
+    - sorted_positions (np.ndarray | None): The result of `sort_index`, if it is
+      already known.
+    - decimals (int | None): Number of decimals the values are displayed with,
+      None to use the exact values.
 
-    data_ = precision % data
+    Returns:
+    - np.ndarray: Intensity of each value in percent, -1 if it is not coloured.
+    """
+    intensities = np.full(len(numbers), -1, dtype=np.intp)
+    if heatmap is None or order == Order.NEUTRAL:
+        return intensities
+    if sorted_positions is None:
+        sorted_positions = sort_index(numbers, selected)
+    if len(sorted_positions) == 0:
+        return intensities
+
+    sorted_keys = numbers[sorted_positions]
+    if decimals is not None:
+        sorted_keys = displayed_numbers(sorted_keys, decimals)
+    scale = heatmap.scale
+    if scale == Scale.LOG and sorted_keys[0] <= 0:
+        # the logarithm is only defined for lines of positive values
+        scale = Scale.LINEAR
+    match scale:
+        case Scale.LINEAR:
+            distances = sorted_keys - sorted_keys[0]
+        case Scale.LOG:
+            # ratios to the smallest value, so the colours do not depend on units
+            distances = np.log(sorted_keys) - np.log(sorted_keys[0])
+        case Scale.PERCENTILE:
+            # equal values share the percentile of the first of them
+            distances = np.searchsorted(sorted_keys, sorted_keys).astype(float)
+    span = distances[-1]
+    fractions = distances / span if span > 0 else np.ones(len(distances))
+    if order == Order.MINIMUM:
+        fractions = 1 - fractions
+    intensities[sorted_positions] = np.rint(fractions * heatmap.intensity)
+    return intensities
+
+
+def text_mask(values: np.ndarray) -> np.ndarray:
+    """Boolean mask of the values that are strings."""
+    flat = values.ravel()
+    is_text = np.fromiter(
+        (isinstance(value, str) for value in flat), dtype=bool, count=len(flat)
+    )
+    return is_text.reshape(values.shape)
+
+
+def format_values(
+    values: np.ndarray, numbers: np.ndarray, is_text: np.ndarray, precision: str
+) -> np.ndarray:
+    """Format the numbers of a column or row with `precision`, keep the strings.
+    The numbers are taken from `numbers`, so `values` is only read for strings."""
+    formatted = values.copy()
+    numeric = np.flatnonzero(~is_text)
+    formatted[numeric] = [precision % value for value in numbers[numeric].tolist()]
+    return formatted
+
+
+def wrap_values(
+    formatted: np.ndarray,
+    is_text: np.ndarray,
+    ranks: np.ndarray,
+    templates: tuple[str, ...],
+    intensities: np.ndarray | None = None,
+    color: str | None = None,
+) -> np.ndarray:
+    """
+    Wrap formatted numbers in the template of their highlight, and colour them.
+
+    Parameters:
+    - formatted (np.ndarray): The result of `format_values`.
+    - is_text (np.ndarray): Boolean mask of the values that are strings.
+    - ranks (np.ndarray): The result of `extrema_ranks`.
+    - templates (tuple[str, ...]): Templates of the extrema, best first, followed by the
+      template of all other numbers.
+    - intensities (np.ndarray | None): The result of `heatmap_intensities`, None
+      for no colours.
+    - color (str | None): The colour of the heatmap.
+
+    Returns:
+    - np.ndarray: The highlighted values as strings.
+    """
+    result = formatted.copy()
+    numeric = np.flatnonzero(~is_text)
+    template_index = ranks[numeric]
+    template_index[template_index < 0] = len(templates) - 1
+    for idx, template in enumerate(templates):
+        if template == "%s":
+            continue
+        group = numeric[template_index == idx]
+        result[group] = [template % value for value in formatted[group]]
+
+    if intensities is None:
+        return result
+    coloured = np.flatnonzero(intensities > 0)
+    if len(coloured):
+        prefixes = np.array(
+            [f"\\cellcolor{{{color}!{idx}}}" for idx in range(intensities.max() + 1)],
+            dtype=object,
+        )
+        result[coloured] = prefixes[intensities[coloured]] + result[coloured]
+    return result
+
+
+def highlight_values(
+    values: np.ndarray,
+    numbers: np.ndarray,
+    selected: np.ndarray,
+    rule: Rule,
+    sorted_positions: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Highlight the extrema of a column or row.
+
+    Numbers are formatted with the precision of the rule and wrapped in the
+    template of their highlight, or in the default template, and coloured if the
+    rule has a heatmap. Strings are kept as they are.
+
+    Parameters:
+    - values (np.ndarray): The values of the column or row.
+    - numbers (np.ndarray): The values as floats, NaN for non-numeric values.
+    - selected (np.ndarray): Boolean mask of the values that can be highlighted.
+    - rule (Rule): The highlighting rules of the column or row.
+    - sorted_positions (np.ndarray | None): The result of `sort_index`, if it is
+      already known.
+
+    Returns:
+    - np.ndarray: The highlighted values as strings.
+    """
+    ranks = extrema_ranks(
+        numbers,
+        selected,
+        rule.order,
+        len(rule.highlighting),
+        sorted_positions,
+        rule.precision.decimals,
+    )
+    intensities = heatmap_intensities(
+        numbers,
+        selected,
+        rule.order,
+        rule.heatmap,
+        sorted_positions,
+        rule.precision.decimals,
+    )
+    is_text = text_mask(values)
+    formatted = format_values(values, numbers, is_text, rule.precision.format)
+    color = rule.heatmap.color if rule.heatmap else None
+    return wrap_values(formatted, is_text, ranks, rule.templates, intensities, color)
+
+
+@dataclass
+class HighlightCache:
+    """
+    Intermediate results of highlighting the lines, i.e. columns or rows, of one
+    axis of a table, by position of the line.
+
+    Attributes:
+    - sort_indices (dict[int, np.ndarray]): The `sort_index` of all values of each
+      line, the selected values are taken from it.
+    - formatted (OrderedDict[tuple[int, str], np.ndarray]): Formatted values by
+      line and precision, least recently used first.
+    - wrapped (dict[int, tuple[tuple, np.ndarray, np.ndarray]]): Precision,
+      templates and heatmap, and the ranks and colour intensities each line was
+      last highlighted with.
+    - max_cells (int): Maximum total number of values in `formatted`.
+    """
+
+    sort_indices: dict[int, np.ndarray] = field(default_factory=dict)
+    formatted: OrderedDict[tuple[int, str], np.ndarray] = field(
+        default_factory=OrderedDict
+    )
+    wrapped: dict[int, tuple[tuple, np.ndarray, np.ndarray]] = field(
+        default_factory=dict
+    )
+    max_cells: int = FORMATTED_CACHE_CELLS
+    num_cells: int = 0
 
-    for extremum, highlight in zip(extrema, highlights):
-        # highlight_ = highlight.replace("precision", precision)
-        if data == extremum:
-            return highlight % data_
+    def format(
+        self,
+        idx: int,
+        values: np.ndarray,
+        numbers: np.ndarray,
+        is_text: np.ndarray,
+        precision: str,
+    ) -> np.ndarray:
+        """Format the values of a line, or return them if formatted before."""
+        key = (idx, precision)
+        if key in self.formatted:
+            self.formatted.move_to_end(key)
+            return self.formatted[key]
 
-    # default_ = default.replace("precision", precision)
-    return default % data_
+        formatted = format_values(values, numbers, is_text, precision)
+        if len(formatted) <= self.max_cells:
+            self.formatted[key] = formatted
+            self.num_cells += len(formatted)
+        while self.num_cells > self.max_cells:
+            _, evicted = self.formatted.popitem(last=False)
+            self.num_cells -= len(evicted)
+        return formatted
+
+    def merge(self, other: "HighlightCache", lines: np.ndarray) -> None:
+        """Add the results of a cache for a part of the lines, where its line `i`
+        is line `lines[i]` of this cache."""
+        for idx, sorted_positions in other.sort_indices.items():
+            self.sort_indices[lines[idx]] = sorted_positions
+        for idx, wrapped in other.wrapped.items():
+            self.wrapped[lines[idx]] = wrapped
+        for (idx, precision), formatted in other.formatted.items():
+            key = (lines[idx], precision)
+            if key in self.formatted:
+                self.num_cells -= len(self.formatted.pop(key))
+            self.formatted[key] = formatted
+            self.num_cells += len(formatted)
+        while self.num_cells > self.max_cells:
+            _, evicted = self.formatted.popitem(last=False)
+            self.num_cells -= len(evicted)
+
+
+def numeric_values(values: np.ndarray) -> np.ndarray:
+    """Convert an array of values to floats, NaN for non-numeric values."""
+    numbers = pd.to_numeric(values.ravel(), errors="coerce")
+    return np.asarray(numbers, dtype=float).reshape(values.shape)
+
+
+def selected_values(names: pd.Index, ignore: list[str] | None) -> np.ndarray:
+    """Boolean mask of the names that are not ignored, warning about unknown ones."""
+    if ignore is None:
+        ignore = []
+    for key in ignore:
+        if key not in names:
+            warnings.warn(f"Key {key} not found in the dataframe index")
+    return ~names.isin(ignore)
+
+
+def label_positions(names: pd.Index, labels: list) -> np.ndarray:
+    """Positions of labels in an index, the first one for duplicates, -1 if
+    missing."""
+    if names.is_unique:
+        return names.get_indexer(labels)
+    first = {}
+    for position, name in enumerate(names):
+        first.setdefault(name, position)
+    return np.array([first.get(label, -1) for label in labels], dtype=np.intp)
+
+
+def displayed_positions(shown: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Displayed positions of lines given by their source positions, -1 for the
+    lines that are not shown."""
+    size = max(shown.max(initial=-1), positions.max(initial=-1)) + 1
+    displayed = np.full(size, -1, dtype=np.intp)
+    displayed[shown] = np.arange(len(shown))
+    return displayed[positions]
+
+
+def apply_cell_overrides(
+    highlighted: np.ndarray,
+    rows: np.ndarray,
+    columns: np.ndarray,
+    cell_overrides: dict[tuple[int, int], str],
+) -> None:
+    """
+    Wrap single highlighted cells in their own templates, in place.
+
+    Parameters:
+    - highlighted (np.ndarray): The highlighted table in the displayed order.
+    - rows (np.ndarray): Source position of each displayed row.
+    - columns (np.ndarray): Source position of each displayed column.
+    - cell_overrides (dict[tuple[int, int], str]): Template of each overridden
+      cell by its row and column position in the source data. Cells that are not
+      shown are ignored.
+    """
+    if not cell_overrides:
+        return
+    cells = np.array(list(cell_overrides), dtype=np.intp).reshape(-1, 2)
+    cell_rows = displayed_positions(rows, cells[:, 0])
+    cell_cols = displayed_positions(columns, cells[:, 1])
+    found = np.flatnonzero((cell_rows >= 0) & (cell_cols >= 0))
+    cell_rows, cell_cols = cell_rows[found], cell_cols[found]
+    templates = list(cell_overrides.values())
+    highlighted[cell_rows, cell_cols] = [
+        templates[idx] % value
+        for idx, value in zip(found, highlighted[cell_rows, cell_cols])
+    ]
 
 
 def column_highlighting(
@@ -43,40 +439,143 @@ def column_highlighting(
     default: str,
     precision: str,
 ) -> pd.Series:
-    num_highlights = len(highlighting)
-    df_column_numeric = pd.to_numeric(df_column, errors="coerce")
-    match order:
-        case Order.MINIMUM:
-            extrema = df_column_numeric[indices].nsmallest(num_highlights)
-            extrema = extrema.tolist()
-        case Order.NEUTRAL:
-            extrema = []
-        case Order.MAXIMUM:
-            extrema = df_column_numeric[indices].nlargest(num_highlights)
-            extrema = extrema.tolist()
-
-    highlighted_column = df_column.copy().astype(object)
-    highlighted_column[indices] = (
-        df_column[indices]
-        .apply(
-            lambda data: highlight_extrema(
-                data, extrema, highlighting, default, precision
-            )
-        )
-        .astype(str)
+    values = df_column.to_numpy(dtype=object)
+    rule = Rule(Order(order), tuple(highlighting), default, Precision(precision))
+    highlighted = highlight_values(
+        values, numeric_values(values), df_column.index.isin(indices), rule
     )
+    return pd.Series(highlighted, index=df_column.index, name=df_column.name)
+
+
+def highlight_lines(
+    values: np.ndarray | TextLines,
+    numbers: np.ndarray,
+    is_text: np.ndarray,
+    highlighted: np.ndarray,
+    selected: np.ndarray,
+    rules: dict[int, Rule],
+    cache: HighlightCache | None = None,
+    executor: Executor | None = None,
+    min_parallel_cells: int = PARALLEL_MIN_CELLS,
+) -> None:
+    """
+    Highlight some lines, i.e. columns or rows, of a table.
+
+    The arrays hold one line per row, so columns are highlighted on transposed
+    views. With a cache of earlier calls, the values are sorted and formatted only
+    once per line and precision, and only values whose highlight changed are
+    wrapped again.
 
-    all_indices = df_column.index
-    ignore_indices = [idx for idx in all_indices if idx not in indices]
-    highlighted_column[ignore_indices] = (
-        df_column[ignore_indices]
-        .apply(
-            lambda data: highlight_extrema(data, extrema, [default], default, precision)
+    Parameters:
+    - values (np.ndarray | TextLines): The values of the table, only read where
+      `is_text` and one line or chunk of lines at a time, so the text cells of a
+      `TableData` do not have to be expanded to an array of all cells.
+    - numbers (np.ndarray): The values as floats, NaN for non-numeric values.
+    - is_text (np.ndarray): Boolean mask of the values that are kept as they are,
+      e.g. strings.
+    - highlighted (np.ndarray): Array the highlighted lines are written to.
+    - selected (np.ndarray): Boolean mask of the values of a line that can be
+      highlighted.
+    - rules (dict[int, Rule]): The rules of the lines to highlight, by position.
+    - cache (HighlightCache | None): Results of earlier calls for the same values,
+      selection and `highlighted` array. Missing entries are added.
+    - executor (Executor | None): If given, the lines are split into chunks that
+      are highlighted in parallel by the executor, e.g. a `ProcessPoolExecutor`.
+    - min_parallel_cells (int): Minimum number of values to highlight before the
+      executor is used, smaller tables are faster to highlight serially.
+    """
+    if cache is None:
+        cache = HighlightCache()
+    num_cells = len(rules) * values.shape[1]
+    if executor is not None and len(rules) > 1 and num_cells >= min_parallel_cells:
+        lines = np.fromiter(rules, dtype=np.intp, count=len(rules))
+        chunks = np.array_split(lines, min(len(lines), PARALLEL_CHUNKS))
+        futures = [
+            executor.submit(
+                highlight_chunk,
+                values[chunk],
+                numbers[chunk],
+                is_text[chunk],
+                selected,
+                [rules[idx] for idx in chunk],
+            )
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            highlighted[chunk], chunk_cache = future.result()
+            cache.merge(chunk_cache, chunk)
+        return
+
+    everything = np.ones(len(selected), dtype=bool)
+    for idx, rule in rules.items():
+        if idx not in cache.sort_indices:
+            # sorted once, a different selection only drops positions
+            cache.sort_indices[idx] = sort_index(numbers[idx], everything)
+        sorted_positions = cache.sort_indices[idx]
+        sorted_positions = sorted_positions[selected[sorted_positions]]
+        ranks = extrema_ranks(
+            numbers[idx],
+            selected,
+            rule.order,
+            len(rule.highlighting),
+            sorted_positions,
+            rule.precision.decimals,
         )
-        .astype(str)
-    )
+        intensities = heatmap_intensities(
+            numbers[idx],
+            selected,
+            rule.order,
+            rule.heatmap,
+            sorted_positions,
+            rule.precision.decimals,
+        )
+        formatted = cache.format(
+            idx, values[idx], numbers[idx], is_text[idx], rule.precision.format
+        )
+        color = rule.heatmap.color if rule.heatmap else None
 
-    return highlighted_column
+        key = (rule.precision, rule.templates, rule.heatmap)
+        previous = cache.wrapped.get(idx)
+        if previous is not None and previous[0] == key:
+            # the same formatting, only the highlight of some values changed
+            changed = np.flatnonzero(
+                (previous[1] != ranks) | (previous[2] != intensities)
+            )
+            highlighted[idx, changed] = wrap_values(
+                formatted[changed],
+                is_text[idx, changed],
+                ranks[changed],
+                rule.templates,
+                intensities[changed],
+                color,
+            )
+        else:
+            highlighted[idx] = wrap_values(
+                formatted, is_text[idx], ranks, rule.templates, intensities, color
+            )
+        cache.wrapped[idx] = (key, ranks, intensities)
+
+
+def highlight_chunk(
+    values: np.ndarray,
+    numbers: np.ndarray,
+    is_text: np.ndarray,
+    selected: np.ndarray,
+    rules: list[Rule],
+) -> tuple[np.ndarray, HighlightCache]:
+    """
+    Highlight all lines of a chunk of a table, in a worker of an executor.
+
+    Returns:
+    - tuple[np.ndarray, HighlightCache]: The highlighted lines and the cache of
+      intermediate results to merge into the cache of the whole table.
+    """
+    highlighted = np.empty(values.shape, dtype=object)
+    cache = HighlightCache()
+    highlight_lines(
+        values, numbers, is_text, highlighted, selected, dict(enumerate(rules)), cache
+    )
+    return highlighted, cache
 
 
 def table_highlighting(
@@ -85,44 +584,64 @@ def table_highlighting(
     default_rules: dict[str, Any],
     column_override_rules: dict[str, dict[str, Any]] = {},
     ignore: list[str] | None = None,
+    executor: Executor | None = None,
+    min_parallel_cells: int = PARALLEL_MIN_CELLS,
 ) -> pd.DataFrame:
-    if axis == Axis.ROW:
-        # transpose the dataframe to make the row operations column operations
-        dataframe = dataframe.T
-
-    missing_keys = []
-    for key in DEFAULT_RULES.keys():
-        if key not in default_rules:
-            missing_keys.append(key)
-            default_rules[key] = DEFAULT_RULES[key]
-    if missing_keys:
-        warnings.warn(
-            f"The following keys were missing in the default highlighting: {missing_keys}"
-        )
+    """
+    Highlight the extrema of every column or row of a DataFrame.
 
-    if ignore is None:
-        ignore = []
-    for key in ignore:
-        if key not in dataframe.index:
-            warnings.warn(f"Key {key} not found in the dataframe index")
-    remaining_indices = [idx for idx in dataframe.index if idx not in ignore]
+    The values are highlighted on a 2-D array, where a row is a slice of the array
+    and a column a slice of its transposed view, so both axes cost the same.
 
-    for name in dataframe.columns:
-        if name in column_override_rules:
-            rules = column_override_rules[name]
-        else:
-            rules = copy(default_rules)
-        order = rules.get("order", default_rules["order"])
-        highlighting = rules.get("highlighting", default_rules["highlighting"])
-        default = rules.get("default", default_rules["default"])
-        precision = rules.get("precision", default_rules["precision"])
-
-        dataframe[name] = column_highlighting(
-            dataframe[name], remaining_indices, order, highlighting, default, precision
-        )
+    Parameters:
+    - dataframe (pd.DataFrame): The table, it is not modified.
+    - axis (Axis): Whether the extrema of each column or of each row are
+      highlighted.
+    - default_rules (dict[str, Any]): Rules of all columns or rows.
+    - column_override_rules (dict[str, dict[str, Any]]): Rules of single columns
+      or rows, by name.
+    - ignore (list[str] | None): Names of the rows, or columns in row mode, that
+      are never highlighted.
+    - executor (Executor | None): Executor to highlight chunks of large tables in
+      parallel, see `highlight_lines`.
+    - min_parallel_cells (int): Minimum number of values to use the executor.
+
+    Returns:
+    - pd.DataFrame: The highlighted values as strings.
+    """
+    default = compile_rules(default_rules)
 
+    values = dataframe.to_numpy(dtype=object)
+    numbers = numeric_values(values)
+    is_text = text_mask(values)
+    highlighted = np.empty(values.shape, dtype=object)
     if axis == Axis.ROW:
-        # transpose the dataframe back to the original orientation
-        dataframe = dataframe.T
+        names, other_names = dataframe.index, dataframe.columns
+    else:
+        # the columns are the rows of the transposed views
+        names, other_names = dataframe.columns, dataframe.index
+        values, numbers, is_text = values.T, numbers.T, is_text.T
+        highlighted = highlighted.T
+
+    rules = {
+        idx: (
+            compile_rules(column_override_rules[name], default)
+            if name in column_override_rules
+            else default
+        )
+        for idx, name in enumerate(names)
+    }
+    highlight_lines(
+        values,
+        numbers,
+        is_text,
+        highlighted,
+        selected_values(other_names, ignore),
+        rules,
+        executor=executor,
+        min_parallel_cells=min_parallel_cells,
+    )
 
-    return dataframe
+    if axis == Axis.COLUMN:
+        highlighted = highlighted.T
+    return pd.DataFrame(highlighted, index=dataframe.index, columns=dataframe.columns)
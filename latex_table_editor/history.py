@@ -0,0 +1,158 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .utils import Axis
+
+# maximum number of changes that can be undone
+HISTORY_LENGTH = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class RulesChange:
+    """
+    Highlighting rules of a column or row before and after a change.
+
+    Attributes:
+    - axis (Axis | None): Axis of the line, None for the default rules.
+    - name (Any): Name of the line, None for the default rules.
+    - before (dict[str, Any]): The rules before the change.
+    - after (dict[str, Any]): The rules after the change.
+    """
+
+    axis: Axis | None
+    name: Any
+    before: dict[str, Any]
+    after: dict[str, Any]
+
+    def reversed(self) -> "RulesChange":
+        return RulesChange(self.axis, self.name, self.after, self.before)
+
+
+@dataclass(frozen=True, slots=True)
+class SkipChange:
+    """A column or row that was skipped or included again."""
+
+    axis: Axis
+    name: Any
+
+    def reversed(self) -> "SkipChange":
+        return self
+
+
+@dataclass(frozen=True, slots=True)
+class HiddenChange:
+    """Names of the hidden columns or rows before and after a change."""
+
+    axis: Axis
+    before: tuple
+    after: tuple
+
+    def reversed(self) -> "HiddenChange":
+        return HiddenChange(self.axis, self.after, self.before)
+
+
+@dataclass(frozen=True, slots=True)
+class FilterChange:
+    """Filter of the rows before and after a change, None for no filter."""
+
+    before: Any
+    after: Any
+
+    def reversed(self) -> "FilterChange":
+        return FilterChange(self.after, self.before)
+
+
+@dataclass(frozen=True, slots=True)
+class CellChange:
+    """Template of a single cell before and after a change, None for none. The
+    cell is given by its row and column position in the source data."""
+
+    row: int
+    column: int
+    before: str | None
+    after: str | None
+
+    def reversed(self) -> "CellChange":
+        return CellChange(self.row, self.column, self.after, self.before)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class PositionsChange:
+    """
+    Displayed order of columns or rows before and after a change, only where it
+    changed.
+
+    Attributes:
+    - axis (Axis): Axis of the reordered lines.
+    - slots (np.ndarray): Displayed positions whose line changed.
+    - before (np.ndarray): Source position of the line at each slot before.
+    - after (np.ndarray): Source position of the line at each slot after.
+    """
+
+    axis: Axis
+    slots: np.ndarray
+    before: np.ndarray
+    after: np.ndarray
+
+    @classmethod
+    def between(
+        cls, axis: Axis, before: np.ndarray, after: np.ndarray
+    ) -> "PositionsChange":
+        """The change from one order of all lines to another."""
+        slots = np.flatnonzero(before != after)
+        return cls(axis, slots, before[slots], after[slots])
+
+    def reversed(self) -> "PositionsChange":
+        return PositionsChange(self.axis, self.slots, self.after, self.before)
+
+
+Change = (
+    RulesChange
+    | SkipChange
+    | HiddenChange
+    | FilterChange
+    | CellChange
+    | PositionsChange
+)
+
+
+class History:
+    """
+    Undo and redo stacks of the changes made to a table.
+
+    Changes are stored as deltas of what they changed, so a step takes memory in
+    proportion to the change and not to the table. The oldest changes are dropped
+    after `max_length` steps.
+    """
+
+    def __init__(self, max_length: int = HISTORY_LENGTH):
+        self.undo_stack: deque[Change] = deque(maxlen=max_length)
+        self.redo_stack: list[Change] = []
+
+    def record(self, change: Change) -> None:
+        """Add a change that was made, changes that were undone are dropped."""
+        self.undo_stack.append(change)
+        self.redo_stack.clear()
+
+    def undo(self) -> Change | None:
+        """The last change to revert, None if there is none."""
+        if not self.undo_stack:
+            return None
+        change = self.undo_stack.pop()
+        self.redo_stack.append(change)
+        return change
+
+    def redo(self) -> Change | None:
+        """The last undone change to make again, None if there is none."""
+        if not self.redo_stack:
+            return None
+        change = self.redo_stack.pop()
+        self.undo_stack.append(change)
+        return change
+
+    def clear(self) -> None:
+        self.undo_stack.clear()
+        self.redo_stack.clear()
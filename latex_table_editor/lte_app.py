@@ -1,16 +1,29 @@
+from concurrent.futures import Executor
+from functools import lru_cache
 from pathlib import Path
+import re
 from typing import Any
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Container, Grid
 from textual.widgets import TextArea, DataTable, Footer, Static, Input
 from textual.binding import Binding
 from textual.events import Click
 from textual.screen import Screen, ModalScreen
+from textual.worker import Worker, WorkerState, get_current_worker
+from rich.color import Color, ColorParseError, blend_rgb
+from rich.color_triplet import ColorTriplet
+from rich.style import Style
+from rich.text import Text
 import pandas as pd
 import json
 
-from .conversion import latex_table_to_dataframe
+from .cache import ParseCache, source_key
+from .conversion import IncrementalParser, ParseCancelled, TableStructure
+from .document import LatexDocument
+from .rules import compile_heatmap
 from .table import Table
+from .views import RowFilter
 from .utils import AVAILABLE_RULES, RULES, Axis, Order, filter_rule_keys, is_instance_of
 
 WELCOME_TEXT = """Welcome to P2L!\n
@@ -19,6 +32,30 @@ It also provides a way to highlight the table data based on certain rules.\n
 Press 'N' to start a new input.\n
 """
 
+HEATMAP_PATTERN = re.compile(r"\\cellcolor\{([^!{}]+)!(\d+)\}")
+
+
+@lru_cache
+def heatmap_style(color: str, intensity: int) -> Style | None:
+    """Background previewing `intensity` percent of a colour on a dark terminal,
+    None if the colour is unknown to the terminal."""
+    try:
+        triplet = Color.parse(color).get_truecolor()
+    except ColorParseError:
+        return None
+    background = blend_rgb(ColorTriplet(0, 0, 0), triplet, intensity / 100)
+    return Style(bgcolor=Color.from_triplet(background))
+
+
+def preview_cell(value: Any) -> str | Text:
+    """Show the colour of a heatmap cell as its background."""
+    value = str(value)
+    matching = HEATMAP_PATTERN.search(value)
+    if matching is None:
+        return value
+    style = heatmap_style(matching.group(1), int(matching.group(2)))
+    return value if style is None else Text(value, style=style)
+
 
 class WelcomeScreen(ModalScreen):
     """Welcome screen of the application."""
@@ -39,6 +76,84 @@ class WelcomeScreen(ModalScreen):
         await self.app.action_show_input()
 
 
+class OpenFileScreen(ModalScreen):
+    """Screen for opening a LaTeX file."""
+
+    BINDINGS = [
+        Binding("escape", "dismiss", "Cancel"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        self.app: LTEApp
+        self.info_text = Static("Enter the path of the LaTeX file to open.", id="info")
+        self.input = Input(placeholder="Enter the file name", id="input")
+        self.status_bar = Static("Status: Ready", id="status")
+        self.footer = Footer(id="footer")
+
+        yield Grid(self.info_text, self.input, id="grid_input")
+        yield self.status_bar
+        yield self.footer
+
+    async def on_mount(self) -> None:
+        """Focus on the input when the screen is mounted."""
+        self.input.focus()
+
+    async def action_dismiss(self) -> None:
+        """Dismiss the screen without opening a file."""
+        self.dismiss(None)
+
+    async def on_input_submitted(self, message: Input.Submitted) -> None:
+        """Check the entered path and return it."""
+        file_name = Path(message.value).expanduser()
+        if not file_name.is_file():
+            self.status_bar.update(f"File '{file_name}' does not exist.")
+            return
+        self.dismiss(file_name)
+
+
+class CellRuleScreen(ModalScreen):
+    """Screen for the highlighting template of a single cell."""
+
+    BINDINGS = [
+        Binding("escape", "dismiss", "Cancel"),
+    ]
+
+    def __init__(self, template: str, info_text: str):
+        super().__init__()
+        self.template = template
+        self.info_text = info_text
+
+    def compose(self) -> ComposeResult:
+        self.app: LTEApp
+        self.info_text = Static(self.info_text, id="info")
+        self.input = Input(self.template, placeholder="e.g. \\bfseries{%s}", id="input")
+        self.status_bar = Static("Status: Ready", id="status")
+        self.footer = Footer(id="footer")
+
+        yield Grid(self.info_text, self.input, id="grid_input")
+        yield self.status_bar
+        yield self.footer
+
+    async def on_mount(self) -> None:
+        """Focus on the input when the screen is mounted."""
+        self.input.focus()
+
+    async def action_dismiss(self) -> None:
+        """Dismiss the screen without changing the template."""
+        self.dismiss(None)
+
+    async def on_input_submitted(self, message: Input.Submitted) -> None:
+        """Check the entered template and return it, an empty one removes it."""
+        template = message.value.strip()
+        if template:
+            try:
+                template % "value"
+            except (TypeError, ValueError):
+                self.status_bar.update("The template must contain exactly one '%s'.")
+                return
+        self.dismiss(template)
+
+
 class LATeXOutputScreen(ModalScreen):
     """Screen for LaTeX output."""
 
@@ -115,11 +230,7 @@ class DataTableScreen(Screen):
 
             if self.app.table.mode == Axis.COLUMN:
                 # get the ordering of the columns
-                order = (
-                    self.app.table.overrides[Axis.COLUMN]
-                    .get(col, {})
-                    .get("order", self.app.table.default_rules["order"])
-                )
+                order = self.app.table.rule(Axis.COLUMN, col).order
                 match order:
                     case Order.MINIMUM:
                         name = f"{name} (v)"
@@ -132,16 +243,12 @@ class DataTableScreen(Screen):
             column_keys.append(key)
 
         row_keys = []
-        for row in self.app.table.display_dataframe.index:
-            row_data = self.app.table.display_dataframe.loc[row]
+        display_dataframe = self.app.table.display_dataframe
+        for row, row_data in zip(display_dataframe.index, display_dataframe.to_numpy()):
             key = self.app.table.multi_index_to_str(row)
             name = self.app.table.multi_index_to_str(row)
             if self.app.table.mode == Axis.ROW:
-                order = (
-                    self.app.table.overrides[Axis.ROW]
-                    .get(name, {})
-                    .get("order", self.app.table.default_rules["order"])
-                )
+                order = self.app.table.rule(Axis.ROW, row).order
                 match order:
                     case Order.MINIMUM:
                         name = f"{name} (v)"
@@ -151,7 +258,7 @@ class DataTableScreen(Screen):
                         name = f"{name} (^)"
 
             self.data_table.add_row(
-                *[str(value) for value in row_data], key=key, label=name
+                *[preview_cell(value) for value in row_data], key=key, label=name
             )
             row_keys.append(key)
 
@@ -195,15 +302,18 @@ class InputScreen(ModalScreen):
 
     BINDINGS = [
         Binding("ctrl+s", "submit", "Submit"),
+        Binding("escape", "cancel", "Cancel Parsing"),
     ]
 
-    def __init__(self):
+    def __init__(self, text: str = ""):
         super().__init__()
         self.app: LTEApp
+        self.text = text
+        self.parse_worker: Worker | None = None
 
     def compose(self) -> ComposeResult:
         self.info_text = Static("Enter the table data in LaTeX format.", id="info")
-        self.input_area = TextArea(id="input")
+        self.input_area = TextArea(self.text, id="input")
         self.status_bar = Static("Status: Ready", id="status")
         self.footer = Footer(id="footer")
 
@@ -219,10 +329,51 @@ class InputScreen(ModalScreen):
         """Handle submission of input data."""
         await self.handle_submit()
 
+    async def action_cancel(self) -> None:
+        """Cancel parsing the submitted input."""
+        if self.parse_worker is None or self.parse_worker.is_finished:
+            return
+        self.parse_worker.cancel()
+        self.status_bar.update("Parsing cancelled.")
+
     async def handle_submit(self) -> None:
         """Handle submission of input data."""
-        # app = self.app
-        self.dismiss(latex_table_to_dataframe(self.input_area.text))
+        if self.parse_worker is not None and not self.parse_worker.is_finished:
+            self.status_bar.update("Still parsing, press Escape to cancel.")
+            return
+        self.status_bar.update("Parsing...")
+        self.parse_worker = self.parse_input(self.input_area.text)
+
+    @work(thread=True, exclusive=True, group="parse", exit_on_error=False)
+    def parse_input(self, text: str) -> None:
+        """Parse the input in a thread and dismiss the screen with the result."""
+        worker = get_current_worker()
+
+        def report(done: int, total: int) -> None:
+            if worker.is_cancelled:
+                raise ParseCancelled
+            self.app.call_from_thread(
+                self.status_bar.update, f"Parsing... {done / total:.0%}"
+            )
+
+        key = source_key(text)
+        result = self.app.parse_cache.get(key)
+        if result is None:
+            try:
+                # only the lines edited since the last submission are parsed again
+                result = self.app.input_parser.update(text, report)
+            except ParseCancelled:
+                return
+            self.app.parse_cache.put(key, result)
+        if not worker.is_cancelled:
+            # also on cache hits, which leave the source of the parser unchanged
+            self.app.input_text = text
+            self.app.call_from_thread(self.dismiss, result)
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Report errors raised while parsing the input."""
+        if event.worker is self.parse_worker and event.state == WorkerState.ERROR:
+            self.status_bar.update(f"Invalid table input: {event.worker.error}")
 
 
 class RulesInputScreen(ModalScreen):
@@ -297,9 +448,88 @@ class RulesInputScreen(ModalScreen):
         for key in pop_keys:
             rules.pop(key)
 
+        if "heatmap" in rules:
+            try:
+                compile_heatmap(rules["heatmap"])
+            except (TypeError, ValueError) as error:
+                self.status_bar.update(
+                    f"Invalid heatmap: {error}. It has been removed."
+                )
+                rules.pop("heatmap")
+
         return rules
 
 
+class FilterInputScreen(ModalScreen):
+    """Screen for the filter of the rows."""
+
+    BINDINGS = [
+        Binding("ctrl+s", "submit", "Submit"),
+        Binding("escape", "cancel", "Cancel"),
+    ]
+
+    def __init__(self, row_filter: RowFilter | None):
+        super().__init__()
+        self.row_filter = row_filter
+
+    def compose(self) -> ComposeResult:
+        self.app: LTEApp
+        self.info_text = Static(
+            "Enter the filter of the rows in JSON format, e.g. "
+            '{"pattern": "^BERT", "column": "F1", "comparison": ">=", "value": 80}. '
+            "Columns of several header rows are named by their levels joined by "
+            'spaces, e.g. "Metrics F1". Leave it empty to show all rows.',
+            id="info",
+        )
+        self.filter_input_area = TextArea(id="highlight_input")
+        if self.row_filter is not None:
+            self.filter_input_area.text = json.dumps(
+                {
+                    "pattern": self.row_filter.pattern,
+                    "column": self.row_filter.column,
+                    "comparison": self.row_filter.comparison,
+                    "value": self.row_filter.value,
+                },
+                indent=4,
+            )
+        self.status_bar = Static("Status: Ready", id="status")
+        self.footer = Footer(id="footer")
+
+        yield Grid(self.info_text, self.filter_input_area, id="grid_input")
+        yield self.status_bar
+        yield self.footer
+
+    async def on_mount(self) -> None:
+        """Focus on the filter input area when the screen is mounted."""
+        self.filter_input_area.focus()
+
+    async def action_submit(self) -> None:
+        """Handle submission of the filter, an empty one shows all rows."""
+        text = self.filter_input_area.text.strip()
+        try:
+            fields = json.loads(text) if text else None
+            if not fields:
+                self.dismiss(None)
+                return
+            if not isinstance(fields, dict):
+                raise TypeError("expected a JSON object")
+            # multi-index column names are given as lists
+            if isinstance(fields.get("column"), list):
+                fields["column"] = tuple(fields["column"])
+            row_filter = RowFilter(**fields)
+            if row_filter.column is not None:
+                row_filter.column_position(self.app.table.data.columns)
+            self.dismiss(row_filter)
+        except json.JSONDecodeError:
+            self.status_bar.update("Invalid JSON input. Please try again.")
+        except (re.error, ValueError, TypeError) as error:
+            self.status_bar.update(f"Invalid filter: {error}")
+
+    async def action_cancel(self) -> None:
+        """Dismiss the screen without changing the filter."""
+        self.app.pop_screen()
+
+
 class LTEApp(App):
     """Main application class."""
 
@@ -307,22 +537,48 @@ class LTEApp(App):
 
     BINDINGS = [
         Binding("N", "show_input", "new input"),
+        Binding("O", "open_file", "open file"),
+        Binding("]", "next_table", "next table", show=False),
+        Binding("[", "previous_table", "previous table", show=False),
         Binding("L", "show_latex_output", "show LaTeX"),
         Binding("T", "toggle_mode", "toggle row/column mode"),
         Binding("d", "show_edit_default_rules", "edit default rules"),
         Binding("e", "show_edit_rules", "edit rules"),
+        Binding("c", "show_edit_cell_rule", "edit cell"),
         Binding("o", "toggle_sorting_order", "toggle sorting order"),
         Binding("+", "increase_precision", "increase precision"),
         Binding("-", "decrease_precision", "decrease precision"),
         Binding("x", "toggle_cell", "skip/include row/column"),
+        Binding("h", "toggle_hidden", "hide row/column"),
+        Binding("H", "show_all", "show hidden rows/columns", show=False),
+        Binding("f", "show_edit_filter", "filter rows"),
+        Binding("a", "sort_ascending", "sort ascending"),
+        Binding("A", "sort_descending", "sort descending", show=False),
+        Binding("<", "move_backward", "move row/column back", show=False),
+        Binding(">", "move_forward", "move row/column forward", show=False),
+        Binding("u", "undo", "undo"),
+        Binding("r", "redo", "redo"),
         Binding("S", "start_selection_mode", "start swap mode"),
         Binding("s", "data_selection", "select row/column", show=False),
         Binding("click", "handle_click", "toggle order", show=False),
     ]
 
-    def __init__(self):
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        table_number: int = 1,
+        cache_dir: str | Path | None = None,
+        executor: Executor | None = None,
+    ):
         super().__init__()
-        self.table = Table()
+        self.path = path
+        self.table_number = table_number
+        self.document: LatexDocument | None = None
+        self.parse_cache = ParseCache(cache_dir=cache_dir)
+        self.input_parser = IncrementalParser()
+        # last table input that was parsed, shown again when the input reopens
+        self.input_text = ""
+        self.table = Table(executor)
         self.selection_mode = False
         self.selected_columns = []
         self.current_highlighting_target = None  # Tracks which column to highlight
@@ -332,7 +588,13 @@ class LTEApp(App):
         # Register Screens
         self.data_table_screen = DataTableScreen()
         self.push_screen(self.data_table_screen)
-        self.push_screen(WelcomeScreen())
+        if self.path is None:
+            self.push_screen(WelcomeScreen())
+
+    async def on_mount(self) -> None:
+        """Open the file given on the command line."""
+        if self.path is not None:
+            self.load_file(self.path, self.table_number)
 
     async def reset_screen(self) -> None:
         """Reset the screen to the DataTable."""
@@ -341,16 +603,83 @@ class LTEApp(App):
     async def action_show_input(self) -> None:
         """Show the input screen for table input."""
 
-        def update_table(table: pd.DataFrame | None) -> None:
-            if table is not None:
-                self.table.dataframe = table
-                self.table.reset_formatting_rules()
-                self.data_table_screen.draw_table()
+        def update_table(
+            result: tuple[pd.DataFrame, TableStructure] | None,
+        ) -> None:
+            if result is not None:
+                self.set_table(*result)
                 self.data_table_screen.status_bar.update("Table input successful.")
             else:
                 self.data_table_screen.status_bar.update("Invalid table input.")
 
-        self.push_screen(InputScreen(), update_table)
+        self.push_screen(InputScreen(self.input_text), update_table)
+        self.data_table_screen.draw_table()
+
+    async def action_open_file(self) -> None:
+        """Show the screen for opening a LaTeX file."""
+
+        def open_file(path: Path | None) -> None:
+            if path is not None:
+                self.load_file(path)
+
+        self.push_screen(OpenFileScreen(), open_file)
+
+    def load_file(self, path: str | Path, table_number: int = 1) -> None:
+        """Index the tables in a LaTeX file and display one of them."""
+        try:
+            document = LatexDocument(path, self.parse_cache)
+        except OSError as error:
+            self.data_table_screen.status_bar.update(
+                f"Could not open '{path}': {error}"
+            )
+            return
+        if len(document) == 0:
+            document.close()
+            self.data_table_screen.status_bar.update(f"'{path}' is empty.")
+            return
+
+        if self.document is not None:
+            self.document.close()
+        self.document = document
+        self.show_document_table(table_number)
+
+    def show_document_table(self, table_number: int) -> None:
+        """Display a table of the open document, parsing it on first access."""
+        if self.document is None:
+            self.data_table_screen.status_bar.update("No document open.")
+            return
+        if not 1 <= table_number <= len(self.document):
+            self.data_table_screen.status_bar.update(
+                f"Table {table_number} does not exist, "
+                f"'{self.document.path}' has {len(self.document)} table(s)."
+            )
+            return
+        try:
+            dataframe, structure = self.document[table_number - 1]
+        except UnicodeDecodeError as error:
+            self.data_table_screen.status_bar.update(
+                f"Could not read table {table_number}: {error}"
+            )
+            return
+        self.table_number = table_number
+        self.set_table(dataframe, structure)
+        self.data_table_screen.status_bar.update(
+            f"Opened table {table_number} of {len(self.document)} "
+            f"in '{self.document.path}'."
+        )
+
+    async def action_next_table(self) -> None:
+        """Show the next table of the open document."""
+        self.show_document_table(self.table_number + 1)
+
+    async def action_previous_table(self) -> None:
+        """Show the previous table of the open document."""
+        self.show_document_table(self.table_number - 1)
+
+    def set_table(self, dataframe: pd.DataFrame, structure: TableStructure) -> None:
+        """Replace the table data and redraw it with fresh formatting rules."""
+        self.table.dataframe, self.table.structure = dataframe, structure
+        self.table.reset_formatting_rules()
         self.data_table_screen.draw_table()
 
     async def action_show_latex_output(self) -> None:
@@ -365,7 +694,7 @@ class LTEApp(App):
 
         def update_highlighting(highlighting: dict[str, Any] | None) -> None:
             if highlighting is not None:
-                self.table.default_rules = highlighting
+                self.table.set_default_rules(highlighting)
                 self.data_table_screen.draw_table()
                 self.data_table_screen.status_bar.update(
                     "Default Highlighting rules updated."
@@ -391,7 +720,7 @@ class LTEApp(App):
         """Show the input screen for column-specific highlighting rules."""
         # Get the name of the current cursor column from DataTableScreen
         try:
-            column_name = self.table.dataframe.columns[
+            column_name = self.table.names(Axis.COLUMN)[
                 self.data_table_screen.data_table.cursor_column
             ]
         except (IndexError, AttributeError):
@@ -404,7 +733,7 @@ class LTEApp(App):
 
         def update_highlighting(highlighting: dict[str, Any] | None) -> None:
             if highlighting is not None:
-                self.table.overrides[Axis.COLUMN][column_name] = highlighting
+                self.table.set_rules(Axis.COLUMN, column_name, highlighting)
                 self.data_table_screen.draw_table()
                 self.data_table_screen.status_bar.update(
                     f"Highlighting rules updated for '{column_name}'."
@@ -425,7 +754,7 @@ class LTEApp(App):
         """Show the input screen for row-specific highlighting rules."""
         # Get the name of the current cursor row from DataTableScreen
         try:
-            row_name = self.table.dataframe.index[
+            row_name = self.table.names(Axis.ROW)[
                 self.data_table_screen.data_table.cursor_row
             ]
         except (IndexError, AttributeError):
@@ -436,7 +765,7 @@ class LTEApp(App):
 
         def update_highlighting(highlighting: dict[str, Any] | None) -> None:
             if highlighting is not None:
-                self.table.overrides[Axis.ROW][row_name] = highlighting
+                self.table.set_rules(Axis.ROW, row_name, highlighting)
                 self.data_table_screen.draw_table()
                 self.data_table_screen.status_bar.update(
                     f"Highlighting rules updated for '{row_name}'."
@@ -453,6 +782,89 @@ class LTEApp(App):
         )
         self.data_table_screen.draw_table()
 
+    async def action_show_edit_cell_rule(self) -> None:
+        """Show the input screen for the highlighting template of the cursor cell."""
+        try:
+            row, column = self.data_table_screen.data_table.cursor_coordinate
+            row_name = self.table.names(Axis.ROW)[row]
+            column_name = self.table.names(Axis.COLUMN)[column]
+            cell = self.table.source_cell(row, column)
+        except (IndexError, AttributeError):
+            self.data_table_screen.status_bar.update("No cell selected.")
+            return
+
+        info_text = (
+            f"Enter the template for cell ('{row_name}', '{column_name}'), e.g. "
+            "'\\cellcolor{gray}%s'. Leave it empty to remove it."
+        )
+
+        def update_template(template: str | None) -> None:
+            if template is None:
+                return
+            self.table.set_cell_template(cell, template or None)
+            self.data_table_screen.draw_table()
+            self.data_table_screen.status_bar.update(
+                f"Template updated for cell ('{row_name}', '{column_name}')."
+            )
+
+        template = self.table.cell_overrides.get(cell, "")
+        self.push_screen(CellRuleScreen(template, info_text), update_template)
+
+    async def action_toggle_hidden(self) -> None:
+        """Hide the column or row at the cursor, depending on the mode."""
+        line = self.cursor_line()
+        if line is None:
+            return
+        name = line[0]
+        self.table.toggle_hidden(self.table.mode, name)
+        self.data_table_screen.status_bar.update(
+            f"Hid {self.table.mode.value} '{name}', press 'H' to show it again."
+        )
+        self.data_table_screen.draw_table()
+
+    async def action_show_all(self) -> None:
+        """Show the hidden columns or rows again, depending on the mode."""
+        if not self.table.show_all(self.table.mode):
+            self.data_table_screen.status_bar.update(
+                f"No hidden {self.table.mode.value}s to show."
+            )
+            return
+        self.data_table_screen.status_bar.update(
+            f"Showing all hidden {self.table.mode.value}s again."
+        )
+        self.data_table_screen.draw_table()
+
+    async def action_show_edit_filter(self) -> None:
+        """Show the input screen for the filter of the rows."""
+
+        def update_filter(row_filter: RowFilter | None) -> None:
+            self.table.set_row_filter(row_filter)
+            self.data_table_screen.draw_table()
+            if row_filter is None:
+                self.data_table_screen.status_bar.update("Showing all rows.")
+            else:
+                self.data_table_screen.status_bar.update(
+                    f"Showing {len(self.table.names(Axis.ROW))} rows matching the filter."
+                )
+
+        self.push_screen(FilterInputScreen(self.table.row_filter), update_filter)
+
+    async def action_undo(self) -> None:
+        """Revert the last change of the table."""
+        if not self.table.undo():
+            self.data_table_screen.status_bar.update("Nothing to undo.")
+            return
+        self.data_table_screen.status_bar.update("Undid the last change.")
+        self.data_table_screen.draw_table()
+
+    async def action_redo(self) -> None:
+        """Make the last undone change of the table again."""
+        if not self.table.redo():
+            self.data_table_screen.status_bar.update("Nothing to redo.")
+            return
+        self.data_table_screen.status_bar.update("Redid the last undone change.")
+        self.data_table_screen.draw_table()
+
     async def action_toggle_mode(self) -> None:
         """Toggle the row/column mode."""
         self.table.toggle_mode()
@@ -471,7 +883,7 @@ class LTEApp(App):
 
     def toggle_column(self) -> None:
         try:
-            column_name = self.table.dataframe.columns[
+            column_name = self.table.names(Axis.COLUMN)[
                 self.data_table_screen.data_table.cursor_column
             ]
         except (IndexError, AttributeError):
@@ -482,7 +894,7 @@ class LTEApp(App):
 
     def toggle_row(self) -> None:
         try:
-            row_name = self.table.dataframe.index[
+            row_name = self.table.names(Axis.ROW)[
                 self.data_table_screen.data_table.cursor_row
             ]
         except (IndexError, AttributeError):
@@ -497,7 +909,7 @@ class LTEApp(App):
         match self.table.mode:
             case Axis.COLUMN:
                 try:
-                    column_name = self.table.dataframe.columns[
+                    column_name = self.table.names(Axis.COLUMN)[
                         self.data_table_screen.data_table.cursor_column
                     ]
                 except (IndexError, AttributeError):
@@ -507,7 +919,7 @@ class LTEApp(App):
                 self.table.increase_precision(Axis.COLUMN, column_name)
             case Axis.ROW:
                 try:
-                    row_name = self.table.dataframe.index[
+                    row_name = self.table.names(Axis.ROW)[
                         self.data_table_screen.data_table.cursor_row
                     ]
                 except (IndexError, AttributeError):
@@ -523,7 +935,7 @@ class LTEApp(App):
         match self.table.mode:
             case Axis.COLUMN:
                 try:
-                    column_name = self.table.dataframe.columns[
+                    column_name = self.table.names(Axis.COLUMN)[
                         self.data_table_screen.data_table.cursor_column
                     ]
                 except (IndexError, AttributeError):
@@ -532,7 +944,7 @@ class LTEApp(App):
                 self.table.decrease_precision(Axis.COLUMN, column_name)
             case Axis.ROW:
                 try:
-                    row_name = self.table.dataframe.index[
+                    row_name = self.table.names(Axis.ROW)[
                         self.data_table_screen.data_table.cursor_row
                     ]
                 except (IndexError, AttributeError):
@@ -556,13 +968,13 @@ class LTEApp(App):
                     # Check if the clicked element is a row header
                     if element.hover_column != -1 or element.hover_row == -1:
                         return
-                    row_name = self.table.dataframe.index[element.hover_row]
+                    row_name = self.table.names(Axis.ROW)[element.hover_row]
                     self.table.toggle_order(self.table.mode, row_name)
                 case Axis.COLUMN:
                     # Check if the clicked element is a column header
                     if element.hover_row != -1 or element.hover_column == -1:
                         return
-                    column_name = self.table.dataframe.columns[element.hover_column]
+                    column_name = self.table.names(Axis.COLUMN)[element.hover_column]
                     self.table.toggle_order(self.table.mode, column_name)
 
         self.data_table_screen.draw_table()
@@ -572,7 +984,7 @@ class LTEApp(App):
         match self.table.mode:
             case Axis.COLUMN:
                 try:
-                    column_name = self.table.dataframe.columns[
+                    column_name = self.table.names(Axis.COLUMN)[
                         self.data_table_screen.data_table.cursor_column
                     ]
                 except (IndexError, AttributeError):
@@ -581,7 +993,7 @@ class LTEApp(App):
                 self.table.toggle_order(self.table.mode, column_name)
             case Axis.ROW:
                 try:
-                    row_name = self.table.dataframe.index[
+                    row_name = self.table.names(Axis.ROW)[
                         self.data_table_screen.data_table.cursor_row
                     ]
                 except (IndexError, AttributeError):
@@ -591,8 +1003,67 @@ class LTEApp(App):
 
         self.data_table_screen.draw_table()
 
+    def cursor_line(self) -> tuple[tuple[str] | str, int] | None:
+        """Name and displayed position of the column or row at the cursor,
+        depending on the mode."""
+        data_table = self.data_table_screen.data_table
+        match self.table.mode:
+            case Axis.COLUMN:
+                position = data_table.cursor_column
+            case Axis.ROW:
+                position = data_table.cursor_row
+        try:
+            return self.table.names(self.table.mode)[position], position
+        except IndexError:
+            self.data_table_screen.status_bar.update(f"No {self.table.mode} selected.")
+            return None
+
+    async def action_sort_ascending(self) -> None:
+        """Sort the rows by the column at the cursor, or the columns by the row."""
+        await self.sort_by_cursor_line(descending=False)
+
+    async def action_sort_descending(self) -> None:
+        """Sort the rows by the column at the cursor, or the columns by the row,
+        largest values first."""
+        await self.sort_by_cursor_line(descending=True)
+
+    async def sort_by_cursor_line(self, descending: bool) -> None:
+        line = self.cursor_line()
+        if line is None:
+            return
+        name = line[0]
+        self.table.sort_by(self.table.mode, name, descending)
+        direction = "descending" if descending else "ascending"
+        self.data_table_screen.status_bar.update(
+            f"Sorted by {self.table.mode} '{name}' ({direction})."
+        )
+        self.data_table_screen.draw_table()
+
+    async def action_move_backward(self) -> None:
+        """Move the column or row at the cursor one position back."""
+        await self.move_cursor_line(-1)
+
+    async def action_move_forward(self) -> None:
+        """Move the column or row at the cursor one position forward."""
+        await self.move_cursor_line(1)
+
+    async def move_cursor_line(self, step: int) -> None:
+        line = self.cursor_line()
+        if line is None:
+            return
+        name, position = line
+        if not self.table.move(self.table.mode, name, position + step):
+            return
+        self.data_table_screen.draw_table()
+        data_table = self.data_table_screen.data_table
+        match self.table.mode:
+            case Axis.COLUMN:
+                data_table.move_cursor(column=position + step)
+            case Axis.ROW:
+                data_table.move_cursor(row=position + step)
+
     async def action_start_selection_mode(self) -> None:
-        if self.table.dataframe.empty:
+        if self.table.data.empty:
             match self.table.mode:
                 case Axis.ROW:
                     self.data_table_screen.status_bar.update(
@@ -627,11 +1098,11 @@ class LTEApp(App):
 
         match self.table.mode:
             case Axis.COLUMN:
-                items = self.table.dataframe.columns
+                items = self.table.names(Axis.COLUMN)
                 cursor_position = self.data_table_screen.data_table.cursor_column
                 swap_method = self.table.swap_columns
             case Axis.ROW:
-                items = self.table.dataframe.index
+                items = self.table.names(Axis.ROW)
                 cursor_position = self.data_table_screen.data_table.cursor_row
                 swap_method = self.table.swap_rows
 
@@ -0,0 +1,153 @@
+from dataclasses import dataclass, field
+import re
+from typing import Any
+import warnings
+
+from .utils import Order, Scale
+
+DEFAULT_RULES = {
+    "order": Order.NEUTRAL,
+    "highlighting": ["\\bfseries{%s}", "\\underline{%s}"],
+    "default": "%s",
+    "precision": "%.2f",
+}
+
+PRECISION_PATTERN = re.compile(r"%\.(\d+)f")
+
+
+@dataclass(frozen=True, slots=True)
+class Precision:
+    """
+    Format of the numbers of a column or row, e.g. `%.2f`.
+
+    Attributes:
+    - format (str): The format string.
+    - decimals (int | None): Number of decimals of a format of the form `%.Xf`,
+      None for any other format.
+    """
+
+    format: str
+    decimals: int | None = field(init=False)
+
+    def __post_init__(self):
+        matching = PRECISION_PATTERN.fullmatch(self.format)
+        decimals = int(matching.group(1)) if matching else None
+        object.__setattr__(self, "decimals", decimals)
+
+    def increased(self) -> "Precision | None":
+        """The format with one more decimal, None if it has no decimals."""
+        if self.decimals is None:
+            return None
+        return Precision(f"%.{self.decimals + 1}f")
+
+    def decreased(self) -> "Precision | None":
+        """The format with one decimal less, None if there is none to remove."""
+        if not self.decimals:
+            return None
+        return Precision(f"%.{self.decimals - 1}f")
+
+
+@dataclass(frozen=True, slots=True)
+class Heatmap:
+    """
+    Colour scale of the numbers of a column or row, from no colour for the worst
+    value to `intensity` percent of `color` for the best one.
+
+    Attributes:
+    - color (str): Name of the `xcolor` colour, e.g. `green`.
+    - scale (Scale): How values are mapped to intensities: linearly over the range
+      of the values, logarithmically over it, or by percentile.
+    - intensity (int): Intensity of the best value, in percent.
+    """
+
+    color: str = "green"
+    scale: Scale = Scale.LINEAR
+    intensity: int = 50
+
+    def __post_init__(self):
+        object.__setattr__(self, "scale", Scale(self.scale))
+        if not 0 <= self.intensity <= 100:
+            raise ValueError(f"Invalid heatmap intensity {self.intensity}.")
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """
+    Compiled highlighting rules of a column or row.
+
+    Attributes:
+    - order (Order): Whether the smallest or the largest values are highlighted.
+    - highlighting (tuple[str, ...]): Templates of the extrema, best first.
+    - default (str): Template of all other numbers.
+    - precision (Precision): Format of the numbers.
+    - heatmap (Heatmap | None): Colour scale of the numbers, if any. It follows
+      `order` like the templates and is off for `Order.NEUTRAL`.
+    - templates (tuple[str, ...]): `highlighting` followed by `default`, i.e. the
+      template of each rank followed by the template of unranked numbers.
+    """
+
+    order: Order
+    highlighting: tuple[str, ...]
+    default: str
+    precision: Precision
+    heatmap: Heatmap | None = None
+    templates: tuple[str, ...] = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "templates", (*self.highlighting, self.default))
+
+
+# the compiled `DEFAULT_RULES`
+DEFAULT_RULE = Rule(
+    DEFAULT_RULES["order"],
+    tuple(DEFAULT_RULES["highlighting"]),
+    DEFAULT_RULES["default"],
+    Precision(DEFAULT_RULES["precision"]),
+)
+
+
+def compile_heatmap(heatmap: dict[str, Any] | None) -> Heatmap | None:
+    """
+    Compile the `heatmap` entry of highlighting rules, e.g.
+    `{"color": "red", "scale": "log", "intensity": 60}`, missing keys take their
+    default values. Raises TypeError or ValueError for invalid entries.
+    """
+    if heatmap is None:
+        return None
+    return Heatmap(**heatmap)
+
+
+def compile_rules(rules: dict[str, Any], default: Rule | None = None) -> Rule:
+    """
+    Compile highlighting rules given as a dictionary, e.g. parsed from JSON.
+
+    Parameters:
+    - rules (dict[str, Any]): The rules of a column or row, or the default rules.
+    - default (Rule | None): The compiled default rules, used for the keys missing
+      in `rules`. If None, `rules` are the default rules and missing keys are
+      taken from `DEFAULT_RULES` with a warning.
+
+    Returns:
+    - Rule: The compiled rules.
+    """
+    if default is None:
+        missing_keys = [key for key in DEFAULT_RULES if key not in rules]
+        if missing_keys:
+            warnings.warn(
+                f"The following keys were missing in the default highlighting: {missing_keys}"
+            )
+        default = DEFAULT_RULE
+
+    precision = default.precision
+    if "precision" in rules:
+        precision = Precision(rules["precision"])
+    heatmap = default.heatmap
+    if "heatmap" in rules:
+        heatmap = compile_heatmap(rules["heatmap"])
+    return Rule(
+        Order(rules.get("order", default.order)),
+        tuple(rules.get("highlighting", default.highlighting)),
+        rules.get("default", default.default),
+        precision,
+        heatmap,
+    )
@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from numbers import Real
+
+import numpy as np
+import pandas as pd
+
+
+def number_mask(values: np.ndarray) -> np.ndarray:
+    """Boolean mask of the values that are numbers, booleans are not."""
+    flat = values.ravel()
+    is_number = np.fromiter(
+        (isinstance(value, Real) and not isinstance(value, bool) for value in flat),
+        dtype=bool,
+        count=len(flat),
+    )
+    return is_number.reshape(values.shape)
+
+
+class TextLines:
+    """
+    The cells that are not numbers of each row, or each column, of a table.
+
+    They are kept as coordinate lists sorted by line, and a line is only expanded
+    to an object array with None for the numbers when it is read, so no array of
+    all cells is held.
+    """
+
+    def __init__(
+        self,
+        lines: np.ndarray,
+        positions: np.ndarray,
+        values: np.ndarray,
+        shape: tuple[int, int],
+    ):
+        order = np.argsort(lines, kind="stable")
+        # the cells of line `i` are at `starts[i]:starts[i + 1]`
+        self.starts = np.searchsorted(lines[order], np.arange(shape[0] + 1))
+        self.positions = positions[order]
+        self.values = values[order]
+        self.shape = shape
+
+    def __getitem__(self, lines: int | np.ndarray) -> np.ndarray:
+        """One line as a 1-D object array, or several lines as a 2-D one."""
+        if np.ndim(lines) == 0:
+            line = np.full(self.shape[1], None, dtype=object)
+            start, stop = self.starts[lines], self.starts[lines + 1]
+            line[self.positions[start:stop]] = self.values[start:stop]
+            return line
+        grid = np.full((len(lines), self.shape[1]), None, dtype=object)
+        for idx, line in enumerate(lines):
+            start, stop = self.starts[line], self.starts[line + 1]
+            grid[idx, self.positions[start:stop]] = self.values[start:stop]
+        return grid
+
+
+@dataclass
+class TableData:
+    """
+    Columnar storage of the cells of a table.
+
+    Numbers are kept in a float matrix and all other cells, e.g. text, in
+    coordinate lists, so a table of numbers takes 9 bytes per cell instead of a
+    Python object per cell. A DataFrame of the cells is only built when needed.
+
+    Attributes:
+    - numbers (np.ndarray): The numbers as float64, NaN for the other cells.
+    - is_number (np.ndarray): Boolean mask of the cells holding a number.
+    - text_rows (np.ndarray): Row of each cell that is not a number.
+    - text_columns (np.ndarray): Column of each cell that is not a number.
+    - text_values (np.ndarray): Object array of the value of each such cell.
+    - index (pd.Index): Names of the rows.
+    - columns (pd.Index): Names of the columns.
+    """
+
+    numbers: np.ndarray
+    is_number: np.ndarray
+    text_rows: np.ndarray
+    text_columns: np.ndarray
+    text_values: np.ndarray
+    index: pd.Index
+    columns: pd.Index
+
+    @classmethod
+    def from_dataframe(cls, dataframe: pd.DataFrame) -> "TableData":
+        """Split the cells of a DataFrame into numbers and other values."""
+        values = dataframe.to_numpy(dtype=object)
+        is_number = number_mask(values)
+        numbers = np.full(values.shape, np.nan)
+        numbers[is_number] = values[is_number].astype(float)
+        text_rows, text_columns = np.nonzero(~is_number)
+        return cls(
+            numbers,
+            is_number,
+            text_rows,
+            text_columns,
+            values[text_rows, text_columns],
+            dataframe.index,
+            dataframe.columns,
+        )
+
+    @classmethod
+    def empty_table(cls) -> "TableData":
+        return cls.from_dataframe(pd.DataFrame())
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.numbers.shape
+
+    @property
+    def empty(self) -> bool:
+        return 0 in self.numbers.shape
+
+    def text_lines(self, transposed: bool = False) -> TextLines:
+        """The cells that are not numbers of each row, or of each column if
+        `transposed`."""
+        if transposed:
+            return TextLines(
+                self.text_columns, self.text_rows, self.text_values, self.shape[::-1]
+            )
+        return TextLines(
+            self.text_rows, self.text_columns, self.text_values, self.shape
+        )
+
+    def to_numpy(self) -> np.ndarray:
+        """Object array of all cells, numbers as floats."""
+        values = self.numbers.astype(object)
+        values[self.text_rows, self.text_columns] = self.text_values
+        return values
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame of all cells with object dtype, numbers as floats."""
+        return pd.DataFrame(self.to_numpy(), index=self.index, columns=self.columns)
+
+    def nbytes(self) -> int:
+        """Memory used by the cells in bytes, not counting the text objects."""
+        return sum(
+            array.nbytes
+            for array in (
+                self.numbers,
+                self.is_number,
+                self.text_rows,
+                self.text_columns,
+                self.text_values,
+            )
+        )
@@ -1,16 +1,84 @@
+from concurrent.futures import Executor
 from copy import deepcopy
-import re
+from typing import Any
+
+import numpy as np
 import pandas as pd
 
-from .highlighting import DEFAULT_RULES, table_highlighting
+from .conversion import TableStructure
+from .highlighting import (
+    PARALLEL_MIN_CELLS,
+    HighlightCache,
+    apply_cell_overrides,
+    highlight_lines,
+    label_positions,
+    selected_values,
+)
+from .history import (
+    CellChange,
+    Change,
+    FilterChange,
+    HiddenChange,
+    History,
+    PositionsChange,
+    RulesChange,
+    SkipChange,
+)
+from .rules import DEFAULT_RULES, Rule, compile_rules
+from .storage import TableData, TextLines
 from .utils import Axis, Order
+from .views import RowFilter
 
 
 class Table:
-    def __init__(self):
-        # data
-        self.dataframe = pd.DataFrame()
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        min_parallel_cells: int = PARALLEL_MIN_CELLS,
+    ):
+        # data, shown with its columns and rows in the order of `positions`
+        self.data = TableData.empty_table()
+        self.positions = {
+            Axis.COLUMN: np.arange(0),
+            Axis.ROW: np.arange(0),
+        }
+        # hidden columns and rows, and the filter of the rows, which are neither
+        # shown nor highlighted
+        self.hidden = {
+            Axis.COLUMN: [],
+            Axis.ROW: [],
+        }
+        self.row_filter: RowFilter | None = None
+        # masks of the lines that are not hidden or filtered, by source position
+        self.visible_masks: dict[Axis, np.ndarray] = {}
+        # masks of the rows matching each filter used so far, so switching back
+        # to a filter or undoing it does not search the rows again
+        self.filter_masks: dict[RowFilter, np.ndarray] = {}
+        # positions, names and data of the shown lines in the displayed order,
+        # built when first needed
+        self.shown_positions: dict[Axis, np.ndarray] = {}
+        self.ordered_names: dict[Axis, pd.Index] = {}
+        self.ordered_dataframe: pd.DataFrame | None = None
         self.display_dataframe = pd.DataFrame()
+        # header/index structure inferred while parsing the LaTeX source
+        self.structure = TableStructure()
+
+        # highlighted columns and rows by position in the source data, computed
+        # again only when marked dirty, so reordering them highlights nothing
+        self.highlighted_data = None
+        # the cells that are not numbers of each row and column
+        self.text_lines: dict[Axis, TextLines] = {}
+        self.numbers = np.empty((0, 0))
+        self.is_text = np.empty((0, 0), dtype=bool)
+        self.highlighted = {}
+        # highlighted lines the display frame shares, copied before they change
+        self.display_lines: np.ndarray | None = None
+        self.dirty = {}
+        # sorted and formatted values of each line, kept until the data changes
+        self.caches = {Axis.COLUMN: HighlightCache(), Axis.ROW: HighlightCache()}
+        # optional executor to highlight large tables in parallel
+        self.executor = executor
+        self.min_parallel_cells = min_parallel_cells
 
         # configuration
         self.mode = Axis.COLUMN
@@ -19,28 +87,361 @@ class Table:
             Axis.COLUMN: {},
             Axis.ROW: {},
         }
+        # templates of single cells by row and column position in the source data,
+        # so they stay with their cell when lines are reordered, even for
+        # duplicate names
+        self.cell_overrides: dict[tuple[int, int], str] = {}
+        # compiled rules of the columns and rows, kept until their rules change
+        self.default_rule: Rule | None = None
+        self.rules: dict[Axis, dict[tuple[str] | str, Rule]] = {
+            Axis.COLUMN: {},
+            Axis.ROW: {},
+        }
+        # changes that can be undone, kept until new data or rules are loaded
+        self.history = History()
         self.reset_formatting_rules()
         self.skip = {
             Axis.COLUMN: [],
             Axis.ROW: [],
         }
 
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """The shown columns and rows of the table in the displayed order, built
+        from the stored data only when first accessed after a change."""
+        if self.ordered_dataframe is None:
+            dataframe = self.data.to_dataframe()
+            rows, columns = self.shown(Axis.ROW), self.shown(Axis.COLUMN)
+            num_rows, num_columns = self.data.shape
+            if not (is_identity(rows, num_rows) and is_identity(columns, num_columns)):
+                dataframe = dataframe.iloc[rows, columns]
+            self.ordered_dataframe = dataframe
+        return self.ordered_dataframe
+
+    @dataframe.setter
+    def dataframe(self, dataframe: pd.DataFrame) -> None:
+        self.load_data(TableData.from_dataframe(dataframe))
+
+    def load_data(self, data: TableData) -> None:
+        """Replace the data of the table, shown in its stored order."""
+        self.data = data
+        num_rows, num_columns = data.shape
+        self.positions = {
+            Axis.COLUMN: np.arange(num_columns),
+            Axis.ROW: np.arange(num_rows),
+        }
+        self.hidden = {
+            Axis.COLUMN: [],
+            Axis.ROW: [],
+        }
+        self.row_filter = None
+        self.visible_masks.clear()
+        self.filter_masks.clear()
+        self.cell_overrides = {}
+        self.reordered()
+        self.history.clear()
+
+    def reordered(self, axis: Axis | None = None) -> None:
+        """Drop the names and data in the displayed order after the columns or rows
+        were reordered, hidden or filtered, all of them if `axis` is None."""
+        if axis is None:
+            self.shown_positions.clear()
+            self.ordered_names.clear()
+        else:
+            self.shown_positions.pop(axis, None)
+            self.ordered_names.pop(axis, None)
+        self.ordered_dataframe = None
+
+    def visible(self, axis: Axis) -> np.ndarray:
+        """Boolean mask of the columns or rows that are neither hidden nor
+        filtered, by position in the source data."""
+        if axis not in self.visible_masks:
+            visible = selected_values(self.source_names(axis), self.hidden[axis])
+            if axis == Axis.ROW and self.row_filter is not None:
+                if self.row_filter not in self.filter_masks:
+                    self.filter_masks[self.row_filter] = self.row_filter.mask(self.data)
+                visible &= self.filter_masks[self.row_filter]
+            self.visible_masks[axis] = visible
+        return self.visible_masks[axis]
+
+    def shown(self, axis: Axis) -> np.ndarray:
+        """Source positions of the shown columns or rows, in the displayed order."""
+        if axis not in self.shown_positions:
+            positions, visible = self.positions[axis], self.visible(axis)
+            self.shown_positions[axis] = (
+                positions if visible.all() else positions[visible[positions]]
+            )
+        return self.shown_positions[axis]
+
     def reset_formatting_rules(self):
         """Reset the formatting rules to the default values"""
         self.default_rules = deepcopy(DEFAULT_RULES)
-        self.overrides[Axis.COLUMN] = {col: {} for col in self.dataframe.columns}
-        self.overrides[Axis.ROW] = {row: {} for row in self.dataframe.index}
+        self.overrides[Axis.COLUMN] = {
+            col: {} for col in self.source_names(Axis.COLUMN)
+        }
+        self.overrides[Axis.ROW] = {row: {} for row in self.source_names(Axis.ROW)}
+        self.cell_overrides = {}
+        self.history.clear()
+        self.invalidate()
+
+    def do(self, change: Change) -> None:
+        """Make a change and record it to be undone."""
+        self.apply_change(change)
+        self.history.record(change)
+
+    def undo(self) -> bool:
+        """Revert the last change, False if there is none."""
+        change = self.history.undo()
+        if change is None:
+            return False
+        self.apply_change(change.reversed())
+        return True
+
+    def redo(self) -> bool:
+        """Make the last undone change again, False if there is none."""
+        change = self.history.redo()
+        if change is None:
+            return False
+        self.apply_change(change)
+        return True
+
+    def apply_change(self, change: Change) -> None:
+        """Make a change without recording it, only the lines it affects are
+        highlighted again."""
+        match change:
+            case RulesChange(axis=None):
+                self.default_rules = change.after
+                self.invalidate()
+            case RulesChange():
+                self.overrides[change.axis][change.name] = change.after
+                self.invalidate(change.axis, change.name)
+            case HiddenChange():
+                self.hidden[change.axis] = list(change.after)
+                self.filtered(change.axis)
+            case FilterChange():
+                self.row_filter = change.after
+                self.filtered(Axis.ROW)
+            case SkipChange():
+                skip = self.skip[change.axis]
+                if change.name in skip:
+                    skip.remove(change.name)
+                else:
+                    skip.append(change.name)
+                # skipped values are not highlighted in the lines of the other axis
+                other_axis = Axis.ROW if change.axis == Axis.COLUMN else Axis.COLUMN
+                self.invalidate(other_axis)
+            case CellChange():
+                if change.after is None:
+                    self.cell_overrides.pop((change.row, change.column), None)
+                else:
+                    self.cell_overrides[(change.row, change.column)] = change.after
+            case PositionsChange():
+                self.positions[change.axis][change.slots] = change.after
+                self.reordered(change.axis)
+
+    def filtered(self, axis: Axis) -> None:
+        """Update the shown lines after columns or rows were hidden or filtered.
+        Hidden values are not highlighted in the lines of the other axis."""
+        self.visible_masks.pop(axis, None)
+        self.reordered(axis)
+        self.invalidate(Axis.ROW if axis == Axis.COLUMN else Axis.COLUMN)
+
+    def toggle_hidden(self, axis: Axis, name: tuple[str] | str) -> bool:
+        """Hide a column or row, or show it again."""
+        if name not in self.source_names(axis):
+            return False
+
+        before = tuple(self.hidden[axis])
+        if name in before:
+            after = tuple(hidden for hidden in before if hidden != name)
+        else:
+            after = (*before, name)
+        self.do(HiddenChange(axis, before, after))
+        return True
+
+    def show_all(self, axis: Axis) -> bool:
+        """Show all hidden columns or rows again, False if none is hidden."""
+        if not self.hidden[axis]:
+            return False
+        self.do(HiddenChange(axis, tuple(self.hidden[axis]), ()))
+        return True
+
+    def set_row_filter(self, row_filter: RowFilter | None) -> None:
+        """Show only the rows matching a filter, all rows if it is None. Raises
+        ValueError if the filter compares a column that is not in the table."""
+        if row_filter is not None and row_filter not in self.filter_masks:
+            # before recording the change, so an invalid filter is not undone
+            self.filter_masks[row_filter] = row_filter.mask(self.data)
+        if row_filter != self.row_filter:
+            self.do(FilterChange(self.row_filter, row_filter))
+
+    def set_default_rules(self, rules: dict[str, Any]) -> None:
+        """Replace the default highlighting rules."""
+        self.do(RulesChange(None, None, self.default_rules, rules))
+
+    def set_rules(self, axis: Axis, name: tuple[str] | str, rules: dict[str, Any]):
+        """Replace the highlighting rules of a column or row."""
+        self.do(RulesChange(axis, name, self.overrides[axis].get(name, {}), rules))
+
+    def update_rules(self, axis: Axis, name: tuple[str] | str, **rules: Any) -> None:
+        """Change some of the highlighting rules of a column or row."""
+        before = self.overrides[axis].get(name, {})
+        self.do(RulesChange(axis, name, before, {**before, **rules}))
+
+    def set_cell_rule(
+        self, row: tuple[str] | str, column: tuple[str] | str, template: str | None
+    ) -> bool:
+        """
+        Wrap a single cell in its own template, applied after highlighting, or
+        remove its template if `template` is None. For duplicate names, the cell
+        of the first shown row and column of that name is used.
+        """
+        row_position = label_positions(self.names(Axis.ROW), [row])[0]
+        column_position = label_positions(self.names(Axis.COLUMN), [column])[0]
+        if row_position < 0 or column_position < 0:
+            return False
+        cell = self.source_cell(row_position, column_position)
+        self.set_cell_template(cell, template)
+        return True
+
+    def source_cell(self, row: int, column: int) -> tuple[int, int]:
+        """Row and column position in the source data of a displayed cell."""
+        return int(self.shown(Axis.ROW)[row]), int(self.shown(Axis.COLUMN)[column])
+
+    def set_cell_template(self, cell: tuple[int, int], template: str | None) -> None:
+        """Set or remove the template of a cell given by its source position."""
+        before = self.cell_overrides.get(cell)
+        if before != template:
+            self.do(CellChange(*cell, before, template))
+
+    def rule(self, axis: Axis, name: tuple[str] | str) -> Rule:
+        """The compiled highlighting rules of a column or row."""
+        if name not in self.rules[axis]:
+            if self.default_rule is None:
+                self.default_rule = compile_rules(self.default_rules)
+            overrides = self.overrides[axis].get(name)
+            self.rules[axis][name] = (
+                compile_rules(overrides, self.default_rule)
+                if overrides
+                else self.default_rule
+            )
+        return self.rules[axis][name]
+
+    def names(self, axis: Axis) -> pd.Index:
+        """Names of the shown columns or rows, in the displayed order."""
+        if axis not in self.ordered_names:
+            names = self.source_names(axis)
+            positions = self.shown(axis)
+            self.ordered_names[axis] = (
+                names if is_identity(positions, len(names)) else names[positions]
+            )
+        return self.ordered_names[axis]
+
+    def source_names(self, axis: Axis) -> pd.Index:
+        """Names of the columns or rows, in the order of the source data."""
+        return self.data.columns if axis == Axis.COLUMN else self.data.index
+
+    def invalidate(
+        self, axis: Axis | None = None, name: tuple[str] | str | None = None
+    ) -> None:
+        """
+        Mark highlighted columns or rows to be computed again.
+
+        Invalidating all lines or a single line means that the rules changed, so
+        their compiled rules are dropped as well.
+
+        Parameters:
+        - axis (Axis | None): Axis of the lines, all lines of both axes if None.
+        - name (tuple[str] | str | None): Name of the line, all lines of the axis
+          if None.
+        """
+        if axis is None:
+            self.default_rule = None
+            for rules in self.rules.values():
+                rules.clear()
+        elif name is not None:
+            self.rules[axis].pop(name, None)
+
+        if not self.dirty:
+            return
+        if axis is None:
+            for dirty in self.dirty.values():
+                dirty[:] = True
+        elif name is None:
+            self.dirty[axis][:] = True
+        elif name in self.source_names(axis):
+            # a position, slice or mask for duplicate names
+            self.dirty[axis][self.source_names(axis).get_loc(name)] = True
+
+    def update_values(self) -> None:
+        """Prepare new data for highlighting, nothing highlighted so far is kept."""
+        if self.data is not self.highlighted_data:
+            self.highlighted_data = self.data
+            self.text_lines = {
+                Axis.COLUMN: self.data.text_lines(transposed=True),
+                Axis.ROW: self.data.text_lines(),
+            }
+            self.numbers = self.data.numbers
+            self.is_text = ~self.data.is_number
+            num_rows, num_columns = self.data.shape
+            # one line per row, so the columns are stored transposed
+            self.highlighted = {
+                Axis.COLUMN: np.empty((num_columns, num_rows), dtype=object),
+                Axis.ROW: np.empty((num_rows, num_columns), dtype=object),
+            }
+            self.dirty = {
+                Axis.COLUMN: np.ones(num_columns, dtype=bool),
+                Axis.ROW: np.ones(num_rows, dtype=bool),
+            }
+            self.caches = {Axis.COLUMN: HighlightCache(), Axis.ROW: HighlightCache()}
 
     def highlight_table(self) -> None:
         """Highlight the table based on the current configuration."""
-
-        self.display_dataframe = deepcopy(self.dataframe)
-        self.display_dataframe = table_highlighting(
-            self.display_dataframe,
-            self.mode,
-            self.default_rules,
-            self.overrides[self.mode],
-            self.skip[Axis.COLUMN] if self.mode == Axis.ROW else self.skip[Axis.ROW],
+        self.update_values()
+
+        axis = self.mode
+        other_axis = Axis.ROW if axis == Axis.COLUMN else Axis.COLUMN
+        values, numbers, is_text = self.text_lines[axis], self.numbers, self.is_text
+        if axis == Axis.COLUMN:
+            numbers, is_text = numbers.T, is_text.T
+
+        names = self.source_names(axis)
+        lines = np.flatnonzero(self.dirty[axis])
+        if len(lines) and self.highlighted[axis] is self.display_lines:
+            # copy on write, the current display frame keeps the old lines
+            self.highlighted[axis] = self.highlighted[axis].copy()
+        highlight_lines(
+            values,
+            numbers,
+            is_text,
+            self.highlighted[axis],
+            selected_values(self.source_names(other_axis), self.skip[other_axis])
+            & self.visible(other_axis),
+            {idx: self.rule(axis, names[idx]) for idx in lines},
+            self.caches[axis],
+            self.executor,
+            self.min_parallel_cells,
+        )
+        self.dirty[axis][lines] = False
+
+        highlighted = self.highlighted[axis]
+        if axis == Axis.COLUMN:
+            highlighted = highlighted.T
+        # the display shares the highlighted lines unless they have to be reordered,
+        # hidden or cells wrapped, which is done on a fresh copy
+        rows, columns = self.shown(Axis.ROW), self.shown(Axis.COLUMN)
+        num_rows, num_columns = self.data.shape
+        self.display_lines = None
+        if not (is_identity(rows, num_rows) and is_identity(columns, num_columns)):
+            highlighted = highlighted[np.ix_(rows, columns)]
+        elif self.cell_overrides:
+            highlighted = highlighted.copy()
+        else:
+            self.display_lines = self.highlighted[axis]
+        apply_cell_overrides(highlighted, rows, columns, self.cell_overrides)
+        index, columns = self.names(Axis.ROW), self.names(Axis.COLUMN)
+        self.display_dataframe = pd.DataFrame(
+            highlighted, index=index, columns=columns, copy=False
         )
 
     def multi_index_to_str(self, multi_index: tuple[str] | str) -> str:
@@ -68,15 +469,11 @@ class Table:
                     return Order.NEUTRAL
 
         # Check if the column or row exists in the DataFrame
-        if axis == Axis.COLUMN and name not in self.dataframe.columns:
-            return False
-        if axis == Axis.ROW and name not in self.dataframe.index:
+        if name not in self.source_names(axis):
             return False
 
-        current_order = self.overrides[axis][name].get(
-            "order", self.default_rules["order"]
-        )
-        self.overrides[axis][name]["order"] = swap(current_order)
+        current_order = self.rule(axis, name).order
+        self.update_rules(axis, name, order=swap(current_order))
 
         return True
 
@@ -84,81 +481,115 @@ class Table:
         """Toggle skipping a column or row."""
 
         # Check if the column or row exists in the DataFrame
-        if axis == Axis.COLUMN and name not in self.dataframe.columns:
-            return False
-        if axis == Axis.ROW and name not in self.dataframe.index:
+        if name not in self.source_names(axis):
             return False
 
-        if name in self.skip[axis]:
-            self.skip[axis].remove(name)
-        else:
-            self.skip[axis].append(name)
+        self.do(SkipChange(axis, name))
 
         return True
 
     def increase_precision(self, axis: Axis, name: str) -> bool:
         """Increase the precision of a column or row."""
-        if axis == Axis.COLUMN and name not in self.dataframe.columns:
-            return False
-        if axis == Axis.ROW and name not in self.dataframe.index:
+        if name not in self.source_names(axis):
             return False
 
-        current_precision = self.overrides[axis][name].get(
-            "precision", self.default_rules["precision"]
-        )  # string of form "%.Xf"
-        matching = re.match(r"%.(\d+)f", current_precision)
-        if not matching:
+        precision = self.rule(axis, name).precision.increased()
+        if precision is None:
             return False
-        significant_digits = int(matching.group(1))
 
-        self.overrides[axis][name]["precision"] = f"%.{significant_digits + 1}f"
+        self.update_rules(axis, name, precision=precision.format)
         return True
 
     def decrease_precision(self, axis: Axis, name: str) -> bool:
         """Decrease the precision of a column or row."""
-        if axis == Axis.COLUMN and name not in self.dataframe.columns:
-            return False
-        if axis == Axis.ROW and name not in self.dataframe.index:
+        if name not in self.source_names(axis):
             return False
 
-        current_precision = self.overrides[axis][name].get(
-            "precision", self.default_rules["precision"]
-        )
-        matching = re.match(r"%.(\d+)f", current_precision)
-        if not matching:
-            return False
-        significant_digits = int(matching.group(1))
-        if significant_digits == 0:
+        precision = self.rule(axis, name).precision.decreased()
+        if precision is None:
             return False
 
-        self.overrides[axis][name]["precision"] = f"%.{significant_digits - 1}f"
+        self.update_rules(axis, name, precision=precision.format)
         return True
 
-    def swap_columns(self, col1: tuple[str] | str, col2: tuple[str] | str) -> bool:
-        """Swap two columns in the DataFrame."""
-        if col1 not in self.dataframe.columns or col2 not in self.dataframe.columns:
+    def swap(
+        self, axis: Axis, name1: tuple[str] | str, name2: tuple[str] | str
+    ) -> bool:
+        """Swap two columns or rows, only their displayed positions change."""
+        names = self.names(axis)
+        if name1 not in names or name2 not in names:
             return False
 
-        self.dataframe[[col1, col2]] = self.dataframe[[col2, col1]]
-
-        # Swap columns in the DataFrame
-        cols = list(self.dataframe.columns)
-        idx1, idx2 = cols.index(col1), cols.index(col2)
-        cols[idx1], cols[idx2] = cols[idx2], cols[idx1]
-        self.dataframe = self.dataframe[cols]
+        slots = self.shown_slots(axis)[label_positions(names, [name1, name2])]
+        before = self.positions[axis][slots]
+        self.do(PositionsChange(axis, slots, before, before[::-1]))
 
         return True
 
+    def shown_slots(self, axis: Axis) -> np.ndarray:
+        """Indices in `positions` of the shown columns or rows."""
+        return np.flatnonzero(self.visible(axis)[self.positions[axis]])
+
+    def swap_columns(self, col1: tuple[str] | str, col2: tuple[str] | str) -> bool:
+        """Swap two columns in the DataFrame."""
+        return self.swap(Axis.COLUMN, col1, col2)
+
     def swap_rows(self, row1: tuple[str] | str, row2: tuple[str] | str) -> bool:
         """Swap two rows in the DataFrame."""
-        if row1 not in self.dataframe.index or row2 not in self.dataframe.index:
+        return self.swap(Axis.ROW, row1, row2)
+
+    def move(self, axis: Axis, name: tuple[str] | str, position: int) -> bool:
+        """Move a column or row to another displayed position."""
+        names = self.names(axis)
+        if name not in names or not 0 <= position < len(names):
             return False
 
-        # Swap rows in the DataFrame
-        rows = list(self.dataframe.index)
-        idx1, idx2 = rows.index(row1), rows.index(row2)
-        rows[idx1], rows[idx2] = rows[idx2], rows[idx1]
+        shown_slots = self.shown_slots(axis)
+        idx = shown_slots[label_positions(names, [name])[0]]
+        position = shown_slots[position]
+        # only the lines between the old and the new position move
+        slots = np.arange(min(idx, position), max(idx, position) + 1)
+        before = self.positions[axis][slots]
+        after = np.roll(before, 1 if position < idx else -1)
+        self.do(PositionsChange(axis, slots, before, after))
+
+        return True
 
-        self.dataframe = self.dataframe.reindex(rows)
+    def sort_by(
+        self, axis: Axis, name: tuple[str] | str, descending: bool = False
+    ) -> bool:
+        """
+        Sort the rows by the values of a column, or the columns by the values of a
+        row.
+
+        The sort is stable, so lines with equal values keep their order, and lines
+        without a number come last.
+
+        Parameters:
+        - axis (Axis): Axis of the line that is sorted by.
+        - name (tuple[str] | str): Name of the column or row that is sorted by.
+        - descending (bool): Whether the largest values come first.
+
+        Returns:
+        - bool: Whether the column or row exists.
+        """
+        if name not in self.source_names(axis):
+            return False
+
+        idx = label_positions(self.source_names(axis), [name])[0]
+        numbers = self.data.numbers
+        numbers = numbers[:, idx] if axis == Axis.COLUMN else numbers[idx]
+        other_axis = Axis.ROW if axis == Axis.COLUMN else Axis.COLUMN
+        positions = self.positions[other_axis]
+        keys = numbers[positions]
+        if descending:
+            keys = -keys
+        sorted_positions = positions[np.argsort(keys, kind="stable")]
+        self.do(PositionsChange.between(other_axis, positions, sorted_positions))
 
         return True
+
+
+def is_identity(positions: np.ndarray, size: int) -> bool:
+    """Whether positions are all `size` positions in their original order."""
+    return len(positions) == size and bool((positions == np.arange(size)).all())
@@ -13,11 +13,18 @@ class Order(str, Enum):
     MAXIMUM = "max"
 
 
+class Scale(str, Enum):
+    LINEAR = "linear"
+    LOG = "log"
+    PERCENTILE = "percentile"
+
+
 AVAILABLE_RULES = {
     "order": Order | str,
     "highlight": list[str],
     "default": str,
     "precision": str,
+    "heatmap": dict | None,
 }
 RULE_TYPES = Order | str | list[str]
 RULES = dict[str, RULE_TYPES]
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+import re
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .storage import TableData
+
+COMPARISONS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+def label_text(label: Any) -> str:
+    """Name of a column or row as text, levels of a multi-index joined by spaces."""
+    if isinstance(label, tuple):
+        return " ".join(str(level) for level in label)
+    return str(label)
+
+
+@dataclass(frozen=True, slots=True)
+class RowFilter:
+    """
+    Rows to show, by name and by value. Rows must match all given conditions.
+
+    Attributes:
+    - pattern (str | None): Regular expression searched in the name of each row,
+      see `label_text`. None for rows of any name.
+    - column (Any): Name of the column whose numbers are compared with `value`,
+      None for rows of any value. It is matched by `label_text`, so "F1" names
+      the column ('F1',) of a parsed table. Rows without a number in it are not
+      shown.
+    - comparison (str): One of the keys of `COMPARISONS`.
+    - value (float): The value the numbers are compared with, converted with
+      `float`.
+    """
+
+    pattern: str | None = None
+    column: Any = None
+    comparison: str = ">="
+    value: float = 0.0
+
+    def __post_init__(self):
+        if self.comparison not in COMPARISONS:
+            raise ValueError(f"Invalid comparison '{self.comparison}'.")
+        if self.pattern is not None:
+            # raises re.error for invalid patterns
+            re.compile(self.pattern)
+        if self.value is None or isinstance(self.value, bool):
+            raise TypeError(f"Invalid value '{self.value}', expected a number.")
+        # raises ValueError for text that is not a number
+        object.__setattr__(self, "value", float(self.value))
+
+    def mask(self, data: TableData) -> np.ndarray:
+        """Boolean mask of the rows of the data that are shown."""
+        shown = np.ones(len(data.index), dtype=bool)
+        if self.pattern is not None:
+            search = re.compile(self.pattern).search
+            shown &= np.fromiter(
+                (search(label_text(label)) is not None for label in data.index),
+                dtype=bool,
+                count=len(data.index),
+            )
+        if self.column is not None:
+            position = self.column_position(data.columns)
+            # comparisons with NaN are False, so cells without a number are hidden
+            shown &= COMPARISONS[self.comparison](data.numbers[:, position], self.value)
+        return shown
+
+    def column_position(self, columns: pd.Index) -> int:
+        """Position of the compared column among the columns of a table, raises
+        ValueError if there is no column of that name."""
+        name = label_text(self.column)
+        for position, label in enumerate(columns):
+            if label_text(label) == name:
+                return position
+        raise ValueError(f"Column '{name}' not found.")
@@ -0,0 +1,99 @@
+import pickle
+import sys
+import types
+
+from cache import ParseCache, source_key
+from conversion import Span, parse_latex_table
+
+latex_table = r"""
+Method & Acc & F1 \\
+A & 0.91 & 0.85 \\
+B & 0.70 & 0.60 \\
+"""
+
+
+def parse(cache: ParseCache, latex_str: str):
+    """Parse a table through the cache, like the input screen of the app."""
+    key = source_key(latex_str)
+    result = cache.get(key)
+    if result is None:
+        result = parse_latex_table(latex_str)
+        cache.put(key, result)
+    return result
+
+
+def test_source_key_ignores_whitespace() -> None:
+    assert source_key(latex_table) == source_key(
+        "\n\n  Method & Acc & F1 \\\\\nA & 0.91 & 0.85 \\\\  \nB & 0.70 & 0.60 \\\\"
+    )
+    assert source_key(latex_table) != source_key(latex_table.replace("0.91", "0.92"))
+
+
+def test_hit_rate() -> None:
+    cache = ParseCache()
+    first, _ = parse(cache, latex_table)
+    second, _ = parse(cache, latex_table)
+    assert second.equals(first)
+    assert second is not first
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_cached_structure_is_copied() -> None:
+    cache = ParseCache()
+    _, structure = parse(cache, latex_table)
+    structure.spans.append(Span(0, 0, 2, 1))
+    structure.rules.append((1, 1, 2))
+    structure.header_depth = 0
+    _, cached = parse(cache, latex_table)
+    assert cached.spans == []
+    assert cached.rules == []
+    assert cached.header_depth == 1
+
+
+def test_eviction_by_size() -> None:
+    cache = ParseCache()
+    parse(cache, latex_table)
+    cache.max_bytes = cache.size
+    parse(cache, latex_table.replace("0.91", "0.92"))
+    assert len(cache.entries) == 1
+    assert cache.size <= cache.max_bytes
+
+
+def test_disk_persistence(tmp_path) -> None:
+    parse(ParseCache(cache_dir=tmp_path), latex_table)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    cache = ParseCache(cache_dir=tmp_path)
+    dataframe, _ = parse(cache, latex_table)
+    assert cache.disk_hits == 1
+    assert dataframe.loc[("A",), ("Acc",)] == 0.91
+
+    cache = ParseCache(cache_dir=tmp_path, max_disk_bytes=0)
+    parse(cache, latex_table.replace("0.91", "0.92"))
+    assert list(tmp_path.glob("*.pkl")) == []
+
+
+def test_unloadable_files_are_misses(tmp_path, monkeypatch) -> None:
+    # a class of a module that no longer exists when the file is loaded
+    module = types.ModuleType("removed_module")
+    exec("class Removed:\n    pass", module.__dict__)
+    module.Removed.__module__ = "removed_module"
+    monkeypatch.setitem(sys.modules, "removed_module", module)
+    stale = pickle.dumps(module.Removed())
+    monkeypatch.delitem(sys.modules, "removed_module")
+
+    cache = ParseCache(cache_dir=tmp_path)
+    path = cache.path(source_key(latex_table))
+    path.write_bytes(stale)
+    dataframe, _ = parse(cache, latex_table)
+    assert cache.misses == 1
+    assert dataframe.loc[("A",), ("Acc",)] == 0.91
+
+    # files of older formats are never loaded
+    path.unlink()
+    (tmp_path / f"{source_key(latex_table)}.pkl").write_bytes(stale)
+    cache = ParseCache(cache_dir=tmp_path)
+    parse(cache, latex_table)
+    assert cache.misses == 1
@@ -0,0 +1,273 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conversion import (
+    IncrementalParser,
+    ParseCancelled,
+    Token,
+    extract_numbers,
+    iter_rows,
+    Span,
+    latex_table_to_dataframe,
+    parse_latex_table,
+    read_latex_table,
+    resolve_spans,
+    tokenize,
+)
+
+latex_table = r"""
+\begin{tabular}{lcc}
+\toprule
+ & \multicolumn{2}{c}{Metrics} \\
+Method & Acc & F1 \\ % comment
+\midrule
+\multirow{2}{*}{Ours} & \textbf{0.91} & 0.85 \\
+ & 0.90 & \underline{0.80} \\
+Base & 0.70 & 0.60 \\
+\bottomrule
+\end{tabular}
+"""
+
+
+def test_tokenize_drops_structure_and_comments() -> None:
+    tokens = list(tokenize("\\toprule\na & b \\\\ % comment\n\\end{tabular}"))
+    assert tokens == [
+        (Token.NEWLINE, None),
+        (Token.ROW_END, ["a ", " b "]),
+    ]
+
+
+def test_rows_end_at_line_break_and_double_backslash() -> None:
+    rows = list(iter_rows(tokenize("a & b \\\\ c & d \\\\\ne & f")))
+    assert [[cell for cell, _, _ in row] for row in rows] == [
+        ["a", "b"],
+        ["c", "d"],
+        ["e", "f"],
+    ]
+
+
+def test_rows_keep_commands_and_escaped_separators() -> None:
+    rows = list(iter_rows(tokenize("a \\& b & \\textbf{1} \\\\ % c\n\\emph{x} & 2")))
+    assert [[cell for cell, _, _ in row] for row in rows] == [
+        ["a \\& b", "\\textbf{1}"],
+        ["\\emph{x}", "2"],
+    ]
+
+
+def test_latex_table_to_dataframe() -> None:
+    dataframe = latex_table_to_dataframe(latex_table)
+    expected = pd.DataFrame(
+        [[0.91, 0.85], [0.90, 0.80], [0.70, 0.60]],
+        index=[["Ours", "Ours", "Base"]],
+        columns=[["Metrics", "Metrics"], ["Acc", "F1"]],
+    ).astype(object)
+    assert dataframe.equals(expected)
+    assert dataframe.index.equals(expected.index)
+    assert dataframe.columns.equals(expected.columns)
+
+
+def test_spans_with_nested_braces() -> None:
+    rows = list(
+        iter_rows(
+            tokenize(
+                "\\multicolumn{2}{p{2cm}}{\\textbf{A}} & "
+                "\\multirow[t]{2}{*}{\\emph{B}} \\\\"
+            )
+        )
+    )
+    assert rows == [[("\\textbf{A}", 2, 1), ("\\emph{B}", 1, 2)]]
+
+
+def test_nested_multirow_in_multicolumn() -> None:
+    rows = list(
+        resolve_spans(
+            iter_rows(
+                tokenize(
+                    "\\multicolumn{2}{c}{\\multirow{2}{*}{A}} & 1 \\\\\n & & 2 \\\\"
+                )
+            )
+        )
+    )
+    assert rows == [["A", "A", "1"], ["A", "A", "2"]]
+
+
+def test_partial_rules() -> None:
+    tokens = list(tokenize("\\cmidrule(lr){2-3} \\cline{1-2}"))
+    assert (Token.RULE, (2, 3)) in tokens
+    assert (Token.RULE, (1, 2)) in tokens
+    assert list(iter_rows(tokens)) == []
+
+
+def test_extract_numbers() -> None:
+    values = np.array(
+        [
+            ["\\textbf{0.91}", "$0.5 \\pm 0.1$", "1{,}234.5", "1.2e-3"],
+            ["\\underline{\\textbf{-2}}", "$1.2 \\times 10^{3}$", "abc", ""],
+        ],
+        dtype=object,
+    )
+    expected = np.array(
+        [[0.91, 0.5, 1234.5, 0.0012], [-2.0, 1200.0, "abc", ""]], dtype=object
+    )
+    numbers, is_number = extract_numbers(values)
+    assert (numbers == expected).all()
+    assert is_number.tolist() == [[True, True, True, True], [True, True, False, False]]
+
+
+def test_extract_numbers_keeps_separated_digits_as_text() -> None:
+    values = np.array(
+        [["12 34", "0,123", "12,34", "1,234,567", "\\textbf{ 12 }", "1\\,234"]],
+        dtype=object,
+    )
+    numbers, is_number = extract_numbers(values)
+    assert is_number.tolist() == [[False, False, False, True, True, True]]
+    assert numbers[0, :3].tolist() == ["12 34", "0,123", "12,34"]
+    assert numbers[0, 3:].tolist() == [1234567.0, 12.0, 1234.0]
+
+
+def test_parse_latex_table_structure() -> None:
+    _, structure = parse_latex_table(
+        latex_table.replace("\\midrule", "\\cmidrule(lr){2-3}")
+    )
+    assert structure.header_depth == 2
+    assert structure.index_depth == 1
+    assert structure.spans == [Span(0, 1, 1, 2), Span(2, 0, 2, 1)]
+    assert structure.rules == [(2, 2, 3)]
+
+
+def test_table_without_headers() -> None:
+    dataframe = latex_table_to_dataframe("x & 1 \\\\\ny & 2 \\\\")
+    assert dataframe.index.tolist() == [("x",), ("y",)]
+    assert dataframe[0].tolist() == [1.0, 2.0]
+
+
+def test_read_latex_table_in_chunks(tmp_path) -> None:
+    expected, expected_structure = parse_latex_table(latex_table)
+
+    dataframe, structure = read_latex_table(io.StringIO(latex_table), chunk_size=2)
+    assert dataframe.equals(expected)
+    assert dataframe.columns.equals(expected.columns)
+    assert structure == expected_structure
+
+    path = tmp_path / "table.tex"
+    path.write_text(latex_table)
+    dataframe, _ = read_latex_table(path, chunk_size=1)
+    assert dataframe.equals(expected)
+
+
+def test_incremental_parser_reparses_edited_lines() -> None:
+    parser = IncrementalParser()
+    parser.update(latex_table)
+
+    edited = latex_table.replace("Base & 0.70", "Base & 0.75")
+    dataframe, structure = parser.update(edited)
+    expected, expected_structure = parse_latex_table(edited)
+    assert parser.reparsed_lines == 1
+    assert parser.reconverted_rows == 1
+    assert dataframe.equals(expected)
+    assert structure == expected_structure
+
+
+def test_incremental_parser_follows_multirow() -> None:
+    parser = IncrementalParser()
+    parser.update(latex_table)
+
+    edited = latex_table.replace("\\multirow{2}{*}{Ours}", "\\multirow{3}{*}{Ours}")
+    dataframe, structure = parser.update(edited)
+    expected, expected_structure = parse_latex_table(edited)
+    assert parser.reparsed_lines == 1
+    assert parser.reconverted_rows == 3
+    assert dataframe.equals(expected)
+    assert dataframe.index.equals(expected.index)
+    assert structure == expected_structure
+
+
+def test_incremental_parser_drops_repeated_longtable_blocks() -> None:
+    longtable = "\n".join(
+        [
+            "\\caption{Results}\\\\",
+            "Method & Acc \\\\",
+            "\\endfirsthead",
+            "Method & Acc \\\\",
+            "\\endhead",
+            "\\multicolumn{2}{r}{Continued} \\\\ \\endfoot",
+            "A & 1 \\\\",
+            "B & 2 \\\\",
+        ]
+    )
+    parser = IncrementalParser()
+    for source in [
+        longtable,
+        longtable.replace("B & 2", "B & 3"),
+        longtable.replace("\\endfirsthead", ""),
+        latex_table,
+    ]:
+        dataframe, structure = parser.update(source)
+        expected, expected_structure = parse_latex_table(source)
+        assert dataframe.equals(expected)
+        assert structure == expected_structure
+    assert parse_latex_table(longtable)[1].header_depth == 1
+
+
+def test_incremental_parser_cancel_keeps_state() -> None:
+    parser = IncrementalParser()
+    parser.update(latex_table)
+    source = parser.source
+
+    def cancel(done: int, total: int) -> None:
+        raise ParseCancelled
+
+    with pytest.raises(ParseCancelled):
+        parser.update(latex_table.replace("Base & 0.70", "Base & 0.75"), cancel)
+    assert parser.source == source
+
+    reports = []
+    edited = latex_table.replace("Base & 0.70", "Base & 0.75")
+    parser.update(edited, lambda done, total: reports.append((done, total)))
+    assert reports == [(0, 3), (1, 3), (2, 3)]
+
+
+def test_incremental_parser_cancel_while_converting() -> None:
+    parser = IncrementalParser()
+    parser.update(latex_table)
+    source = parser.source
+    dataframe, _ = parser.update(latex_table)
+    edited = latex_table.replace("Base & 0.70", "Base & 0.75")
+
+    def cancel(done: int, total: int) -> None:
+        # the single edited line is tokenized before the first row is resolved
+        if done > 1:
+            raise ParseCancelled
+
+    with pytest.raises(ParseCancelled):
+        parser.update(edited, cancel)
+    assert parser.source == source
+    pd.testing.assert_frame_equal(parser.dataframe, dataframe)
+
+    expected, _ = parse_latex_table(edited)
+    result, _ = parser.update(edited)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_incremental_parser_failed_update_keeps_state() -> None:
+    parser = IncrementalParser()
+    dataframe, structure = parser.update(latex_table)
+    source = parser.source
+    # too wide to be expanded, resolving the spans raises after the lines changed
+    malformed = latex_table.replace(
+        "\\multirow{2}{*}{Ours}", "\\multicolumn{1000000000000}{c}{Ours}"
+    )
+    with pytest.raises(MemoryError):
+        parser.update(malformed)
+    assert parser.source == source
+    assert parser.structure == structure
+    pd.testing.assert_frame_equal(parser.dataframe, dataframe)
+
+    edited = latex_table.replace("Base & 0.70", "Base & 0.75")
+    expected, expected_structure = parse_latex_table(edited)
+    result, result_structure = parser.update(edited)
+    pd.testing.assert_frame_equal(result, expected)
+    assert result_structure == expected_structure
@@ -0,0 +1,100 @@
+from document import LatexDocument, scan_tables
+
+document_source = r"""
+\section{Results}
+\begin{table}
+\begin{tabular}{lc}
+Method & Acc \\
+A & 1 \\
+\end{tabular}
+\end{table}
+% \begin{tabular}{lc} commented out \end{tabular}
+\begin{tabularx}{\linewidth}{lX}
+Method & F1 \\
+B & 2 \\
+\end{tabularx}
+\begin{longtable}{lc}
+Method & Loss \\
+\endhead
+C & 3 \\
+\end{longtable}
+"""
+
+
+def test_scan_tables() -> None:
+    tables = scan_tables(document_source.encode())
+    assert [table.environment for table in tables] == [
+        "tabular",
+        "tabularx",
+        "longtable",
+    ]
+    first = tables[0]
+    source = document_source.encode()[first.start : first.end].decode()
+    assert source.startswith("\\begin{tabular}")
+    assert source.endswith("\\end{tabular}")
+
+
+def test_tables_are_parsed_lazily(tmp_path) -> None:
+    path = tmp_path / "paper.tex"
+    path.write_text(document_source)
+    with LatexDocument(path) as document:
+        assert len(document) == 3
+        assert document.parsed == {}
+
+        dataframe, _ = document[2]
+        assert list(document.parsed) == [2]
+        assert dataframe.columns.tolist() == [("Loss",)]
+        assert dataframe.index.tolist() == [("C",)]
+        assert document[-1][0] is dataframe
+
+
+def test_document_without_environment(tmp_path) -> None:
+    path = tmp_path / "body.tex"
+    path.write_text("Method & Acc \\\\\nA & 1 \\\\\n")
+    with LatexDocument(path) as document:
+        assert len(document) == 1
+        assert document[0][0].index.tolist() == [("A",)]
+
+    empty = tmp_path / "empty.tex"
+    empty.write_text("")
+    with LatexDocument(empty) as document:
+        assert len(document) == 0
+
+
+longtable_source = r"""
+\begin{longtable}{lcc}
+\caption{Results on all datasets.}\label{tab:results}\\
+\toprule
+& \multicolumn{2}{c}{Metrics} \\
+\cmidrule(lr){2-3}
+Method & Acc & F1 \\
+\midrule
+\endfirsthead
+\caption[]{Results (continued).}\\
+\toprule
+& \multicolumn{2}{c}{Metrics} \\
+\cmidrule(lr){2-3}
+Method & Acc & F1 \\
+\midrule
+\endhead
+\midrule
+\multicolumn{3}{r}{Continued on next page} \\
+\endfoot
+\bottomrule
+\endlastfoot
+A & 1 & 2 \\
+B & 3 & 4 \\
+\end{longtable}
+"""
+
+
+def test_longtable_repeated_blocks_are_dropped(tmp_path) -> None:
+    path = tmp_path / "paper.tex"
+    path.write_text(longtable_source)
+    with LatexDocument(path) as document:
+        dataframe, structure = document[0]
+    assert structure.header_depth == 2
+    assert structure.rules == [(1, 2, 3)]
+    assert dataframe.columns.tolist() == [("Metrics", "Acc"), ("Metrics", "F1")]
+    assert dataframe.index.tolist() == [("A",), ("B",)]
+    assert dataframe.to_numpy().tolist() == [[1.0, 2.0], [3.0, 4.0]]
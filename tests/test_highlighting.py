@@ -1,8 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from highlighting import table_highlighting
-from utils import Order, Axis
+from highlighting import heatmap_intensities, table_highlighting
+from rules import Heatmap
+from utils import Order, Axis, Scale
 
 base_dataframe = pd.DataFrame(
     {
@@ -196,3 +200,190 @@ def test_override_row() -> None:
     assert table_highlighting(dataframe, Axis.ROW, default_rules, overrides).equals(
         expected
     )
+
+
+def test_ties_text_and_ignored_rows() -> None:
+    dataframe = pd.DataFrame(
+        {"A": [2.0, "n/a", 1.0, 2.0, 0.5]},
+        index=["a", "b", "c", "d", "e"],
+        dtype=object,
+    )
+    default_rules = {
+        "order": Order.MINIMUM,
+        "highlighting": ["\\bfseries{%s}", "\\underline{%s}", "\\textit{%s}"],
+        "default": "%s",
+        "precision": "%.1f",
+    }
+    expected = pd.DataFrame(
+        {
+            "A": [
+                "\\underline{2.0}",
+                "n/a",
+                "\\bfseries{1.0}",
+                "\\underline{2.0}",
+                "0.5",
+            ]
+        },
+        index=["a", "b", "c", "d", "e"],
+    )
+    highlighted = table_highlighting(
+        dataframe, Axis.COLUMN, default_rules, ignore=["e"]
+    )
+    assert highlighted.equals(expected)
+
+
+def test_row_highlighting_keeps_input() -> None:
+    dataframe = pd.DataFrame(
+        {"A": [1.0, "x"], "B": [2.0, 3.0]}, index=["a", "b"], dtype=object
+    )
+    original = dataframe.copy()
+    default_rules = {
+        "order": Order.MAXIMUM,
+        "highlighting": ["\\bfseries{%s}"],
+        "default": "%s",
+        "precision": "%.1f",
+    }
+    expected = pd.DataFrame(
+        {"A": ["1.0", "x"], "B": ["\\bfseries{2.0}", "\\bfseries{3.0}"]},
+        index=["a", "b"],
+    )
+    assert table_highlighting(dataframe, Axis.ROW, default_rules).equals(expected)
+    assert dataframe.equals(original)
+
+
+def test_parallel_highlighting_matches_serial() -> None:
+    dataframe = pd.DataFrame(
+        [[float((row * 7 + col * 3) % 11) for col in range(6)] for row in range(9)],
+        index=[f"r{row}" for row in range(9)],
+        columns=[f"c{col}" for col in range(6)],
+    )
+    default_rules = {
+        "order": Order.MAXIMUM,
+        "highlighting": ["\\bfseries{%s}", "\\underline{%s}"],
+        "default": "%s",
+        "precision": "%.1f",
+    }
+    overrides = {"c2": {"order": Order.MINIMUM}, "r3": {"order": Order.MINIMUM}}
+    for axis in Axis:
+        serial = table_highlighting(dataframe, axis, default_rules, overrides, [])
+        with ThreadPoolExecutor(2) as executor:
+            parallel = table_highlighting(
+                dataframe,
+                axis,
+                default_rules,
+                overrides,
+                [],
+                executor=executor,
+                min_parallel_cells=0,
+            )
+        assert parallel.equals(serial)
+
+
+def test_ties_at_displayed_precision() -> None:
+    dataframe = pd.DataFrame(
+        {"A": [0.914, 0.911, 0.85, 0.91, 0.7]},
+        index=["a", "b", "c", "d", "e"],
+    )
+    default_rules = {
+        "order": Order.MAXIMUM,
+        "highlighting": ["\\bfseries{%s}", "\\underline{%s}"],
+        "default": "%s",
+        "precision": "%.2f",
+    }
+    expected = pd.DataFrame(
+        {
+            "A": [
+                "\\bfseries{0.91}",
+                "\\bfseries{0.91}",
+                "\\underline{0.85}",
+                "\\bfseries{0.91}",
+                "0.70",
+            ]
+        },
+        index=["a", "b", "c", "d", "e"],
+    )
+    assert table_highlighting(dataframe, Axis.COLUMN, default_rules).equals(expected)
+
+
+def test_ties_at_displayed_halves() -> None:
+    # 7.295 is displayed as 7.29, while np.round rounds it to 7.3
+    dataframe = pd.DataFrame(
+        {"A": [7.295, 7.29, 7.28], "B": [7.295, 7.30, 7.28]},
+        index=["a", "b", "c"],
+    )
+    default_rules = {
+        "order": Order.MAXIMUM,
+        "highlighting": ["\\bfseries{%s}"],
+        "default": "%s",
+        "precision": "%.2f",
+    }
+    expected = pd.DataFrame(
+        {
+            "A": ["\\bfseries{7.29}", "\\bfseries{7.29}", "7.28"],
+            "B": ["7.29", "\\bfseries{7.30}", "7.28"],
+        },
+        index=["a", "b", "c"],
+    )
+    assert table_highlighting(dataframe, Axis.COLUMN, default_rules).equals(expected)
+
+
+def test_heatmap_scales() -> None:
+    dataframe = pd.DataFrame(
+        {"A": [1.0, 10.0, 100.0, "n/a"], "B": [3.0, 2.0, 1.0, 1.0]},
+        index=["a", "b", "c", "d"],
+    )
+    default_rules = {
+        "order": Order.MAXIMUM,
+        "highlighting": [],
+        "default": "%s",
+        "precision": "%.0f",
+        "heatmap": {"color": "red", "scale": "log"},
+    }
+    highlighted = table_highlighting(
+        dataframe,
+        Axis.COLUMN,
+        default_rules,
+        {"B": {"order": Order.MINIMUM, "heatmap": {"scale": "linear"}}},
+    )
+    assert highlighted["A"].tolist() == [
+        "1",
+        "\\cellcolor{red!25}10",
+        "\\cellcolor{red!50}100",
+        "n/a",
+    ]
+    assert highlighted["B"].tolist() == [
+        "3",
+        "\\cellcolor{green!25}2",
+        "\\cellcolor{green!50}1",
+        "\\cellcolor{green!50}1",
+    ]
+
+    neutral = table_highlighting(
+        dataframe, Axis.COLUMN, {**default_rules, "order": Order.NEUTRAL}
+    )
+    assert neutral["A"].tolist() == ["1", "10", "100", "n/a"]
+
+
+def test_log_heatmap_uses_ratios() -> None:
+    heatmap = Heatmap(scale=Scale.LOG)
+    everything = np.ones(4, dtype=bool)
+
+    small = np.array([0.001, 0.01, 0.1, 1.0])
+    intensities = heatmap_intensities(small, everything, Order.MAXIMUM, heatmap)
+    assert intensities.tolist() == [0, 17, 33, 50]
+
+    # the same colours in other units
+    percent = np.array([80.0, 85.0, 90.0, 95.0])
+    assert np.array_equal(
+        heatmap_intensities(percent, everything, Order.MAXIMUM, heatmap),
+        heatmap_intensities(percent / 100, everything, Order.MAXIMUM, heatmap),
+    )
+
+    # values that are not positive are coloured linearly
+    signed = np.array([-1.0, 0.0, 1.0, 3.0])
+    assert heatmap_intensities(signed, everything, Order.MAXIMUM, heatmap).tolist() == [
+        0,
+        12,
+        25,
+        50,
+    ]
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from history import History, PositionsChange, SkipChange
+from table import Table
+from utils import Axis
+
+
+def make_table() -> Table:
+    dataframe = pd.DataFrame(
+        {"A": [1.0, 2.0, 3.0], "B": [6.0, 5.0, 4.0], "C": [7.0, "n/a", 9.0]},
+        index=["a", "b", "c"],
+    )
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    return table
+
+
+def test_undo_and_redo_all_changes() -> None:
+    table = make_table()
+    table.highlight_table()
+    states = [table.display_dataframe]
+
+    changes = [
+        lambda: table.toggle_order(Axis.COLUMN, "A"),
+        lambda: table.increase_precision(Axis.COLUMN, "B"),
+        lambda: table.toggle_skipping(Axis.ROW, "c"),
+        lambda: table.swap_columns("A", "C"),
+        lambda: table.move(Axis.ROW, "a", 2),
+        lambda: table.sort_by(Axis.COLUMN, "B"),
+        lambda: table.set_cell_rule("b", "A", "\\cellcolor{gray}%s"),
+        lambda: table.set_rules(Axis.COLUMN, "C", {"precision": "%.0f"}),
+        lambda: table.set_default_rules({**table.default_rules, "order": "min"}),
+    ]
+    for change in changes:
+        change()
+        table.highlight_table()
+        states.append(table.display_dataframe)
+
+    for state in reversed(states[:-1]):
+        assert table.undo()
+        table.highlight_table()
+        assert table.display_dataframe.equals(state)
+    assert not table.undo()
+
+    for state in states[1:]:
+        assert table.redo()
+        table.highlight_table()
+        assert table.display_dataframe.equals(state)
+    assert not table.redo()
+
+
+def test_undo_highlights_only_changed_lines() -> None:
+    table = make_table()
+    table.increase_precision(Axis.COLUMN, "B")
+    table.swap_rows("a", "c")
+    table.highlight_table()
+
+    assert table.undo()
+    assert not table.dirty[Axis.COLUMN].any()
+    assert table.undo()
+    assert table.dirty[Axis.COLUMN].tolist() == [False, True, False]
+
+
+def test_history_stores_deltas() -> None:
+    table = make_table()
+    table.move(Axis.ROW, "c", 1)
+    change = table.history.undo_stack[-1]
+    assert isinstance(change, PositionsChange)
+    assert change.slots.tolist() == [1, 2]
+    assert change.after.tolist() == [2, 1]
+
+    history = History(max_length=2)
+    for name in "abc":
+        history.record(SkipChange(Axis.ROW, name))
+    assert [change.name for change in history.undo_stack] == ["b", "c"]
+    assert history.undo() == SkipChange(Axis.ROW, "c")
+    history.record(SkipChange(Axis.ROW, "d"))
+    assert history.redo() is None
+    assert np.array_equal(
+        PositionsChange.between(Axis.ROW, np.arange(3), np.array([0, 2, 1])).slots,
+        [1, 2],
+    )
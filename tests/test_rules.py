@@ -0,0 +1,47 @@
+import pickle
+
+import pytest
+
+from rules import DEFAULT_RULE, Heatmap, Precision, Rule, compile_heatmap, compile_rules
+from utils import Order, Scale
+
+
+def test_precision_steps() -> None:
+    precision = Precision("%.2f")
+    assert precision.decimals == 2
+    assert precision.increased() == Precision("%.3f")
+    assert precision.decreased() == Precision("%.1f")
+    assert Precision("%.0f").decreased() is None
+    assert Precision("%d").decimals is None
+    assert Precision("%d").increased() is None
+
+
+def test_compile_overrides() -> None:
+    default = compile_rules(
+        {"order": "max", "highlighting": ["\\textbf{%s}"]}, DEFAULT_RULE
+    )
+    assert default.order == Order.MAXIMUM
+    assert default.precision == DEFAULT_RULE.precision
+
+    rule = compile_rules({"precision": "%.1f", "default": "(%s)"}, default)
+    assert rule == Rule(Order.MAXIMUM, ("\\textbf{%s}",), "(%s)", Precision("%.1f"))
+    assert rule.templates == ("\\textbf{%s}", "(%s)")
+    assert pickle.loads(pickle.dumps(rule)) == rule
+
+
+def test_missing_default_keys_warn() -> None:
+    with pytest.warns(UserWarning):
+        rule = compile_rules({"order": "min"})
+    assert rule.highlighting == DEFAULT_RULE.highlighting
+
+
+def test_compile_heatmap() -> None:
+    rule = compile_rules({"heatmap": {"scale": "percentile"}}, DEFAULT_RULE)
+    assert rule.heatmap == Heatmap("green", Scale.PERCENTILE, 50)
+    assert compile_rules({"heatmap": None}, rule).heatmap is None
+    with pytest.raises(ValueError):
+        compile_heatmap({"scale": "quadratic"})
+    with pytest.raises(ValueError):
+        compile_heatmap({"intensity": 120})
+    with pytest.raises(TypeError):
+        compile_heatmap({"colour": "red"})
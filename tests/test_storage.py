@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from storage import TableData
+
+
+def test_round_trip() -> None:
+    dataframe = pd.DataFrame(
+        {"A": [1, 2.5, "n/a"], "B": [np.nan, None, np.float32(3.0)]},
+        index=["a", "b", "c"],
+        dtype=object,
+    )
+    data = TableData.from_dataframe(dataframe)
+
+    assert data.numbers.dtype == np.float64
+    assert data.is_number.tolist() == [[True, True], [True, False], [False, True]]
+    assert list(zip(data.text_rows, data.text_columns)) == [(1, 1), (2, 0)]
+    assert data.text_values.tolist() == [None, "n/a"]
+    assert data.text_lines()[2].tolist() == ["n/a", None]
+    assert data.text_lines(transposed=True)[0].tolist() == [None, None, "n/a"]
+    assert data.text_lines()[np.array([0, 2])].tolist() == [[None, None], ["n/a", None]]
+
+    restored = data.to_dataframe()
+    assert restored.index.equals(dataframe.index)
+    assert restored.columns.equals(dataframe.columns)
+    assert restored["A"].tolist() == [1.0, 2.5, "n/a"]
+    assert restored.loc["b", "B"] is None
+
+
+def test_numbers_take_less_memory() -> None:
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(rng.uniform(0, 1, (1_000, 20)).astype(object))
+    data = TableData.from_dataframe(dataframe)
+
+    assert data.nbytes() == 9 * dataframe.size
+    # only the cells that are not numbers are kept for highlighting
+    assert data.text_lines().values.size == 0
+    assert data.nbytes() * 3 < dataframe.memory_usage(index=False, deep=True).sum()
@@ -1,5 +1,9 @@
+import tracemalloc
+
+import numpy as np
 import pandas as pd
 from table import Table
+from views import RowFilter
 from utils import Axis, Order
 
 
@@ -72,3 +76,270 @@ def test_toggle_order_max_to_min():
 
     table.toggle_order(table.mode, "A")
     assert table.overrides[table.mode]["A"]["order"] == Order.MINIMUM
+
+
+def test_increase_precision_rehighlights_one_column():
+    dataframe = pd.DataFrame(
+        {
+            "A": [1.0, 2.0],
+            "B": [3.0, 4.0],
+        },
+        index=["a", "b"],
+    )
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.highlight_table()
+    assert not table.dirty[Axis.COLUMN].any()
+
+    table.increase_precision(Axis.COLUMN, "A")
+    assert table.dirty[Axis.COLUMN].tolist() == [True, False]
+    table.highlight_table()
+    assert table.display_dataframe["A"].tolist() == ["1.000", "2.000"]
+    assert table.display_dataframe["B"].tolist() == ["3.00", "4.00"]
+
+
+def test_toggle_skipping_invalidates_other_axis():
+    dataframe = pd.DataFrame(
+        {
+            "A": [1.0, 2.0],
+            "B": [3.0, 4.0],
+        },
+        index=["a", "b"],
+    )
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.highlight_table()
+    table.mode = Axis.ROW
+    table.highlight_table()
+
+    table.toggle_skipping(Axis.ROW, "a")
+    assert table.dirty[Axis.COLUMN].all()
+    assert not table.dirty[Axis.ROW].any()
+
+
+def test_toggle_order_reuses_sort_index():
+    dataframe = pd.DataFrame(
+        {
+            "A": [3.0, 1.0, 2.0],
+        },
+        index=["a", "b", "c"],
+    )
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.highlight_table()
+    sorted_positions = table.caches[Axis.COLUMN].sort_indices[0]
+    assert sorted_positions.tolist() == [1, 2, 0]
+
+    table.toggle_order(Axis.COLUMN, "A")
+    table.highlight_table()
+    assert table.caches[Axis.COLUMN].sort_indices[0] is sorted_positions
+    assert table.display_dataframe["A"].tolist() == [
+        "\\bfseries{3.00}",
+        "1.00",
+        "\\underline{2.00}",
+    ]
+
+    # skipped values are dropped from the sorted positions, not sorted again
+    table.toggle_skipping(Axis.ROW, "a")
+    table.highlight_table()
+    assert table.caches[Axis.COLUMN].sort_indices[0] is sorted_positions
+    assert table.display_dataframe["A"].tolist() == [
+        "3.00",
+        "\\underline{1.00}",
+        "\\bfseries{2.00}",
+    ]
+
+
+def test_precision_changes_reuse_formatted_values():
+    dataframe = pd.DataFrame(
+        {
+            "A": [1.0, 2.0],
+        },
+        index=["a", "b"],
+    )
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.highlight_table()
+    formatted = table.caches[Axis.COLUMN].formatted[(0, "%.2f")]
+
+    table.increase_precision(Axis.COLUMN, "A")
+    table.highlight_table()
+    table.decrease_precision(Axis.COLUMN, "A")
+    table.highlight_table()
+    assert table.caches[Axis.COLUMN].formatted[(0, "%.2f")] is formatted
+    assert table.display_dataframe["A"].tolist() == ["1.00", "2.00"]
+
+
+def test_cell_rules_follow_swapped_rows():
+    dataframe = pd.DataFrame(
+        {"A": [1.0, 2.0, 3.0], "B": [4.0, 5.0, 6.0]}, index=["a", "b", "c"]
+    )
+
+    table = Table()
+    table.mode = Axis.COLUMN
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    assert table.set_cell_rule("a", "B", "\\cellcolor{gray}%s")
+    assert not table.set_cell_rule("z", "B", "\\cellcolor{gray}%s")
+
+    table.highlight_table()
+    assert table.display_dataframe.loc["a", "B"] == "\\cellcolor{gray}4.00"
+    assert table.display_dataframe.loc["b", "B"] == "5.00"
+
+    table.swap_rows("a", "c")
+    table.highlight_table()
+    assert table.display_dataframe.iloc[2]["B"] == "\\cellcolor{gray}4.00"
+    assert table.display_dataframe.iloc[0]["B"] == "6.00"
+
+    table.set_cell_rule("a", "B", None)
+    table.highlight_table()
+    assert table.display_dataframe.loc["a", "B"] == "4.00"
+    assert table.cell_overrides == {}
+
+
+def test_cell_rules_follow_duplicate_rows():
+    dataframe = pd.DataFrame({"A": [1.0, 2.0, 3.0]}, index=["x", "x", "y"])
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.set_default_rules({**table.default_rules, "highlighting": []})
+    # the second row named x, as when the cursor is on it
+    table.set_cell_template(table.source_cell(1, 0), "\\cellcolor{gray}%s")
+
+    table.sort_by(Axis.COLUMN, "A", descending=True)
+    table.highlight_table()
+    assert table.display_dataframe["A"].tolist() == [
+        "3.00",
+        "\\cellcolor{gray}2.00",
+        "1.00",
+    ]
+
+    table.toggle_hidden(Axis.ROW, "y")
+    table.highlight_table()
+    assert table.display_dataframe["A"].tolist() == ["\\cellcolor{gray}2.00", "1.00"]
+
+
+def test_swap_columns_moves_values():
+    dataframe = pd.DataFrame(
+        {"A": [1.0, 2.0], "B": [3.0, 4.0], "C": [5.0, 6.0]}, index=["a", "b"]
+    )
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.increase_precision(Axis.COLUMN, "A")
+    table.highlight_table()
+
+    assert table.swap_columns("A", "C")
+    table.highlight_table()
+    assert table.display_dataframe.columns.tolist() == ["C", "B", "A"]
+    assert table.display_dataframe["A"].tolist() == ["1.000", "2.000"]
+    assert table.display_dataframe["C"].tolist() == ["5.00", "6.00"]
+    assert table.dataframe["A"].tolist() == [1.0, 2.0]
+    # the stored data is not reordered, nothing is highlighted again
+    assert table.data.columns.tolist() == ["A", "B", "C"]
+    assert not table.dirty[Axis.COLUMN].any()
+
+    assert table.move(Axis.COLUMN, "A", 0)
+    assert table.names(Axis.COLUMN).tolist() == ["A", "C", "B"]
+    assert not table.move(Axis.COLUMN, "A", 3)
+
+
+def test_sort_rows_by_column():
+    dataframe = pd.DataFrame(
+        {"A": [2.0, "n/a", 1.0, 2.0], "B": [1.0, 2.0, 3.0, 4.0]},
+        index=["a", "b", "c", "d"],
+    )
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+
+    assert table.sort_by(Axis.COLUMN, "A")
+    assert table.names(Axis.ROW).tolist() == ["c", "a", "d", "b"]
+    assert table.sort_by(Axis.COLUMN, "A", descending=True)
+    assert table.names(Axis.ROW).tolist() == ["a", "d", "c", "b"]
+    assert table.sort_by(Axis.ROW, "b", descending=True)
+    assert table.names(Axis.COLUMN).tolist() == ["B", "A"]
+
+    table.highlight_table()
+    assert table.display_dataframe.loc["b"].tolist() == ["2.00", "n/a"]
+    assert not table.sort_by(Axis.COLUMN, "Z")
+
+
+def test_redraw_does_not_copy_the_table():
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(np.round(rng.uniform(0, 100, (1_000, 100)), 2))
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.highlight_table()
+    first = table.display_dataframe
+    assert np.shares_memory(first.to_numpy(), table.highlighted[Axis.COLUMN])
+
+    tracemalloc.start()
+    table.highlight_table()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # a copy of the stored data or of the display would take 8 bytes per cell
+    assert peak < table.data.nbytes() / 4
+
+    # the lines are copied before they change, the shown frame is kept
+    expected = first[0].tolist()
+    table.increase_precision(Axis.COLUMN, 0)
+    table.highlight_table()
+    assert first[0].tolist() == expected
+    assert table.display_dataframe[0].tolist() != expected
+
+
+def test_hidden_and_filtered_lines_are_not_shown():
+    dataframe = pd.DataFrame(
+        {"A": [1.0, 3.0, 2.0], "B": [4.0, 5.0, 6.0], "C": [7.0, 8.0, 9.0]},
+        index=["a", "b", "c"],
+    )
+
+    table = Table()
+    table.dataframe = dataframe
+    table.reset_formatting_rules()
+    table.set_default_rules({**table.default_rules, "order": Order.MAXIMUM})
+
+    assert table.toggle_hidden(Axis.COLUMN, "B")
+    table.set_row_filter(RowFilter(column="A", comparison="<", value=3))
+    table.highlight_table()
+    assert table.names(Axis.COLUMN).tolist() == ["A", "C"]
+    assert table.display_dataframe.index.tolist() == ["a", "c"]
+    # the filtered row is not the maximum of its column any more
+    assert table.display_dataframe["A"].tolist() == [
+        "\\underline{1.00}",
+        "\\bfseries{2.00}",
+    ]
+    assert "B" not in table.dataframe.columns
+
+    # reordering skips over the hidden lines
+    assert table.swap_rows("a", "c")
+    assert table.move(Axis.COLUMN, "C", 0)
+    table.highlight_table()
+    assert table.display_dataframe.index.tolist() == ["c", "a"]
+    assert table.display_dataframe.columns.tolist() == ["C", "A"]
+
+    table.undo()
+    table.undo()
+    table.undo()
+    assert table.undo()
+    table.highlight_table()
+    assert table.display_dataframe.columns.tolist() == ["A", "B", "C"]
+    assert table.display_dataframe["A"].tolist() == [
+        "1.00",
+        "\\bfseries{3.00}",
+        "\\underline{2.00}",
+    ]
@@ -0,0 +1,75 @@
+import re
+
+import pandas as pd
+import pytest
+
+from conversion import parse_latex_table
+from storage import TableData
+from table import Table
+from views import RowFilter
+
+
+def make_data() -> TableData:
+    dataframe = pd.DataFrame(
+        {"F1": [81.0, 79.5, "--", 90.0], "Acc": [1.0, 2.0, 3.0, 4.0]},
+        index=["BERT-base", "BERT-large", "RoBERTa", "GPT-2"],
+        dtype=object,
+    )
+    return TableData.from_dataframe(dataframe)
+
+
+def test_row_filter_mask() -> None:
+    data = make_data()
+
+    assert RowFilter(pattern="^BERT").mask(data).tolist() == [True, True, False, False]
+    assert RowFilter(column="F1", comparison=">=", value=80).mask(data).tolist() == [
+        True,
+        False,
+        False,
+        True,
+    ]
+    # both conditions must hold, cells without a number never match
+    assert RowFilter(pattern="BERT", column="F1", comparison="<", value=100).mask(
+        data
+    ).tolist() == [True, True, False, False]
+
+
+def test_row_filter_rejects_invalid_input() -> None:
+    with pytest.raises(ValueError):
+        RowFilter(comparison="=>")
+    with pytest.raises(re.error):
+        RowFilter(pattern="(")
+    with pytest.raises(ValueError):
+        RowFilter(column="F1", value="high")
+    with pytest.raises(TypeError):
+        RowFilter(column="F1", value=None)
+    with pytest.raises(TypeError):
+        RowFilter(column="F1", value=True)
+    assert RowFilter(column="F1", value="0.8").value == 0.8
+    assert RowFilter().mask(make_data()).all()
+
+
+def test_row_filter_matches_parsed_columns() -> None:
+    dataframe, _ = parse_latex_table(
+        r"""
+        \begin{tabular}{lcc}
+        Method & Acc & F1 \\
+        \midrule
+        BERT & 0.91 & 0.85 \\
+        GPT & 0.70 & 0.60 \\
+        \end{tabular}
+        """
+    )
+    data = TableData.from_dataframe(dataframe)
+
+    row_filter = RowFilter(column="F1", comparison=">", value=0.8)
+    assert row_filter.mask(data).tolist() == [True, False]
+    with pytest.raises(ValueError):
+        RowFilter(column="Recall").mask(data)
+
+    table = Table()
+    table.dataframe = dataframe
+    with pytest.raises(ValueError):
+        table.set_row_filter(RowFilter(column="Recall"))
+    assert table.row_filter is None
+    assert not table.undo()